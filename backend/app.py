@@ -1,26 +1,78 @@
 from flask import Flask, request, make_response
 from config import Config
-from database import db
+from database import db, apply_sqlite_pragmas
 
-def create_app():
+def create_app(config_class=Config):
     app = Flask(__name__)
-    app.config.from_object(Config)
+    app.config.from_object(config_class)
+
+    # A typo in RANKING_TIE_BREAKERS fails at startup, not on every rankings request
+    from services.ranking_service import check_tie_breakers
+    check_tie_breakers(app.config.get('RANKING_TIE_BREAKERS', ()))
+
+    # orjson encoding, with teams pre-encoded once per tournament version for list responses
+    from services.json_provider import OrjsonProvider, TeamFragments
+    app.json = OrjsonProvider(app)
+    app.extensions['team_fragments'] = TeamFragments()
 
     db.init_app(app)
 
     # Import models to ensure they're registered with SQLAlchemy
-    from models import team, game, result
+    from models import team, game, result, standing, tournament_state, tournament_event, rank_snapshot
+
+    # Keep the standings table in step with every game and result change
+    from services.standings_service import register_standings_listener
+    register_standings_listener()
+
+    # Every write bumps the tournament version, which invalidates cached reads
+    from services.tournament_version import register_version_listener
+    from services.response_cache import ResponseCache
+    register_version_listener()
+    app.extensions['response_cache'] = ResponseCache()
+
+    # Append every team, game and result write to the event log (replay and delta sync)
+    from services.event_log import register_event_log_listener
+    register_event_log_listener()
+
+    # Played pairs and busy teams for game generation, updated by delta on commit
+    from services.matchup_state import MatchupState, register_matchup_listeners
+    register_matchup_listeners()
+    app.extensions['matchup_state'] = MatchupState()
+
+    # Completed games in order with periodic prefix totals, for point-in-time rankings
+    from services.ranking_timeline import RankingTimeline
+    app.extensions['ranking_timeline'] = RankingTimeline()
+
+    # Latest ranks folded from the per-result snapshots, extended as new ones are written
+    from services.rank_history import RankHistory
+    app.extensions['rank_history'] = RankHistory()
+
+    # Elo / Glicko-2 ratings per engine, replayed only from the first changed result
+    app.extensions['rating_caches'] = {}
+
+    # Monte-Carlo projection of the final standings, simulated off the request thread
+    from services.projection import ProjectionWorker
+    app.extensions['projection'] = ProjectionWorker()
+
+    # Live events pushed to /api/events subscribers, read from the event log and woken by its commits
+    from services.event_stream import EventStream, register_event_stream_listeners
+    register_event_stream_listeners()
+    app.extensions['event_stream'] = EventStream()
 
     # Import and register blueprints
     from routes.teams import teams_bp
     from routes.games import games_bp
     from routes.results import results_bp
     from routes.admin import admin_bp
+    from routes.events import events_bp
+    from routes.sync import sync_bp
 
     app.register_blueprint(teams_bp, url_prefix='/api')
     app.register_blueprint(games_bp, url_prefix='/api')
     app.register_blueprint(results_bp, url_prefix='/api')
     app.register_blueprint(admin_bp, url_prefix='/api/admin')
+    app.register_blueprint(events_bp, url_prefix='/api')
+    app.register_blueprint(sync_bp, url_prefix='/api')
 
     # Handle OPTIONS requests before routing
     @app.before_request
@@ -28,7 +80,7 @@ def create_app():
         if request.method == "OPTIONS":
             response = make_response('', 204)
             response.headers['Access-Control-Allow-Origin'] = '*'
-            response.headers['Access-Control-Allow-Headers'] = 'Content-Type,Authorization'
+            response.headers['Access-Control-Allow-Headers'] = 'Content-Type,Authorization,If-None-Match,Last-Event-ID'
             response.headers['Access-Control-Allow-Methods'] = 'GET,POST,PUT,DELETE,OPTIONS'
             return response
 
@@ -36,14 +88,27 @@ def create_app():
     @app.after_request
     def after_request(response):
         response.headers['Access-Control-Allow-Origin'] = '*'
-        response.headers['Access-Control-Allow-Headers'] = 'Content-Type,Authorization'
+        response.headers['Access-Control-Allow-Headers'] = 'Content-Type,Authorization,If-None-Match,Last-Event-ID'
         response.headers['Access-Control-Allow-Methods'] = 'GET,POST,PUT,DELETE,OPTIONS'
+        # Let the frontend read ETags for conditional polling
+        response.headers['Access-Control-Expose-Headers'] = 'ETag'
         return response
 
     # Create database tables
     with app.app_context():
+        apply_sqlite_pragmas(db.engine, app.config['SQLITE_PRAGMAS'])
         db.create_all()
 
+        # create_all skips existing tables, so add indexes introduced since a database was created
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=db.engine, checkfirst=True)
+
+        # Standings are kept up by the flush listener only, so backfill them for results
+        # written before the table existed (or behind the app's back)
+        from services.standings_service import StandingsService
+        StandingsService(db).rebuild_if_drifted()
+
     return app
 
 if __name__ == '__main__':
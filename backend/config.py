@@ -1,6 +1,86 @@
+import orjson
 import os
 
+# PRAGMA sets for SQLite, applied to every new connection. Select one with SQLITE_PROFILE
+# and override single values with SQLITE_<PRAGMA>, e.g. SQLITE_BUSY_TIMEOUT=10000.
+SQLITE_PROFILES = {
+    # SQLite's own defaults: rollback journal, readers and writers block each other
+    'default': {},
+    # Concurrent result entry plus polling: readers never block the writer and vice versa
+    'production': {
+        'journal_mode': 'WAL',
+        'busy_timeout': 5000,       # ms to wait for a lock before "database is locked"
+        'synchronous': 'NORMAL',    # safe with WAL, fsync only at checkpoints
+        'cache_size': -20000,       # ~20 MB page cache per connection
+        'mmap_size': 268435456,     # 256 MB memory-mapped reads
+        'temp_store': 'MEMORY',
+    },
+}
+
+
+def sqlite_pragmas(profile=None):
+    """PRAGMAs for the selected SQLite profile with environment overrides applied"""
+    profile = profile or os.environ.get('SQLITE_PROFILE', 'production')
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f'Unknown SQLITE_PROFILE {profile!r}, expected one of {sorted(SQLITE_PROFILES)}')
+
+    pragmas = dict(SQLITE_PROFILES[profile])
+    for name in SQLITE_PROFILES['production']:
+        override = os.environ.get(f'SQLITE_{name.upper()}')
+        if override:
+            pragmas[name] = override
+    return pragmas
+
+
+def _env_bool(name, default):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def _json_dumps(value):
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def engine_options(uri):
+    """
+    SQLAlchemy engine options for a database URI, tunable through the environment.
+    Each worker process owns its own pool, so the server must accept
+    workers x (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections: 4 workers x 20 = 80 by default,
+    below PostgreSQL's default max_connections of 100.
+    """
+    options = {
+        'pool_pre_ping': _env_bool('DB_POOL_PRE_PING', True),
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+        # JSON columns (event data, rank snapshots) are encoded by orjson, like responses
+        'json_serializer': _json_dumps,
+        'json_deserializer': orjson.loads,
+    }
+
+    # In-memory SQLite shares one connection (StaticPool), which takes no sizing options
+    if uri.startswith('sqlite') and (':memory:' in uri or uri.rstrip('/') == 'sqlite:'):
+        return options
+
+    options['pool_size'] = int(os.environ.get('DB_POOL_SIZE', 10))
+    options['max_overflow'] = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+    options['pool_timeout'] = int(os.environ.get('DB_POOL_TIMEOUT', 30))
+    return options
+
+
 class Config:
-    SQLALCHEMY_DATABASE_URI = 'sqlite:///database.db'
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///database.db'
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLITE_PRAGMAS = sqlite_pragmas()
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
+    # Seconds between keepalive comments on idle /api/events streams
+    EVENT_STREAM_KEEPALIVE = int(os.environ.get('EVENT_STREAM_KEEPALIVE', 15))
+    # Seconds between /api/events reads of the event log, the delay for events written by other workers
+    EVENT_STREAM_POLL_INTERVAL = float(os.environ.get('EVENT_STREAM_POLL_INTERVAL', 1))
+    # Comma-separated tie-breakers for teams level on score and win rate (see services.ranking_service.TIE_BREAKERS)
+    RANKING_TIE_BREAKERS = [name for name in os.environ.get('RANKING_TIE_BREAKERS', '').split(',') if name]
+    # Simulated tournaments per /api/rankings/projection, and seconds a request waits for
+    # the background simulation before answering 202 (poll again)
+    PROJECTION_RUNS = int(os.environ.get('PROJECTION_RUNS', 10000))
+    PROJECTION_WAIT = float(os.environ.get('PROJECTION_WAIT', 2))
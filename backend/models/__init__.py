@@ -1,5 +1,9 @@
 from .team import Team
 from .game import Game
 from .result import Result
+from .standing import Standing
+from .tournament_state import TournamentState
+from .tournament_event import TournamentEvent
+from .rank_snapshot import RankSnapshot
 
-__all__ = ['Team', 'Game', 'Result']
+__all__ = ['Team', 'Game', 'Result', 'Standing', 'TournamentState', 'TournamentEvent', 'RankSnapshot']
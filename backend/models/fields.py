@@ -0,0 +1,163 @@
+from datetime import datetime
+from itertools import chain
+from operator import itemgetter
+from sqlalchemy.orm import joinedload, load_only
+from sqlalchemy.orm.attributes import instance_state
+
+
+def parse_fields(value):
+    """
+    Parse a fields argument such as 'id,status,team1.id' into {'id': None, 'status': None, 'team1': {'id': None}}.
+    None stands for the whole field (asking for team1 and team1.id gives the whole team).
+    Returns None, meaning every field, when the argument is missing. Raises ValueError with a client message.
+    """
+    if value is None:
+        return None
+
+    fields = {}
+    for path in value.split(','):
+        names = path.strip().split('.')
+        if not all(names):
+            raise ValueError(f"fields has an empty name in '{path}'")
+
+        node = fields
+        for name in names[:-1]:
+            if name in node and node[name] is None:
+                break
+            node = node.setdefault(name, {})
+        else:
+            node[names[-1]] = None
+
+    if not fields:
+        raise ValueError('fields must name at least one field')
+    return fields
+
+
+def check_flat_fields(fields, allowed):
+    """Raise ValueError unless every field is one of the allowed flat names"""
+    for name, subfields in fields.items():
+        if name not in allowed:
+            raise ValueError(f"Unknown field '{name}', expected: {', '.join(allowed)}")
+        if subfields is not None:
+            raise ValueError(f"Field '{name}' has no nested fields")
+
+
+def project_row(data, fields):
+    """Keep the requested keys of an already serialized row (those it has)"""
+    return data if fields is None else {name: data[name] for name in fields if name in data}
+
+
+def _tuple_getter(names):
+    """itemgetter returning a tuple even for a single name"""
+    if len(names) == 1:
+        name = names[0]
+        return lambda values: (values[name],)
+    return itemgetter(*names)
+
+
+class Projectable:
+    """
+    Serialization of a requested subset of fields (?fields= on list endpoints), loading only those.
+    COLUMNS are the column attributes a client may ask for and RELATIONS the to-one relationships
+    (name -> related Projectable model), whose own fields nest with a dot: team1.id.
+    FIELDS are the fields of a whole row, in order.
+    """
+
+    COLUMNS = ()
+    RELATIONS = {}
+    FIELDS = ()
+
+    @classmethod
+    def fields_from_args(cls, args):
+        """Parse and check the fields request argument, None when absent"""
+        fields = parse_fields(args.get('fields'))
+        if fields is not None:
+            cls.check_fields(fields)
+        return fields
+
+    @classmethod
+    def check_fields(cls, fields):
+        allowed = (*cls.COLUMNS, *cls.RELATIONS)
+        for name, subfields in fields.items():
+            if name not in allowed:
+                raise ValueError(f"Unknown field '{name}', expected: {', '.join(allowed)}")
+            if subfields is None:
+                continue
+            if name not in cls.RELATIONS:
+                raise ValueError(f"Field '{name}' has no nested fields")
+            cls.RELATIONS[name].check_fields(subfields)
+
+    @classmethod
+    def load_options(cls, fields):
+        """
+        Loader options for the requested fields: load_only on the requested columns (the primary
+        key always, paging relies on it) and a joined load of requested relationships only.
+        """
+        columns = [cls.id] + [getattr(cls, name) for name in fields if name in cls.COLUMNS and name != 'id']
+        options = [load_only(*columns)]
+        for name, subfields in fields.items():
+            if name in cls.RELATIONS:
+                load = joinedload(getattr(cls, name))
+                if subfields is not None:
+                    load = load.options(*cls.RELATIONS[name].load_options(subfields))
+                options.append(load)
+        return options
+
+    @classmethod
+    def query_with_fields(cls, fields):
+        """Query loading only the requested fields, or every column when fields is None"""
+        if fields is None:
+            return cls.query
+        return cls.query.options(*cls.load_options(fields))
+
+    def to_dict(self, fields=None, encode_related=None):
+        """
+        Serialize the whole row, or only the requested fields. encode_related, when given, replaces
+        to_dict for whole related rows (see services.json_provider.TeamFragments).
+        """
+        return self.project(dict.fromkeys(self.FIELDS) if fields is None else fields, encode_related)
+
+    @classmethod
+    def to_json_rows(cls, rows, encode_related):
+        """
+        Whole rows as to_dict gives them, for the orjson provider (services.json_provider), which
+        encodes datetimes itself exactly like isoformat(). Rows are read from their loaded ORM state,
+        unless a field is expired or deferred on any of them: then every row is read through the ORM
+        attributes, which load it. Each distinct related row is encoded once by encode_related.
+        """
+        names = cls.FIELDS
+        columns = tuple(name for name in names if name not in cls.RELATIONS)
+        relations = tuple(name for name in names if name in cls.RELATIONS)
+        values = [state.dict for state in map(instance_state, rows)]
+        if not all(map(set(names).issubset, values)):
+            values = [{name: getattr(row, name) for name in names} for row in rows]
+
+        read_columns = _tuple_getter(columns)
+        if not relations:
+            return [dict(zip(columns, read_columns(row_values))) for row_values in values]
+
+        read_relations = _tuple_getter(relations)
+        related = set(chain.from_iterable(map(read_relations, values)))
+        encoded = {row: encode_related(row) if row is not None else None for row in related}
+        keys = columns + relations
+        return [
+            dict(zip(keys, chain(read_columns(row_values), map(encoded.__getitem__, read_relations(row_values)))))
+            for row_values in values
+        ]
+
+    def project(self, fields, encode_related=None):
+        """Serialize only the requested fields, in request order"""
+        data = {}
+        for name, subfields in fields.items():
+            if name in self.RELATIONS:
+                related = getattr(self, name)
+                if related is None:
+                    data[name] = None
+                elif subfields is None and encode_related is not None:
+                    data[name] = encode_related(related)
+                else:
+                    data[name] = related.to_dict(subfields)
+            else:
+                value = getattr(self, name)
+                data[name] = value.isoformat() if isinstance(value, datetime) else value
+        return data
@@ -1,7 +1,10 @@
 from database import db
+from models.fields import Projectable
+from models.team import Team
+from sqlalchemy.orm import joinedload
 from datetime import datetime
 
-class Game(db.Model):
+class Game(Projectable, db.Model):
     __tablename__ = 'games'
 
     id = db.Column(db.Integer, primary_key=True)
@@ -17,21 +20,31 @@ class Game(db.Model):
     team2 = db.relationship('Team', foreign_keys=[team2_id], backref='games_as_team2')
 
     # Constraint: team1_id < team2_id to prevent duplicate games
+    # Indexes: status lookups (generator, /games/current, matchup checks) use the composite,
+    # "team1_id = x OR team2_id = x" lookups (team deletion) use one index per side
     __table_args__ = (
         db.CheckConstraint('team1_id < team2_id', name='check_team_order'),
         db.CheckConstraint('team1_id != team2_id', name='check_different_teams'),
+        db.Index('ix_games_status_team1_id_team2_id', 'status', 'team1_id', 'team2_id'),
+        db.Index('ix_games_team1_id', 'team1_id'),
+        db.Index('ix_games_team2_id', 'team2_id'),
     )
 
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'team1': self.team1.to_dict() if self.team1 else None,
-            'team2': self.team2.to_dict() if self.team2 else None,
-            'status': self.status,
-            'created_at': self.created_at.isoformat(),
-            'started_at': self.started_at.isoformat() if self.started_at else None,
-            'completed_at': self.completed_at.isoformat() if self.completed_at else None
-        }
+    @classmethod
+    def query_with_teams(cls):
+        """Query games with both teams loaded in the same statement"""
+        return cls.query.options(joinedload(cls.team1), joinedload(cls.team2))
+
+    COLUMNS = ('id', 'team1_id', 'team2_id', 'status', 'created_at', 'started_at', 'completed_at')
+    RELATIONS = {'team1': Team, 'team2': Team}
+    FIELDS = ('id', 'team1', 'team2', 'status', 'created_at', 'started_at', 'completed_at')
+
+    @classmethod
+    def query_with_fields(cls, fields):
+        """Query games loading only the requested fields, everything with both teams when fields is None"""
+        if fields is None:
+            return cls.query_with_teams()
+        return super().query_with_fields(fields)
 
     def __repr__(self):
         return f'<Game {self.id}: Team {self.team1_id} vs Team {self.team2_id} ({self.status})>'
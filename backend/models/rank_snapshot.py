@@ -0,0 +1,21 @@
+from database import db
+from datetime import datetime
+
+class RankSnapshot(db.Model):
+    __tablename__ = 'rank_snapshots'
+
+    # One row per submitted result, holding only the teams whose rank or score it changed
+    # as parallel arrays; rank 0 marks a team that left the standings
+    id = db.Column(db.Integer, primary_key=True)
+    # Not a foreign key: history outlives event replays that recreate results with the same ids
+    result_id = db.Column(db.Integer, nullable=False)
+    team_ids = db.Column(db.JSON, nullable=False)
+    ranks = db.Column(db.JSON, nullable=False)
+    scores = db.Column(db.JSON, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # Ids are never reused, so a cached fold can tell appended rows from a cleared table
+    __table_args__ = {'sqlite_autoincrement': True}
+
+    def __repr__(self):
+        return f'<RankSnapshot {self.id}: result {self.result_id}, {len(self.team_ids)} teams moved>'
@@ -1,7 +1,10 @@
 from database import db
+from models.fields import Projectable
+from models.team import Team
+from sqlalchemy.orm import joinedload
 from datetime import datetime
 
-class Result(db.Model):
+class Result(Projectable, db.Model):
     __tablename__ = 'results'
 
     id = db.Column(db.Integer, primary_key=True)
@@ -15,19 +18,29 @@ class Result(db.Model):
     winning_team = db.relationship('Team', foreign_keys=[winning_team_id])
 
     # Constraint: score must be non-negative
+    # Indexes: wins and scores are aggregated per winning team for rankings,
+    # rating engines read results in submission order
     __table_args__ = (
         db.CheckConstraint('score >= 0', name='check_positive_score'),
+        db.Index('ix_results_winning_team_id', 'winning_team_id'),
+        db.Index('ix_results_created_at_id', 'created_at', 'id'),
     )
 
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'game_id': self.game_id,
-            'winning_team_id': self.winning_team_id,
-            'winning_team': self.winning_team.to_dict() if self.winning_team else None,
-            'score': self.score,
-            'created_at': self.created_at.isoformat()
-        }
+    @classmethod
+    def query_with_team(cls):
+        """Query results with the winning team loaded in the same statement"""
+        return cls.query.options(joinedload(cls.winning_team))
+
+    COLUMNS = ('id', 'game_id', 'winning_team_id', 'score', 'created_at')
+    RELATIONS = {'winning_team': Team}
+    FIELDS = ('id', 'game_id', 'winning_team_id', 'winning_team', 'score', 'created_at')
+
+    @classmethod
+    def query_with_fields(cls, fields):
+        """Query results loading only the requested fields, everything with the winning team when fields is None"""
+        if fields is None:
+            return cls.query_with_team()
+        return super().query_with_fields(fields)
 
     def __repr__(self):
         return f'<Result {self.id}: Game {self.game_id}, Winner: Team {self.winning_team_id}, Score: {self.score}>'
@@ -0,0 +1,24 @@
+from database import db
+from datetime import datetime
+
+class Standing(db.Model):
+    __tablename__ = 'standings'
+
+    # One row per team, maintained incrementally as games complete and results land
+    team_id = db.Column(db.Integer, db.ForeignKey('teams.id'), primary_key=True)
+    games_played = db.Column(db.Integer, nullable=False, default=0)
+    games_won = db.Column(db.Integer, nullable=False, default=0)
+    total_score = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            'team_id': self.team_id,
+            'games_played': self.games_played,
+            'games_won': self.games_won,
+            'total_score': self.total_score,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+    def __repr__(self):
+        return f'<Standing Team {self.team_id}: {self.games_won}/{self.games_played} wins, {self.total_score} pts>'
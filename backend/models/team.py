@@ -1,7 +1,8 @@
 from database import db
+from models.fields import Projectable
 from datetime import datetime
 
-class Team(db.Model):
+class Team(Projectable, db.Model):
     __tablename__ = 'teams'
 
     id = db.Column(db.Integer, primary_key=True)
@@ -10,14 +11,8 @@ class Team(db.Model):
     player2 = db.Column(db.String(100), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'name': self.name,
-            'player1': self.player1,
-            'player2': self.player2,
-            'created_at': self.created_at.isoformat()
-        }
+    COLUMNS = ('id', 'name', 'player1', 'player2', 'created_at')
+    FIELDS = COLUMNS
 
     def __repr__(self):
         return f'<Team {self.name}: {self.player1} & {self.player2}>'
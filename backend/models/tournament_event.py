@@ -0,0 +1,34 @@
+from database import db
+from datetime import datetime
+
+class TournamentEvent(db.Model):
+    __tablename__ = 'events'
+
+    # Append-only log of every team, game and result write; replaying it rebuilds the tournament
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False)
+    type = db.Column(db.String(30), nullable=False)  # e.g. team_created, game_started, database_cleared
+    entity = db.Column(db.String(20), nullable=True)  # team, game or result; none for database_cleared
+    entity_id = db.Column(db.Integer, nullable=True)
+    data = db.Column(db.JSON, nullable=False, default=dict)  # column values written, datetimes as ISO strings
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # Indexes: sync reads every event after a client's version, replay starts at the last clear
+    __table_args__ = (
+        db.Index('ix_events_version', 'version'),
+        db.Index('ix_events_type', 'type'),
+    )
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'version': self.version,
+            'type': self.type,
+            'entity': self.entity,
+            'entity_id': self.entity_id,
+            'data': self.data,
+            'created_at': self.created_at.isoformat()
+        }
+
+    def __repr__(self):
+        return f'<TournamentEvent {self.id} v{self.version}: {self.type} {self.entity_id}>'
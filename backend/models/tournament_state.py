@@ -0,0 +1,11 @@
+from database import db
+
+class TournamentState(db.Model):
+    __tablename__ = 'tournament_state'
+
+    # Single row (id=1) holding a counter bumped by every write to teams, games or results
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<TournamentState version {self.version}>'
@@ -1,8 +1,10 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, request, jsonify
 from database import db
 from models.result import Result
 from models.game import Game
 from models.team import Team
+from models.standing import Standing
+from models.rank_snapshot import RankSnapshot
 
 admin_bp = Blueprint('admin', __name__)
 
@@ -11,7 +13,10 @@ def clear_database():
     """Clear all data from the database"""
     try:
         # Delete in proper order due to foreign key constraints
-        # Results reference Games, Games reference Teams
+        # Results reference Games, Games reference Teams, Standings reference Teams
+        Standing.query.delete()
+        RankSnapshot.query.delete()
+
         results_count = Result.query.count()
         Result.query.delete()
 
@@ -21,16 +26,60 @@ def clear_database():
         teams_count = Team.query.count()
         Team.query.delete()
 
+        deleted = {
+            'results': results_count,
+            'games': games_count,
+            'teams': teams_count
+        }
+
+        # Bulk deletes bypass the flush listeners, so invalidate cached reads and log the clear explicitly
+        from services.tournament_version import bump_version
+        from services.event_log import record_clear
+        bump_version(db.session)
+        record_clear(db.session, deleted)
+
         db.session.commit()
 
         return jsonify({
             'message': 'Database cleared successfully',
-            'deleted': {
-                'results': results_count,
-                'games': games_count,
-                'teams': teams_count
-            }
+            'deleted': deleted
         }), 200
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': f'Failed to clear database: {str(e)}'}), 500
+
+@admin_bp.route('/rebuild-standings', methods=['POST'])
+def rebuild_standings():
+    """Rebuild the standings table from results and games, reporting any drift"""
+    from services.standings_service import StandingsService
+
+    data = request.get_json(silent=True) or {}
+    dry_run = bool(data.get('dry_run', False))
+
+    try:
+        drift = StandingsService(db).rebuild(dry_run=dry_run)
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'Failed to rebuild standings: {str(e)}'}), 500
+
+    return jsonify({
+        'message': 'Standings checked' if dry_run else 'Standings rebuilt successfully',
+        'rebuilt': not dry_run,
+        'drift': drift
+    }), 200
+
+@admin_bp.route('/replay-events', methods=['POST'])
+def replay_events():
+    """Rebuild teams, games, results and standings by replaying the event log"""
+    from services.event_log import EventReplayer
+
+    try:
+        replayed = EventReplayer(db).rebuild()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'Failed to replay events: {str(e)}'}), 500
+
+    return jsonify({
+        'message': 'Event log replayed successfully',
+        'replayed': replayed
+    }), 200
@@ -0,0 +1,31 @@
+from flask import Blueprint, Response, current_app, request, jsonify
+
+events_bp = Blueprint('events', __name__)
+
+@events_bp.route('/events', methods=['GET'])
+def stream_events():
+    """Stream tournament events as Server-Sent Events, resuming after Last-Event-ID"""
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+
+    if last_event_id is not None:
+        try:
+            last_event_id = int(last_event_id)
+        except ValueError:
+            return jsonify({'error': 'Last-Event-ID must be an integer'}), 400
+
+    # The generator outlives the request context, so resolve the app, stream and settings now
+    app = current_app._get_current_object()
+    stream = app.extensions['event_stream']
+
+    response = Response(
+        stream.subscribe(
+            app, last_event_id,
+            keepalive=app.config['EVENT_STREAM_KEEPALIVE'],
+            poll_interval=app.config['EVENT_STREAM_POLL_INTERVAL']
+        ),
+        mimetype='text/event-stream'
+    )
+    response.headers['Cache-Control'] = 'no-cache'
+    # Stop reverse proxies from buffering the stream
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
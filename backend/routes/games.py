@@ -1,34 +1,55 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from database import db
 from models.game import Game
 from models.team import Team
+from services.response_cache import cached_response
+from services.tournament_version import WriteConflict, serialized_write
 from datetime import datetime
 
 games_bp = Blueprint('games', __name__)
 
 @games_bp.route('/games', methods=['GET'])
+@cached_response
 def get_games():
-    """Get all games, optionally filtered by status"""
+    """
+    Get all games, optionally filtered by status.
+    Paged by id with limit and after (see services.pagination.Page); total=true adds the count.
+    fields (e.g. id,status,team1.id) limits each row, and the columns loaded, to those fields.
+    """
+    from services.json_provider import serialize_rows
+    from services.pagination import Page
+
+    try:
+        page = Page.from_args(request.args)
+        fields = Game.fields_from_args(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    query = Game.query_with_fields(fields)
     status = request.args.get('status')
-
     if status:
-        games = Game.query.filter_by(status=status).all()
-    else:
-        games = Game.query.all()
+        query = query.filter_by(status=status)
+
+    games, meta = page.apply(query, Game.id)
 
     return jsonify({
-        'games': [game.to_dict() for game in games]
+        'games': serialize_rows(games, fields),
+        **meta
     }), 200
 
 @games_bp.route('/games/current', methods=['GET'])
+@cached_response
 def get_current_games():
     """Get all games currently in progress"""
-    games = Game.query.filter_by(status='in_progress').all()
+    from services.json_provider import serialize_rows
+
+    games = Game.query_with_teams().filter_by(status='in_progress').all()
     return jsonify({
-        'games': [game.to_dict() for game in games]
+        'games': serialize_rows(games)
     }), 200
 
 @games_bp.route('/games/available-teams', methods=['GET'])
+@cached_response
 def get_available_teams():
     """Get teams that are not currently playing"""
     # Get teams that are in in_progress games
@@ -58,8 +79,38 @@ def generate_game():
     if not game:
         return jsonify({'error': 'No more games can be generated'}), 400
 
+    # Reload the committed game together with both teams in one statement
+    game = Game.query_with_teams().filter_by(id=game.id).one()
+
     return jsonify(game.to_dict()), 201
 
+@games_bp.route('/games/generate-round', methods=['POST'])
+def generate_round():
+    """Generate games for all free tables at once"""
+    from services.game_generator import GameGenerator
+
+    data = request.get_json(silent=True) or {}
+    tables = data.get('tables', 'max')
+
+    if tables == 'max':
+        tables = None
+    elif isinstance(tables, bool) or not isinstance(tables, int) or tables < 1:
+        return jsonify({'error': 'tables must be a positive integer or "max"'}), 400
+
+    generator = GameGenerator(db)
+    games = generator.generate_round(tables)
+
+    if not games:
+        return jsonify({'error': 'No more games can be generated'}), 400
+
+    # Reload the committed games together with their teams in one statement
+    game_ids = [game.id for game in games]
+    games = Game.query_with_teams().filter(Game.id.in_(game_ids)).order_by(Game.id).all()
+
+    return jsonify({
+        'games': [game.to_dict() for game in games]
+    }), 201
+
 @games_bp.route('/games', methods=['POST'])
 def create_game_manually():
     """Create a game manually"""
@@ -86,33 +137,43 @@ def create_game_manually():
     if team1_id > team2_id:
         team1_id, team2_id = team2_id, team1_id
 
-    # Check if teams are already playing
-    in_progress_games = Game.query.filter_by(status='in_progress').all()
-    busy_team_ids = set()
-    for game in in_progress_games:
-        busy_team_ids.add(game.team1_id)
-        busy_team_ids.add(game.team2_id)
+    def reserve(version):
+        # Checks and insert run under the tournament lock so concurrent requests cannot interleave
+        state = current_app.extensions['matchup_state']
+        with state.lock:
+            # Busy teams and played pairs come from the shared matchup state, as of the lock
+            state.sync(db.session, version)
+            busy = team1_id in state.busy_teams or team2_id in state.busy_teams
+            played = state.played.has(team1_id, team2_id)
 
-    if team1_id in busy_team_ids or team2_id in busy_team_ids:
-        return jsonify({'error': 'One or both teams are already playing'}), 400
+        if busy:
+            raise WriteConflict('One or both teams are already playing')
 
-    # Check if matchup already exists (completed games)
-    existing_game = Game.query.filter_by(
-        team1_id=team1_id,
-        team2_id=team2_id,
-        status='completed'
-    ).first()
+        if played:
+            raise WriteConflict('These teams have already played')
 
-    if existing_game:
-        return jsonify({'error': 'These teams have already played'}), 400
+        # Create game
+        game = Game(team1_id=team1_id, team2_id=team2_id)
+        db.session.add(game)
+        return game
 
-    # Create game
-    game = Game(team1_id=team1_id, team2_id=team2_id)
-    db.session.add(game)
-    db.session.commit()
+    try:
+        game = serialized_write(db.session, reserve)
+    except WriteConflict as e:
+        return jsonify({'error': str(e)}), 400
 
     return jsonify(game.to_dict()), 201
 
+def _check_teams_free(team1_id, team2_id, version):
+    """Raise WriteConflict when either team is in a game in progress; call from serialized_write work"""
+    state = current_app.extensions['matchup_state']
+    with state.lock:
+        state.sync(db.session, version)
+        busy = team1_id in state.busy_teams or team2_id in state.busy_teams
+
+    if busy:
+        raise WriteConflict('One or both teams are already playing')
+
 @games_bp.route('/games/<int:game_id>', methods=['PUT'])
 def update_game(game_id):
     """Update a game (e.g., change teams or status)"""
@@ -122,26 +183,37 @@ def update_game(game_id):
     if not data:
         return jsonify({'error': 'No data provided'}), 400
 
-    # Update teams if provided (only if game is scheduled)
-    if 'team1_id' in data or 'team2_id' in data:
-        if game.status != 'scheduled':
-            return jsonify({'error': 'Can only update teams for scheduled games'}), 400
+    def update(version):
+        # Re-read under the tournament lock: a concurrent request may have started the game
+        db.session.refresh(game)
 
-        team1_id = data.get('team1_id', game.team1_id)
-        team2_id = data.get('team2_id', game.team2_id)
+        # Update teams if provided (only if game is scheduled)
+        if 'team1_id' in data or 'team2_id' in data:
+            if game.status != 'scheduled':
+                raise WriteConflict('Can only update teams for scheduled games')
 
-        # Ensure ordering
-        if team1_id > team2_id:
-            team1_id, team2_id = team2_id, team1_id
+            team1_id = data.get('team1_id', game.team1_id)
+            team2_id = data.get('team2_id', game.team2_id)
 
-        game.team1_id = team1_id
-        game.team2_id = team2_id
+            # Ensure ordering
+            if team1_id > team2_id:
+                team1_id, team2_id = team2_id, team1_id
 
-    # Update status if provided
-    if 'status' in data:
-        game.status = data['status']
+            game.team1_id = team1_id
+            game.team2_id = team2_id
+
+        # Update status if provided; a game only goes in progress when both teams are free
+        if 'status' in data:
+            if data['status'] == 'in_progress' and game.status != 'in_progress':
+                _check_teams_free(game.team1_id, game.team2_id, version)
+            game.status = data['status']
+        return game
+
+    try:
+        serialized_write(db.session, update)
+    except WriteConflict as e:
+        return jsonify({'error': str(e)}), 400
 
-    db.session.commit()
     return jsonify(game.to_dict()), 200
 
 @games_bp.route('/games/<int:game_id>/start', methods=['POST'])
@@ -149,12 +221,20 @@ def start_game(game_id):
     """Mark a game as in_progress"""
     game = Game.query.get_or_404(game_id)
 
-    if game.status != 'scheduled':
-        return jsonify({'error': 'Only scheduled games can be started'}), 400
+    def start(version):
+        # Status and busy teams are checked under the tournament lock, like manual creation
+        db.session.refresh(game)
+        if game.status != 'scheduled':
+            raise WriteConflict('Only scheduled games can be started')
+        _check_teams_free(game.team1_id, game.team2_id, version)
 
-    game.status = 'in_progress'
-    game.started_at = datetime.utcnow()
-    db.session.commit()
+        game.status = 'in_progress'
+        game.started_at = datetime.utcnow()
+
+    try:
+        serialized_write(db.session, start)
+    except WriteConflict as e:
+        return jsonify({'error': str(e)}), 400
 
     return jsonify(game.to_dict()), 200
 
@@ -1,9 +1,10 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from database import db
 from models.result import Result
 from models.game import Game
 from models.team import Team
-from datetime import datetime
+from services.response_cache import cached_response
+from datetime import datetime, timezone
 
 results_bp = Blueprint('results', __name__)
 
@@ -53,62 +54,172 @@ def create_result():
     game.status = 'completed'
     game.completed_at = datetime.utcnow()
 
+    # Record which teams moved in the standings, for rank history
+    from services.rank_history import RankHistoryService
+    RankHistoryService(db).record(result)
+
     db.session.commit()
 
     return jsonify(result.to_dict()), 201
 
 @results_bp.route('/results', methods=['GET'])
+@cached_response
 def get_results():
-    """Get all results"""
-    results = Result.query.all()
+    """
+    Get all results.
+    Paged by id with limit and after (see services.pagination.Page); total=true adds the count.
+    fields (e.g. id,score,winning_team.name) limits each row, and the columns loaded, to those fields.
+    """
+    from services.json_provider import serialize_rows
+    from services.pagination import Page
+
+    try:
+        page = Page.from_args(request.args)
+        fields = Result.fields_from_args(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    results, meta = page.apply(Result.query_with_fields(fields), Result.id)
     return jsonify({
-        'results': [result.to_dict() for result in results]
+        'results': serialize_rows(results, fields),
+        **meta
     }), 200
 
 @results_bp.route('/results/<int:result_id>', methods=['GET'])
+@cached_response
 def get_result(result_id):
     """Get a single result by ID"""
     result = Result.query.get_or_404(result_id)
     return jsonify(result.to_dict()), 200
 
 @results_bp.route('/rankings', methods=['GET'])
+@cached_response
 def get_rankings():
-    """Get team rankings"""
-    from services.ranking_service import RankingService
+    """
+    Get team rankings, optionally as they were at a time (as_of) or after a number of games (after_game),
+    or ordered by a rating engine (mode=elo or mode=glicko2) instead of total score.
+    tie_breakers (comma-separated) overrides the configured RANKING_TIE_BREAKERS.
+    fields (e.g. rank,team_id,total_score) limits each row to those fields.
+    """
+    from models.fields import check_flat_fields, parse_fields, project_row
+    from services.ranking_service import RankingService, RANKING_FIELDS, check_tie_breakers
+    from services.rating_engine import RATING_ENGINES
+
+    mode = request.args.get('mode', 'score')
+    as_of = request.args.get('as_of')
+    after_game = request.args.get('after_game')
+    tie_breakers = request.args.get('tie_breakers')
+
+    try:
+        if tie_breakers is not None:
+            tie_breakers = [name for name in tie_breakers.split(',') if name]
+            check_tie_breakers(tie_breakers)
+        fields = parse_fields(request.args.get('fields'))
+        if fields is not None:
+            check_flat_fields(fields, RANKING_FIELDS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    if as_of is not None:
+        try:
+            as_of = datetime.fromisoformat(as_of)
+        except ValueError:
+            return jsonify({'error': 'as_of must be an ISO 8601 timestamp'}), 400
+        # Timestamps are stored as naive UTC
+        if as_of.tzinfo is not None:
+            as_of = as_of.astimezone(timezone.utc).replace(tzinfo=None)
+
+    if after_game is not None:
+        if not after_game.isdigit():
+            return jsonify({'error': 'after_game must be a non-negative integer'}), 400
+        after_game = int(after_game)
+
+    if mode != 'score':
+        if mode not in RATING_ENGINES:
+            return jsonify({'error': f"mode must be one of: score, {', '.join(RATING_ENGINES)}"}), 400
+        if as_of is not None or after_game is not None or tie_breakers is not None:
+            return jsonify({'error': 'as_of, after_game and tie_breakers are only supported with mode=score'}), 400
+        return jsonify({
+            'rankings': [project_row(row, fields) for row in RankingService(db).get_ratings(mode)]
+        }), 200
 
     ranking_service = RankingService(db)
-    rankings = ranking_service.get_rankings()
+    try:
+        rankings = ranking_service.get_rankings(as_of=as_of, after_game=after_game, tie_breakers=tie_breakers)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
     return jsonify({
-        'rankings': rankings
+        'rankings': [project_row(row, fields) for row in rankings]
     }), 200
 
+@results_bp.route('/rankings/projection', methods=['GET'])
+@cached_response
+def get_rankings_projection():
+    """
+    Get each team's probability of finishing in each rank, from simulating the remaining
+    unplayed matchups many times (runs, default PROJECTION_RUNS).
+    Answers 202 while the background simulation is still running.
+    """
+    from services.projection import ProjectionService
+
+    runs = request.args.get('runs', str(current_app.config['PROJECTION_RUNS']))
+    if not runs.isdigit() or not 1 <= int(runs) <= 100000:
+        return jsonify({'error': 'runs must be an integer between 1 and 100000'}), 400
+
+    projection = ProjectionService(db).get_projection(
+        current_app.extensions['projection'],
+        int(runs),
+        timeout=current_app.config['PROJECTION_WAIT'],
+        seed=current_app.config.get('PROJECTION_SEED')
+    )
+    if projection is None:
+        response = jsonify({'status': 'pending'})
+        response.headers['Retry-After'] = '1'
+        return response, 202
+
+    return jsonify(projection), 200
+
+@results_bp.route('/rankings/history', methods=['GET'])
+@cached_response
+def get_rankings_history():
+    """Get every team's rank and score after each result, as columns"""
+    from services.rank_history import RankHistoryService
+
+    return jsonify(RankHistoryService(db).get_history()), 200
+
 @results_bp.route('/match-matrix', methods=['GET'])
+@cached_response
 def get_match_matrix():
-    """Get match matrix showing all possible matchups and their status"""
+    """
+    Get match matrix showing all possible matchups and their status.
+    With format=compact, return only the played and in-progress pairs as parallel arrays;
+    every other pair of listed teams is unplayed.
+    """
+    from services.matchup_state import get_matchup_state
+
+    matrix_format = request.args.get('format', 'full')
+    if matrix_format not in ('full', 'compact'):
+        return jsonify({'error': 'format must be full or compact'}), 400
+
     teams = Team.query.all()
-    games = Game.query.filter(Game.status.in_(['completed', 'in_progress'])).all()
-
-    # Create a lookup for games
-    game_lookup = {}
-    for game in games:
-        key = (min(game.team1_id, game.team2_id), max(game.team1_id, game.team2_id))
-        game_lookup[key] = {
-            'game_id': game.id,
-            'status': game.status
-        }
-
-    # Build matrix
-    matrix = {}
-    for team1 in teams:
-        matrix[team1.id] = {}
-        for team2 in teams:
-            if team1.id == team2.id:
-                matrix[team1.id][team2.id] = None
-            else:
-                key = (min(team1.id, team2.id), max(team1.id, team2.id))
-                if key in game_lookup:
-                    matrix[team1.id][team2.id] = game_lookup[key]
+    state = get_matchup_state(db.session)
+
+    with state.lock:
+        if matrix_format == 'compact':
+            return jsonify(_compact_match_matrix(teams, state)), 200
+
+        # Build matrix from the latest game of each pair in the shared matchup state
+        matrix = {}
+        for team1 in teams:
+            matrix[team1.id] = {}
+            for team2 in teams:
+                if team1.id == team2.id:
+                    matrix[team1.id][team2.id] = None
+                    continue
+                latest = state.pair_status(team1.id, team2.id)
+                if latest:
+                    matrix[team1.id][team2.id] = {'game_id': latest[0], 'status': latest[1]}
                 else:
                     matrix[team1.id][team2.id] = {'status': 'unplayed'}
 
@@ -116,3 +227,16 @@ def get_match_matrix():
         'teams': [team.to_dict() for team in teams],
         'matrix': matrix
     }), 200
+
+def _compact_match_matrix(teams, state):
+    """One entry per played or in-progress pair (team1_id < team2_id), in game order, from the matchup state"""
+    pairs = sorted(state.latest_games.items(), key=lambda item: item[1][0])
+
+    return {
+        'format': 'compact',
+        'teams': [team.to_dict() for team in teams],
+        'team1_ids': [team1_id for (team1_id, _), _ in pairs],
+        'team2_ids': [team2_id for (_, team2_id), _ in pairs],
+        'game_ids': [game_id for _, (game_id, _) in pairs],
+        'statuses': [status for _, (_, status) in pairs]
+    }
@@ -0,0 +1,20 @@
+from flask import Blueprint, request, jsonify
+from database import db
+from services.response_cache import cached_response
+
+sync_bp = Blueprint('sync', __name__)
+
+@sync_bp.route('/sync', methods=['GET'])
+@cached_response
+def sync_changes():
+    """Get the teams, games and results changed since a tournament version, with tombstones"""
+    from services.sync_service import SyncService
+
+    try:
+        since = int(request.args.get('since', 0))
+    except ValueError:
+        since = -1
+    if since < 0:
+        return jsonify({'error': 'since must be a non-negative integer'}), 400
+
+    return jsonify(SyncService(db).changes_since(since)), 200
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from database import db
 from models.team import Team
+from services.response_cache import cached_response
 import random
 
 teams_bp = Blueprint('teams', __name__)
@@ -57,14 +58,31 @@ def create_teams():
     }), 201
 
 @teams_bp.route('/teams', methods=['GET'])
+@cached_response
 def get_teams():
-    """Get all teams"""
-    teams = Team.query.all()
+    """
+    Get all teams.
+    Paged by id with limit and after (see services.pagination.Page); total=true adds the count.
+    fields (e.g. id,name) limits each row, and the columns loaded, to those fields.
+    """
+    from services.json_provider import team_encoder
+    from services.pagination import Page
+
+    try:
+        page = Page.from_args(request.args)
+        fields = Team.fields_from_args(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    teams, meta = page.apply(Team.query_with_fields(fields), Team.id)
+    encode = team_encoder() if fields is None else lambda team: team.to_dict(fields)
     return jsonify({
-        'teams': [team.to_dict() for team in teams]
+        'teams': [encode(team) for team in teams],
+        **meta
     }), 200
 
 @teams_bp.route('/teams/<int:team_id>', methods=['GET'])
+@cached_response
 def get_team(team_id):
     """Get a single team by ID"""
     team = Team.query.get_or_404(team_id)
@@ -0,0 +1,251 @@
+from models.team import Team
+from models.game import Game
+from models.result import Result
+from models.standing import Standing
+from models.tournament_event import TournamentEvent
+from collections import defaultdict
+from datetime import datetime
+from sqlalchemy import DateTime, event, inspect, select, insert, delete, func
+from sqlalchemy.orm import Session
+
+# Models whose writes are logged, by the entity name stored with each event
+LOGGED_MODELS = {'team': Team, 'game': Game, 'result': Result}
+ENTITY_NAMES = {model: name for name, model in LOGGED_MODELS.items()}
+
+# Game status changes get their own event types, matching the live event stream
+GAME_STATUS_EVENTS = {'in_progress': 'game_started', 'completed': 'game_completed'}
+
+CLEAR_EVENT = 'database_cleared'
+
+# Set on a session whose transaction logged events; its commit wakes event stream subscribers
+EVENTS_LOGGED_KEY = 'events_logged'
+
+
+def _transaction_version(session):
+    from services.tournament_version import bump_version, pending_version_span
+
+    span = pending_version_span(session)
+    return span[1] if span is not None else bump_version(session)
+
+
+def _encode(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _row_values(obj, keys=None):
+    """Column values of a row (or only the given columns), JSON-ready"""
+    columns = inspect(type(obj)).column_attrs
+    return {
+        column.key: _encode(getattr(obj, column.key))
+        for column in columns
+        if keys is None or column.key in keys
+    }
+
+
+def _changed_keys(obj):
+    state = inspect(obj)
+    return {
+        column.key for column in state.mapper.column_attrs
+        if state.attrs[column.key].history.added
+    }
+
+
+def record_events(session, flush_context):
+    """Append one event per team, game and result row written by a flush, in the flush's transaction"""
+    rows = []
+
+    for obj in session.new:
+        entity = ENTITY_NAMES.get(type(obj))
+        if entity:
+            rows.append((f'{entity}_created', entity, obj.id, _row_values(obj)))
+
+    for obj in session.dirty:
+        entity = ENTITY_NAMES.get(type(obj))
+        if not entity or not session.is_modified(obj):
+            continue
+        changed = _changed_keys(obj)
+        if not changed:
+            continue
+        event_type = f'{entity}_updated'
+        if entity == 'game' and 'status' in changed:
+            event_type = GAME_STATUS_EVENTS.get(obj.status, event_type)
+        rows.append((event_type, entity, obj.id, _row_values(obj, changed | {'id'})))
+
+    for obj in session.deleted:
+        entity = ENTITY_NAMES.get(type(obj))
+        if entity:
+            rows.append((f'{entity}_deleted', entity, obj.id, {'id': obj.id}))
+
+    if rows:
+        session.info[EVENTS_LOGGED_KEY] = True
+        version = _transaction_version(session)
+        now = datetime.utcnow()
+        session.connection().execute(insert(TournamentEvent), [
+            {'version': version, 'type': event_type, 'entity': entity, 'entity_id': entity_id,
+             'data': data, 'created_at': now}
+            for event_type, entity, entity_id, data in rows
+        ])
+
+
+def record_clear(session, deleted):
+    """Log that every team, game and result was removed by bulk deletes, which bypass the flush"""
+    session.info[EVENTS_LOGGED_KEY] = True
+    session.connection().execute(insert(TournamentEvent).values(
+        version=_transaction_version(session),
+        type=CLEAR_EVENT,
+        data={'deleted': deleted},
+        created_at=datetime.utcnow()
+    ))
+
+
+def register_event_log_listener():
+    """Attach the event log writer to every SQLAlchemy session (idempotent)"""
+    if not event.contains(Session, 'after_flush', record_events):
+        event.listen(Session, 'after_flush', record_events)
+
+
+class EventReplayer:
+    """
+    Rebuild teams, games, results and standings from the event log.
+    Events are streamed in id order in batches and folded into plain dicts, so memory holds the
+    resulting tournament rather than the log. Nothing before the last clear is read.
+    """
+
+    def __init__(self, db, batch_size=5000):
+        self.db = db
+        self.batch_size = batch_size
+
+    def _start_id(self, until):
+        """Id of the last clear at or before `until`, where replay can start from empty tables"""
+        query = select(func.max(TournamentEvent.id)).where(TournamentEvent.type == CLEAR_EVENT)
+        if until is not None:
+            query = query.where(TournamentEvent.id <= until)
+        return self.db.session.execute(query).scalar() or 0
+
+    def batches(self, until=None):
+        """Yield lists of (type, entity, entity_id, data) in log order, after the last clear"""
+        query = (
+            select(TournamentEvent.type, TournamentEvent.entity, TournamentEvent.entity_id, TournamentEvent.data)
+            .where(TournamentEvent.id > self._start_id(until))
+            .order_by(TournamentEvent.id)
+            .execution_options(yield_per=self.batch_size)
+        )
+        if until is not None:
+            query = query.where(TournamentEvent.id <= until)
+
+        for partition in self.db.session.execute(query).partitions():
+            yield partition
+
+    def fold(self, until=None):
+        """
+        Return the tournament as of event id `until` (default: the latest event) as
+        {'team': {id: values}, 'game': {...}, 'result': {...}} plus the number of events applied.
+        """
+        state = {entity: {} for entity in LOGGED_MODELS}
+        applied = 0
+
+        for batch in self.batches(until):
+            for event_type, entity, entity_id, data in batch:
+                if event_type == CLEAR_EVENT:
+                    for rows in state.values():
+                        rows.clear()
+                elif event_type.endswith('_created'):
+                    state[entity][entity_id] = dict(data)
+                elif event_type.endswith('_deleted'):
+                    state[entity].pop(entity_id, None)
+                elif entity_id in state[entity]:
+                    state[entity][entity_id].update(data)
+            applied += len(batch)
+
+        return state, applied
+
+    def rebuild(self):
+        """
+        Replace teams, games, results and standings with the replayed log, rebuild the rank
+        history from them and commit.
+        Returns the number of events replayed and rows restored per table.
+        """
+        from services.rank_history import RankHistoryService
+        from services.tournament_version import bump_version
+
+        state, applied = self.fold()
+        session = self.db.session
+
+        # ORM-level deletes mark the cached matchup state stale; the rows below bypass the
+        # flush, so the replay itself is not logged again
+        for model in (Result, Game, Standing, Team):
+            session.execute(delete(model))
+
+        connection = session.connection()
+        for entity, model in LOGGED_MODELS.items():
+            rows = [self._decode(model, values) for _, values in sorted(state[entity].items())]
+            for start in range(0, len(rows), self.batch_size):
+                connection.execute(insert(model), rows[start:start + self.batch_size])
+
+        self._reset_sequences(connection)
+
+        standings = self._standings(state)
+        if standings:
+            connection.execute(insert(Standing), standings)
+
+        # Snapshots of the old rows would name results that are gone or have new ids
+        RankHistoryService(self.db).rebuild()
+
+        bump_version(session)
+        session.commit()
+
+        return {
+            'events': applied,
+            'teams': len(state['team']),
+            'games': len(state['game']),
+            'results': len(state['result'])
+        }
+
+    @staticmethod
+    def _reset_sequences(connection):
+        """
+        Move PostgreSQL id sequences past the replayed ids, which were inserted explicitly and so
+        never drew from them. SQLite takes the next id from the table itself.
+        """
+        if connection.dialect.name != 'postgresql':
+            return
+        for model in LOGGED_MODELS.values():
+            table = model.__table__.name
+            connection.execute(
+                select(func.setval(
+                    func.pg_get_serial_sequence(table, 'id'),
+                    func.coalesce(select(func.max(model.id)).scalar_subquery(), 0) + 1,
+                    False
+                ))
+            )
+
+    @staticmethod
+    def _decode(model, values):
+        datetime_keys = {
+            column.key for column in inspect(model).column_attrs
+            if isinstance(column.expression.type, DateTime)
+        }
+        return {
+            key: datetime.fromisoformat(value) if key in datetime_keys and value else value
+            for key, value in values.items()
+        }
+
+    @staticmethod
+    def _standings(state):
+        """Standing rows derived from replayed games and results, as the standings listener would keep them"""
+        totals = defaultdict(lambda: {'games_played': 0, 'games_won': 0, 'total_score': 0})
+
+        for game in state['game'].values():
+            if game.get('status') == 'completed':
+                totals[game['team1_id']]['games_played'] += 1
+                totals[game['team2_id']]['games_played'] += 1
+        for result in state['result'].values():
+            totals[result['winning_team_id']]['games_won'] += 1
+            totals[result['winning_team_id']]['total_score'] += result['score'] or 0
+
+        now = datetime.utcnow()
+        return [
+            dict(values, team_id=team_id, updated_at=now)
+            for team_id, values in sorted(totals.items())
+            if team_id in state['team']
+        ]
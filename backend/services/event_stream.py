@@ -0,0 +1,149 @@
+from flask import current_app, has_app_context
+from models.tournament_event import TournamentEvent
+from services.event_log import EVENTS_LOGGED_KEY
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+import json
+import threading
+import time
+
+EVENT_TYPES = ('team_created', 'game_started', 'game_completed', 'result_created', 'database_cleared')
+
+# Generated games are created in progress, so their creation is streamed as a start
+LOGGED_TYPES = (*EVENT_TYPES, 'game_created')
+
+
+def stream_type(event_type, data):
+    """Event type sent to subscribers for a logged event, None for events that are not streamed"""
+    if event_type == 'game_created':
+        return 'game_started' if data.get('status') == 'in_progress' else None
+    return event_type
+
+
+class EventStream:
+    """
+    Tournament events read from the durable event log (services.event_log), so every worker
+    streams the same events under the same ids, and Last-Event-ID stays valid across restarts.
+    A commit that logged events wakes this process's subscribers at once; events committed by
+    other workers are picked up by polling the log every poll_interval seconds.
+    Clients further behind than history events are told to refetch instead of replaying the gap.
+    """
+
+    def __init__(self, history=1000):
+        self.history = history
+        self._commits = 0
+        self._condition = threading.Condition()
+
+    def notify(self):
+        """Wake every waiting subscriber of this process: new events were committed"""
+        with self._condition:
+            self._commits += 1
+            self._condition.notify_all()
+
+    def wait(self, commits, timeout):
+        """Block until a commit after the given commit count is notified (True) or the timeout expires (False)"""
+        with self._condition:
+            return self._condition.wait_for(lambda: self._commits != commits, timeout)
+
+    @staticmethod
+    def latest_id(session):
+        return session.execute(select(func.max(TournamentEvent.id))).scalar() or 0
+
+    def events_after(self, session, last_event_id):
+        """
+        Return the streamed events (id, type, data) logged after the given id.
+        Returns None when more than history events were missed, so the gap is not replayed.
+        """
+        rows = session.execute(
+            select(TournamentEvent.id, TournamentEvent.type, TournamentEvent.data)
+            .where(TournamentEvent.id > last_event_id, TournamentEvent.type.in_(LOGGED_TYPES))
+            .order_by(TournamentEvent.id)
+            .limit(self.history + 1)
+        ).all()
+        if len(rows) > self.history:
+            return None
+
+        events = []
+        for event_id, event_type, data in rows:
+            event_type = stream_type(event_type, data)
+            if event_type is not None:
+                events.append((event_id, event_type, data))
+        return events
+
+    def subscribe(self, app, last_event_id=None, keepalive=15, poll_interval=1):
+        """
+        Yield the stream as text/event-stream chunks, starting after last_event_id.
+        Without a last id only new events are sent; a comment line every keepalive seconds keeps proxies from
+        closing an idle connection. Each read runs in its own app context and session, so no transaction stays
+        open between polls.
+        """
+        from database import db
+
+        def read(work):
+            with app.app_context():
+                try:
+                    return work(db.session)
+                finally:
+                    db.session.remove()
+
+        yield 'retry: 3000\n\n'
+
+        latest = read(self.latest_id)
+        if last_event_id is None:
+            last_event_id = latest
+        elif last_event_id > latest:
+            # The id comes from another database (e.g. one that was recreated), so events may have been missed
+            last_event_id = latest
+            yield format_event(last_event_id, 'resync', {})
+
+        idle_since = time.monotonic()
+        while True:
+            # Read the commit count first: a commit notified during the query is not waited for
+            commits = self._commits
+            events = read(lambda session: self.events_after(session, last_event_id))
+            if events is None:
+                # Too far behind to replay: tell the client to refetch everything
+                last_event_id = read(self.latest_id)
+                yield format_event(last_event_id, 'resync', {})
+                idle_since = time.monotonic()
+                continue
+            if events:
+                for event_id, event_type, data in events:
+                    yield format_event(event_id, event_type, data)
+                    last_event_id = event_id
+                idle_since = time.monotonic()
+                continue
+
+            idle = time.monotonic() - idle_since
+            if idle >= keepalive:
+                yield ': keepalive\n\n'
+                idle_since = time.monotonic()
+                continue
+            self.wait(commits, min(poll_interval, keepalive - idle))
+
+
+def format_event(event_id, event_type, data):
+    return f'id: {event_id}\nevent: {event_type}\ndata: {json.dumps(data)}\n\n'
+
+
+def notify_subscribers(session):
+    """Wake the current app's subscribers after a commit that logged events"""
+    if session.info.pop(EVENTS_LOGGED_KEY, False) and has_app_context():
+        stream = current_app.extensions.get('event_stream')
+        if stream is not None:
+            stream.notify()
+
+
+def discard_logged_flag(session):
+    session.info.pop(EVENTS_LOGGED_KEY, None)
+
+
+def register_event_stream_listeners():
+    """Attach the subscriber wake-up to every SQLAlchemy session (idempotent)"""
+    listeners = (
+        ('after_commit', notify_subscribers),
+        ('after_rollback', discard_logged_flag),
+    )
+    for name, listener in listeners:
+        if not event.contains(Session, name, listener):
+            event.listen(Session, name, listener)
@@ -1,49 +1,38 @@
 from models.game import Game
-from models.team import Team
-from itertools import combinations
-import statistics
+from services.matchup_state import get_matchup_state
+from services.tournament_version import WriteConflict, serialized_write
+import networkx as nx
 
 class GameGenerator:
     def __init__(self, db):
         self.db = db
-        self.played_matchups = self._load_played_matchups()
-        self.team_game_count = self._load_team_game_counts()
-
-    def _load_played_matchups(self):
-        """Load all matchups that have been completed"""
-        completed_games = Game.query.filter_by(status='completed').all()
-        matchups = set()
-
-        for game in completed_games:
-            # Store as frozenset to make it order-independent
-            matchup = frozenset([game.team1_id, game.team2_id])
-            matchups.add(matchup)
-
-        return matchups
-
-    def _load_team_game_counts(self):
-        """Load the number of games each team has played"""
-        from collections import defaultdict
-
-        team_counts = defaultdict(int)
-        completed_games = Game.query.filter_by(status='completed').all()
-
-        for game in completed_games:
-            team_counts[game.team1_id] += 1
-            team_counts[game.team2_id] += 1
-
-        return team_counts
+        # Shared, incrementally maintained view of played pairs, game counts and busy teams
+        self.state = get_matchup_state(db.session)
+
+    @property
+    def played_matchups(self):
+        """Matchups that have been completed"""
+        return self.state.played_matchups
+
+    @property
+    def team_game_count(self):
+        """The number of games each team has played"""
+        return self.state.team_game_count
+
+    def remaining_matchups(self):
+        """Sorted (team1_id, team2_id) pairs of teams that have not completed a game against each other"""
+        played = self.state.played
+        team_ids = sorted(self.state.team_ids)
+        return [
+            (team1_id, team2_id)
+            for i, team1_id in enumerate(team_ids)
+            for team2_id in team_ids[i + 1:]
+            if not played.has(team1_id, team2_id)
+        ]
 
     def _get_currently_playing_teams(self):
         """Get set of team IDs that are currently playing"""
-        in_progress_games = Game.query.filter_by(status='in_progress').all()
-        busy_teams = set()
-
-        for game in in_progress_games:
-            busy_teams.add(game.team1_id)
-            busy_teams.add(game.team2_id)
-
-        return busy_teams
+        return set(self.state.busy_teams)
 
     def _score_matchup(self, team1_id, team2_id):
         """
@@ -65,65 +54,151 @@ class GameGenerator:
 
         return fairness_score + balance_penalty
 
-    def generate_next_game(self):
+    def _select_best_matchup(self, available_team_ids):
         """
-        Generate the next fair game.
-        Returns a Game object (not yet committed to DB) or None if no game can be generated.
+        Return the unplayed pair of available teams that _score_matchup ranks first, or None.
+
+        The score is -(c1 + c2) - |c1 - c2| = -2 * max(c1, c2), so the best pairs are the
+        unplayed ones whose busier team has the fewest games. Teams are bucketed by game
+        count and added lowest bucket first; the first bucket that makes an unplayed pair
+        possible fixes the best score. Ties keep the order of sorting (score, team1, team2)
+        descending: highest lower id first, then highest higher id. Only already-played
+        pairs are ever skipped, so the cost is O(teams + played pairs), not O(teams^2).
         """
-        # Get all teams
-        all_teams = Team.query.all()
-        team_ids = [team.id for team in all_teams]
-
-        if len(team_ids) < 2:
+        played = self.state.played
+
+        buckets = {}
+        for team_id in available_team_ids:
+            buckets.setdefault(self.team_game_count.get(team_id, 0), []).append(team_id)
+
+        eligible = set()
+        for count in sorted(buckets):
+            eligible.update(buckets[count])
+            if self._has_unplayed_pair(eligible):
+                break
+        else:
             return None
 
-        # Get teams that are currently playing
+        team_ids = sorted(eligible, reverse=True)
+        for i, team1_id in enumerate(team_ids):
+            # Candidates are the higher ids, scanned from the highest down
+            for j in range(i):
+                team2_id = team_ids[j]
+                if not played.has(team1_id, team2_id):
+                    return team1_id, team2_id
+
+        return None
+
+    def _has_unplayed_pair(self, team_ids):
+        """Whether at least two of the given teams have not played each other yet"""
+        played = self.state.played
+        others = len(team_ids) - 1
+        mask = played.mask(team_ids)
+
+        for team_id in team_ids:
+            # One AND and popcount per team instead of scanning its partners
+            if played.count_among(team_id, mask) < others:
+                return True
+
+        return False
+
+    def _get_available_team_ids(self):
+        """Sorted ids of teams that are not currently playing"""
         busy_teams = self._get_currently_playing_teams()
+        return [tid for tid in sorted(self.state.team_ids) if tid not in busy_teams]
+
+    def _select_best_round(self, available_team_ids, tables=None):
+        """
+        Return disjoint unplayed pairs among the available teams, as many as possible up to
+        `tables` (no limit if None), maximizing the total _score_matchup of the round.
+
+        Solved as a maximum-weight matching with maximum cardinality. Scores are shifted to
+        be positive so the matching never prefers leaving a table empty. With a table limit,
+        dummy vertices stand in for the teams that sit out: they connect to every team with
+        a weight above any real pairing, so each one absorbs exactly one team and at most
+        `tables` real pairs remain.
+        """
+        counts = [self.team_game_count.get(tid, 0) for tid in available_team_ids]
+        shift = 2 * max(counts, default=0) + 1
+
+        graph = nx.Graph()
+        graph.add_nodes_from(available_team_ids)
+        played = self.state.played
+        for i, team1_id in enumerate(available_team_ids):
+            for team2_id in available_team_ids[i + 1:]:
+                if not played.has(team1_id, team2_id):
+                    weight = self._score_matchup(team1_id, team2_id) + shift
+                    graph.add_edge(team1_id, team2_id, weight=weight)
+
+        sitting_out = len(available_team_ids) - 2 * tables if tables is not None else 0
+        sit_out_weight = shift * (len(available_team_ids) + 1)
+        for i in range(max(sitting_out, 0)):
+            dummy = ('sit_out', i)
+            for team_id in available_team_ids:
+                graph.add_edge(dummy, team_id, weight=sit_out_weight)
+
+        matching = nx.max_weight_matching(graph, maxcardinality=True)
+
+        pairs = [
+            (min(u, v), max(u, v)) for u, v in matching
+            if not isinstance(u, tuple) and not isinstance(v, tuple)
+        ]
+        return sorted(pairs)
+
+    def _reserve(self, select_pairs):
+        """
+        Start games for the pairs chosen by select_pairs(available_team_ids) and commit them.
+        The tournament lock is held from before the busy teams are read until the commit, so
+        concurrent generators (threads or workers) can never book the same team twice.
+        """
+        def reserve(version):
+            with self.state.lock:
+                # Pick up writes committed by other requests or workers, as of the lock
+                self.state.sync(self.db.session, version)
+                available_team_ids = self._get_available_team_ids()
+                pairs = select_pairs(available_team_ids) if len(available_team_ids) >= 2 else []
+
+            if not pairs:
+                raise WriteConflict('No more games can be generated')
+
+            # Create games and start them immediately
+            from datetime import datetime
+            started_at = datetime.utcnow()
+            games = [
+                Game(team1_id=team1_id, team2_id=team2_id, status='in_progress', started_at=started_at)
+                for team1_id, team2_id in pairs
+            ]
+            self.db.session.add_all(games)
+            return games
+
+        try:
+            return serialized_write(self.db.session, reserve)
+        except WriteConflict:
+            return []
+
+    def generate_round(self, tables=None):
+        """
+        Generate games for up to `tables` free tables at once (as many as possible if None).
+        All games are started and committed in one transaction. Returns the list of games.
+        """
+        if tables == 0:
+            return []
+
+        return self._reserve(lambda available: self._select_best_round(available, tables))
+
+    def generate_next_game(self):
+        """
+        Generate the next fair game.
+        Returns the committed, in-progress Game or None if no game can be generated.
+        """
+        def select_pair(available_team_ids):
+            # Select the best unplayed matchup without enumerating every pair
+            best = self._select_best_matchup(available_team_ids)
+            if best is None:
+                return []  # All available matchups have been played
+
+            # Ensure team1_id < team2_id for database constraint
+            return [tuple(sorted(best))]
 
-        # Get available teams
-        available_team_ids = [tid for tid in team_ids if tid not in busy_teams]
-
-        if len(available_team_ids) < 2:
-            return None  # Not enough available teams
-
-        # Generate all possible matchups from available teams
-        possible_matchups = list(combinations(available_team_ids, 2))
-
-        # Filter out already-played matchups
-        unplayed_matchups = []
-        for team1_id, team2_id in possible_matchups:
-            matchup = frozenset([team1_id, team2_id])
-            if matchup not in self.played_matchups:
-                unplayed_matchups.append((team1_id, team2_id))
-
-        if not unplayed_matchups:
-            return None  # All available matchups have been played
-
-        # Score each matchup and select the best one
-        scored_matchups = []
-        for team1_id, team2_id in unplayed_matchups:
-            score = self._score_matchup(team1_id, team2_id)
-            scored_matchups.append((score, team1_id, team2_id))
-
-        # Sort by score (highest first)
-        scored_matchups.sort(reverse=True)
-
-        # Select best matchup
-        _, team1_id, team2_id = scored_matchups[0]
-
-        # Ensure team1_id < team2_id for database constraint
-        if team1_id > team2_id:
-            team1_id, team2_id = team2_id, team1_id
-
-        # Create game and start it immediately
-        from datetime import datetime
-        game = Game(
-            team1_id=team1_id,
-            team2_id=team2_id,
-            status='in_progress',
-            started_at=datetime.utcnow()
-        )
-        self.db.session.add(game)
-        self.db.session.commit()
-
-        return game
+        games = self._reserve(select_pair)
+        return games[0] if games else None
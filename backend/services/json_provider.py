@@ -0,0 +1,89 @@
+from flask import current_app, g
+from flask.json.provider import DefaultJSONProvider
+import orjson
+import threading
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson. Datetimes are encoded natively (ISO 8601, as isoformat()),
+    numpy values and non-string keys are accepted, and orjson.Fragment values are copied into the
+    output as already encoded JSON. Keys stay sorted as with Flask's default provider.
+    Calls with json.dumps keyword arguments fall back to the default provider.
+    """
+
+    def _options(self, indent=False):
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._options()).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default=self.default, option=self._options(indent) | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+class TeamFragments:
+    """
+    Teams encoded once as orjson fragments, for embedding in game and result rows without
+    serializing the same team again for every game it played. Valid for a single tournament
+    version, like the response cache: a newer version drops every fragment.
+    """
+
+    def __init__(self):
+        self.version = None
+        self._fragments = {}
+        self._lock = threading.Lock()
+
+    def encoder(self, version, sort_keys=True):
+        """Return team -> orjson.Fragment for this version"""
+        with self._lock:
+            if version != self.version:
+                self.version = version
+                self._fragments = {}
+            fragments = self._fragments
+        option = orjson.OPT_SORT_KEYS if sort_keys else 0
+
+        def encode(team):
+            if team is None:
+                return None
+            fragment = fragments.get(team.id)
+            if fragment is None:
+                fragment = fragments[team.id] = orjson.Fragment(orjson.dumps(team.to_dict(), option=option))
+            return fragment
+
+        return encode
+
+
+def team_encoder():
+    """Team fragment encoder of the current app at the tournament version of this request"""
+    from database import db
+    from services.tournament_version import current_version
+
+    # Cached views have already read the version
+    version = g.get('tournament_version')
+    if version is None:
+        version = current_version(db.session)
+    return current_app.extensions['team_fragments'].encoder(version, current_app.json.sort_keys)
+
+
+def serialize_rows(rows, fields=None):
+    """Game or result rows of a list response (the requested fields, or whole rows), whole teams pre-encoded"""
+    encode_team = team_encoder()
+    if fields is None:
+        return type(rows[0]).to_json_rows(rows, encode_team) if rows else []
+    return [row.to_dict(fields, encode_team) for row in rows]
@@ -0,0 +1,257 @@
+from models.team import Team
+from models.game import Game
+from collections import Counter, defaultdict
+from flask import current_app, has_app_context
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+from services.pair_matrix import PairMatrix, PairSet
+import threading
+
+PENDING_KEY = 'matchup_state_pending'
+STALE_KEY = 'matchup_state_stale'
+
+# Statuses that affect generation: completed games are history, in-progress games make teams busy
+TRACKED_STATUSES = ('completed', 'in_progress')
+
+
+class MatchupState:
+    """
+    Completed and in-progress pairs as bit matrices, the latest tracked game of each pair,
+    per-team game counts and busy teams, shared by every request of a process.
+    Built once from the database, then kept current from the deltas of committed flushes.
+    Valid only while its version equals the tournament version stored in the database.
+    """
+
+    def __init__(self):
+        self.version = None
+        self.team_ids = set()
+        self.played = PairMatrix()
+        self.in_progress = PairMatrix()
+        self.latest_games = {}
+        self.team_game_count = defaultdict(int)
+        self.busy_teams = Counter()
+        self._removed_games = {}
+        self.lock = threading.RLock()
+
+    @property
+    def played_matchups(self):
+        """Completed matchups as a set of frozenset pairs, backed by the played matrix"""
+        return PairSet(self.played)
+
+    def load(self, session, version):
+        """Rebuild everything from the database at the given version"""
+        team_ids = set(session.execute(select(Team.id)).scalars())
+        games = session.execute(
+            select(Game.team1_id, Game.team2_id, Game.status, Game.id)
+            .where(Game.status.in_(TRACKED_STATUSES))
+            .order_by(Game.id)
+        ).all()
+
+        with self.lock:
+            self.team_ids = team_ids
+            self.played = PairMatrix()
+            self.in_progress = PairMatrix()
+            self.latest_games = {}
+            self.team_game_count = defaultdict(int)
+            self.busy_teams = Counter()
+            self._removed_games = {}
+            for team1_id, team2_id, status, game_id in games:
+                self._apply_game(team1_id, team2_id, status, 1, game_id)
+            self.version = version
+
+    def invalidate(self):
+        with self.lock:
+            self.version = None
+
+    def sync(self, session, version=None):
+        """
+        Make sure the state matches the database, rebuilding only if another writer moved it.
+        Pass the version explicitly when the session has already bumped it without committing.
+        """
+        from services.tournament_version import current_version
+
+        if version is None:
+            version = current_version(session)
+        with self.lock:
+            if self.version != version:
+                self.load(session, version)
+        return self
+
+    def pair_status(self, team1_id, team2_id):
+        """(game_id, status) of the latest completed or in-progress game between two teams, or None"""
+        return self.latest_games.get((min(team1_id, team2_id), max(team1_id, team2_id)))
+
+    def _apply_game(self, team1_id, team2_id, status, sign, game_id=None):
+        pair = (min(team1_id, team2_id), max(team1_id, team2_id))
+        if status == 'completed':
+            if sign > 0:
+                self.played.add(team1_id, team2_id)
+            else:
+                self.played.remove(team1_id, team2_id)
+            self.team_game_count[team1_id] += sign
+            self.team_game_count[team2_id] += sign
+        elif status == 'in_progress':
+            if sign > 0:
+                self.in_progress.add(team1_id, team2_id)
+            else:
+                self.in_progress.remove(team1_id, team2_id)
+            for team_id in (team1_id, team2_id):
+                self.busy_teams[team_id] += sign
+                if self.busy_teams[team_id] <= 0:
+                    del self.busy_teams[team_id]
+
+        if game_id is None:
+            return
+        latest = self.latest_games.get(pair)
+        if sign > 0:
+            if latest is None or game_id >= latest[0]:
+                self.latest_games[pair] = (game_id, status)
+            if self._removed_games.get(pair) == game_id:
+                del self._removed_games[pair]
+        elif latest is not None and latest[0] == game_id:
+            # Resolved in _settle_latest_games, once the game's new status (if any) is applied
+            self._removed_games[pair] = game_id
+
+    def _settle_latest_games(self):
+        """
+        Drop the latest game of pairs whose game left the tracked statuses.
+        Returns False if an older game of the pair is still tracked, whose id is not kept.
+        """
+        removed, self._removed_games = self._removed_games, {}
+        for pair, game_id in removed.items():
+            if self.played.has(*pair) or self.in_progress.has(*pair):
+                return False
+            del self.latest_games[pair]
+        return True
+
+    def apply(self, deltas, version_before, version_after):
+        """
+        Apply committed deltas if they directly follow the state's version.
+        Any gap means another writer committed in between, so the state is dropped instead.
+        """
+        with self.lock:
+            if self.version is None:
+                return
+            if self.version != version_before:
+                self.version = None
+                return
+
+            for delta in deltas:
+                kind = delta[0]
+                if kind == 'team_added':
+                    self.team_ids.add(delta[1])
+                elif kind == 'team_removed':
+                    self.team_ids.discard(delta[1])
+                elif kind == 'game':
+                    _, game_id, old, new = delta
+                    if old:
+                        self._apply_game(*old, -1, game_id)
+                    if new:
+                        self._apply_game(*new, 1, game_id)
+
+            self.version = version_after if self._settle_latest_games() else None
+
+
+def get_matchup_state(session):
+    """Return this process's matchup state, synced with the database"""
+    return current_app.extensions['matchup_state'].sync(session)
+
+
+def _before_flush_value(obj, attr):
+    """Return (known, value) for an attribute as it was before the flush that just ran"""
+    state = inspect(obj)
+    if attr in state.unloaded:
+        return False, None
+    history = state.attrs[attr].history
+    if history.deleted:
+        return True, history.deleted[0]
+    if history.added:
+        # Overwritten without the old value ever being loaded
+        return False, None
+    return True, getattr(obj, attr)
+
+
+def _game_key(team1_id, team2_id, status):
+    return (team1_id, team2_id, status) if status in TRACKED_STATUSES else None
+
+
+def collect_matchup_deltas(session, flush_context):
+    """Record the team and game changes of a flush, applied to the shared state on commit"""
+    pending = session.info.setdefault(PENDING_KEY, [])
+
+    for obj in session.new:
+        if isinstance(obj, Team):
+            pending.append(('team_added', obj.id))
+        elif isinstance(obj, Game):
+            new = _game_key(obj.team1_id, obj.team2_id, obj.status)
+            if new:
+                pending.append(('game', obj.id, None, new))
+
+    for obj in session.dirty:
+        if isinstance(obj, Game) and session.is_modified(obj):
+            values = [_before_flush_value(obj, attr) for attr in ('team1_id', 'team2_id', 'status')]
+            if not all(known for known, _ in values):
+                session.info[STALE_KEY] = True
+                continue
+            old = _game_key(*(value for _, value in values))
+            new = _game_key(obj.team1_id, obj.team2_id, obj.status)
+            if old != new:
+                pending.append(('game', obj.id, old, new))
+
+    for obj in session.deleted:
+        if isinstance(obj, Team):
+            pending.append(('team_removed', obj.id))
+        elif isinstance(obj, Game):
+            values = [_before_flush_value(obj, attr) for attr in ('team1_id', 'team2_id', 'status')]
+            if not all(known for known, _ in values):
+                session.info[STALE_KEY] = True
+                continue
+            old = _game_key(*(value for _, value in values))
+            if old:
+                pending.append(('game', obj.id, old, None))
+
+
+def mark_bulk_writes_stale(orm_execute_state):
+    """Bulk UPDATE/DELETE statements bypass the flush, so the shared state cannot follow them"""
+    if orm_execute_state.is_update or orm_execute_state.is_delete:
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None and mapper.class_ in (Team, Game):
+            orm_execute_state.session.info[STALE_KEY] = True
+
+
+def apply_committed_deltas(session):
+    from services.tournament_version import pending_version_span
+
+    deltas = session.info.pop(PENDING_KEY, [])
+    stale = session.info.pop(STALE_KEY, False)
+    span = pending_version_span(session)
+
+    if span is None or not has_app_context():
+        return
+
+    state = current_app.extensions.get('matchup_state')
+    if state is None:
+        return
+
+    if stale:
+        state.invalidate()
+    else:
+        state.apply(deltas, *span)
+
+
+def discard_pending_deltas(session):
+    session.info.pop(PENDING_KEY, None)
+    session.info.pop(STALE_KEY, None)
+
+
+def register_matchup_listeners():
+    """Attach delta tracking for the shared matchup state to every session (idempotent)"""
+    listeners = (
+        ('after_flush', collect_matchup_deltas),
+        ('do_orm_execute', mark_bulk_writes_stale),
+        ('after_commit', apply_committed_deltas),
+        ('after_rollback', discard_pending_deltas),
+    )
+    for name, listener in listeners:
+        if not event.contains(Session, name, listener):
+            event.listen(Session, name, listener)
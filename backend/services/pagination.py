@@ -0,0 +1,58 @@
+from sqlalchemy import func, select
+
+# Largest page a client may ask for, and the page size when none is given
+MAX_PAGE_SIZE = 500
+
+
+class Page:
+    """
+    Keyset pagination on a monotonically increasing id column: rows with id > after, in id order.
+    Each page costs one indexed range scan however deep the cursor is, unlike OFFSET.
+    Without limit a page holds MAX_PAGE_SIZE rows, so no request reads an unbounded list.
+    """
+
+    def __init__(self, limit=MAX_PAGE_SIZE, after=None, with_total=False):
+        self.limit = limit
+        self.after = after
+        self.with_total = with_total
+
+    @classmethod
+    def from_args(cls, args):
+        """Parse limit, after and total from request arguments, raising ValueError with a client message"""
+        limit = args.get('limit', str(MAX_PAGE_SIZE))
+        after = args.get('after')
+        total = args.get('total', 'false').lower()
+
+        if not limit.isdigit() or not 1 <= int(limit) <= MAX_PAGE_SIZE:
+            raise ValueError(f'limit must be an integer between 1 and {MAX_PAGE_SIZE}')
+        limit = int(limit)
+        if after is not None:
+            if not after.isdigit():
+                raise ValueError('after must be a non-negative integer id')
+            after = int(after)
+        if total not in ('true', 'false', '1', '0'):
+            raise ValueError('total must be true or false')
+
+        return cls(limit, after, total in ('true', '1'))
+
+    def apply(self, query, id_column):
+        """
+        Run a query (already filtered) for this page.
+        Returns (rows, meta): meta holds next_after (the cursor of the next page, or None on the
+        last page) and total (rows matching the filters) when requested.
+        """
+        meta = {}
+        if self.with_total:
+            count = select(func.count()).select_from(query.order_by(None).subquery())
+            meta['total'] = query.session.execute(count).scalar()
+
+        page = query.order_by(id_column)
+        if self.after is not None:
+            page = page.filter(id_column > self.after)
+
+        # One extra row tells whether another page follows, without counting
+        rows = page.limit(self.limit + 1).all()
+        has_more = len(rows) > self.limit
+        rows = rows[:self.limit]
+        meta['next_after'] = rows[-1].id if has_more else None
+        return rows, meta
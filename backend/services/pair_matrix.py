@@ -0,0 +1,110 @@
+from collections.abc import Set
+
+
+class PairMatrix:
+    """
+    Symmetric bit matrix of team pairs. Teams get a dense index on first use and each team's
+    row is one Python int used as a bitset over those indexes, so 2,000 teams that all played
+    each other take 2,000 ints of ~250 bytes (~0.5 MB) instead of millions of pair objects.
+    A pair added more than once is counted, so removing one copy keeps it in the matrix.
+    """
+
+    def __init__(self):
+        self.index = {}
+        self.team_ids = []
+        self.rows = []
+        self._copies = {}
+        self._pair_count = 0
+
+    def _slot(self, team_id):
+        slot = self.index.get(team_id)
+        if slot is None:
+            slot = self.index[team_id] = len(self.team_ids)
+            self.team_ids.append(team_id)
+            self.rows.append(0)
+        return slot
+
+    def add(self, team1_id, team2_id):
+        i, j = self._slot(team1_id), self._slot(team2_id)
+        if self.rows[i] >> j & 1:
+            pair = (min(team1_id, team2_id), max(team1_id, team2_id))
+            self._copies[pair] = self._copies.get(pair, 1) + 1
+            return
+        self.rows[i] |= 1 << j
+        self.rows[j] |= 1 << i
+        self._pair_count += 1
+
+    def remove(self, team1_id, team2_id):
+        if not self.has(team1_id, team2_id):
+            return
+        pair = (min(team1_id, team2_id), max(team1_id, team2_id))
+        copies = self._copies.pop(pair, 1)
+        if copies > 2:
+            self._copies[pair] = copies - 1
+        if copies > 1:
+            return
+        i, j = self.index[team1_id], self.index[team2_id]
+        self.rows[i] &= ~(1 << j)
+        self.rows[j] &= ~(1 << i)
+        self._pair_count -= 1
+
+    def has(self, team1_id, team2_id):
+        i, j = self.index.get(team1_id), self.index.get(team2_id)
+        return i is not None and j is not None and bool(self.rows[i] >> j & 1)
+
+    def mask(self, team_ids):
+        """Bitset of the given teams, for count_among"""
+        mask = 0
+        for team_id in team_ids:
+            slot = self.index.get(team_id)
+            if slot is not None:
+                mask |= 1 << slot
+        return mask
+
+    def count_among(self, team_id, mask):
+        """Number of teams in the mask paired with team_id"""
+        slot = self.index.get(team_id)
+        return 0 if slot is None else (self.rows[slot] & mask).bit_count()
+
+    def partners(self, team_id):
+        """Ids of the teams paired with team_id"""
+        slot = self.index.get(team_id)
+        row = 0 if slot is None else self.rows[slot]
+        while row:
+            low = row & -row
+            yield self.team_ids[low.bit_length() - 1]
+            row ^= low
+
+    def pairs(self):
+        """Every (team1_id, team2_id) pair once, team1_id < team2_id"""
+        for team_id in self.team_ids:
+            for partner in self.partners(team_id):
+                if team_id < partner:
+                    yield team_id, partner
+
+    def __len__(self):
+        return self._pair_count
+
+
+class PairSet(Set):
+    """Read-only view of a PairMatrix as a set of frozenset pairs"""
+
+    def __init__(self, matrix):
+        self.matrix = matrix
+
+    @classmethod
+    def _from_iterable(cls, pairs):
+        # Results of set operations are plain sets, not matrix views
+        return set(pairs)
+
+    def __contains__(self, pair):
+        if len(pair) != 2:
+            return False
+        team1_id, team2_id = pair
+        return self.matrix.has(team1_id, team2_id)
+
+    def __iter__(self):
+        return (frozenset(pair) for pair in self.matrix.pairs())
+
+    def __len__(self):
+        return len(self.matrix)
@@ -0,0 +1,151 @@
+from models.result import Result
+from concurrent.futures import ThreadPoolExecutor, wait
+from sqlalchemy import select
+import numpy as np
+import threading
+
+# Upper bound on runs x remaining games simulated per batch, to cap memory (~8 bytes per cell per array)
+BATCH_CELLS = 1_000_000
+
+
+def win_probabilities(wins, played, team1_index, team2_index):
+    """
+    Probability that team1 beats team2 in each remaining game, by the log5 formula on each
+    team's win rate. Win rates are smoothed as (wins + 1) / (played + 2) so teams without
+    games start at an even 0.5 and no team is certain to win or lose.
+    """
+    strength = (wins + 1) / (played + 2)
+    a, b = strength[team1_index], strength[team2_index]
+    return (a - a * b) / (a + b - 2 * a * b)
+
+
+def simulate_standings(team_ids, played, wins, scores, remaining, score_samples, runs, seed=None):
+    """
+    Play the remaining games `runs` times and count how often each team finishes in each rank.
+
+    Teams are ranked like RankingService: total score, then win rate, ties keeping team order.
+    Each simulated winner scores a value drawn from the historical result scores (0 if there
+    are none yet). All runs of a batch are simulated at once as (runs, games) arrays.
+    Returns a (teams, teams) array: row i holds team i's probability of finishing 1st, 2nd, ...
+    """
+    team_count = len(team_ids)
+    index = {team_id: i for i, team_id in enumerate(team_ids)}
+    played = np.asarray(played, dtype=np.int64)
+    wins = np.asarray(wins, dtype=np.int64)
+    scores = np.asarray(scores, dtype=np.int64)
+    score_samples = np.asarray(score_samples, dtype=np.int64)
+
+    team1_index = np.array([index[team1_id] for team1_id, _ in remaining], dtype=np.int64)
+    team2_index = np.array([index[team2_id] for _, team2_id in remaining], dtype=np.int64)
+    probability = win_probabilities(wins, played, team1_index, team2_index)
+
+    final_played = played + np.bincount(team1_index, minlength=team_count) + np.bincount(team2_index, minlength=team_count)
+    rng = np.random.default_rng(seed)
+    counts = np.zeros(team_count * team_count, dtype=np.int64)
+    batch = max(1, BATCH_CELLS // max(len(remaining), 1))
+
+    for start in range(0, runs, batch):
+        size = min(batch, runs - start)
+        team1_won = rng.random((size, len(remaining))) < probability
+        winners = np.where(team1_won, team1_index, team2_index)
+
+        # Flatten (run, team) to one index so a single bincount totals every run at once
+        cells = winners + np.arange(size)[:, None] * team_count
+        run_wins = np.bincount(cells.ravel(), minlength=size * team_count).reshape(size, team_count)
+        if len(score_samples):
+            points = score_samples[rng.integers(len(score_samples), size=winners.shape)]
+            run_scores = np.bincount(cells.ravel(), weights=points.ravel(), minlength=size * team_count)
+            run_scores = run_scores.reshape(size, team_count)
+        else:
+            run_scores = np.zeros((size, team_count))
+
+        total_scores = scores + run_scores
+        win_rates = np.round(np.divide(wins + run_wins, final_played, out=np.zeros((size, team_count)), where=final_played > 0), 3)
+        order = np.broadcast_to(np.arange(team_count), (size, team_count))
+        # lexsort sorts by the last key first: score, then win rate (both descending), then team order
+        finishing = np.lexsort((order, -win_rates, -total_scores), axis=-1)
+
+        ranks = np.empty_like(finishing)
+        np.put_along_axis(ranks, finishing, np.arange(team_count), axis=-1)
+        counts += np.bincount((np.arange(team_count) * team_count + ranks).ravel(), minlength=team_count * team_count)
+
+    return counts.reshape(team_count, team_count) / runs
+
+
+class ProjectionWorker:
+    """
+    Runs simulations on a single background thread and keeps the latest one.
+    A projection is identified by its inputs, so it stays cached until a result changes them.
+    """
+
+    def __init__(self):
+        self.key = None
+        self.future = None
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """The future of the projection with this key, if it is cached or running"""
+        with self._lock:
+            return self.future if self.key == key else None
+
+    def submit(self, key, *args, **kwargs):
+        """Return the future for the projection with this key, starting it unless it is cached or running"""
+        with self._lock:
+            if self.key != key:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='projection')
+                self.key = key
+                self.future = self._executor.submit(simulate_standings, *args, **kwargs)
+            return self.future
+
+
+class ProjectionService:
+    def __init__(self, db):
+        self.db = db
+
+    def get_projection(self, worker, runs, timeout=None, seed=None):
+        """
+        Return the projected final standings, or None if the simulation is still running after timeout seconds.
+        Teams are listed by expected rank, each with its probability of finishing in every rank.
+        """
+        from services.game_generator import GameGenerator
+        from services.ranking_service import RankingService
+
+        rankings = sorted(RankingService(self.db).get_rankings(), key=lambda ranking: ranking['team_id'])
+        remaining = GameGenerator(self.db).remaining_matchups()
+        team_ids = [ranking['team_id'] for ranking in rankings]
+        played = [ranking['games_played'] for ranking in rankings]
+        wins = [ranking['games_won'] for ranking in rankings]
+        scores = [ranking['total_score'] for ranking in rankings]
+
+        # The standings change with every result, so they identify the projection's inputs
+        key = (tuple(zip(team_ids, played, wins, scores)), len(remaining), runs, seed)
+        future = worker.get(key)
+        if future is None:
+            score_samples = self.db.session.execute(select(Result.score)).scalars().all()
+            future = worker.submit(key, team_ids, played, wins, scores, remaining, score_samples, runs, seed=seed)
+
+        done, _ = wait([future], timeout=timeout)
+        if not done:
+            return None
+
+        probabilities = future.result()
+        ranks = np.arange(1, len(team_ids) + 1)
+        projection = []
+        for ranking, row in zip(rankings, probabilities):
+            projection.append({
+                'team_id': ranking['team_id'],
+                'team_name': ranking['team_name'],
+                'current_rank': ranking['rank'],
+                'expected_rank': round(float(row @ ranks), 2),
+                'rank_probabilities': [round(float(p), 4) for p in row]
+            })
+        projection.sort(key=lambda team: (team['expected_rank'], team['current_rank']))
+
+        return {
+            'runs': runs,
+            'remaining_games': len(remaining),
+            'teams': projection
+        }
+
@@ -0,0 +1,262 @@
+from models.team import Team
+from models.result import Result
+from models.rank_snapshot import RankSnapshot
+from flask import current_app
+from bisect import bisect_left
+import numpy as np
+from sqlalchemy import delete, func, insert, select
+import threading
+
+
+def _fold(ranks, scores, team_ids, new_ranks, new_scores):
+    """Apply one snapshot's changes to {team_id: rank} and {team_id: score}"""
+    for team_id, rank, score in zip(team_ids, new_ranks, new_scores):
+        team_id = int(team_id)
+        if rank:
+            ranks[team_id] = rank
+            scores[team_id] = score
+        else:
+            ranks.pop(team_id, None)
+            scores.pop(team_id, None)
+
+
+def _changes(rankings, previous_ranks, previous_scores):
+    """(team_ids, ranks, scores) of the teams whose rank or score differs from the previous snapshot"""
+    team_ids, ranks, scores = [], [], []
+    for ranking in rankings:
+        team_id = ranking['team_id']
+        if (previous_ranks.get(team_id), previous_scores.get(team_id)) != (ranking['rank'], ranking['total_score']):
+            team_ids.append(team_id)
+            ranks.append(ranking['rank'])
+            scores.append(ranking['total_score'])
+
+    ranked = {ranking['team_id'] for ranking in rankings}
+    for team_id in sorted(set(previous_ranks) - ranked):
+        team_ids.append(team_id)
+        ranks.append(0)
+        scores.append(0)
+
+    return team_ids, ranks, scores
+
+
+class _RankOrder:
+    """
+    Teams sorted as RankingService._rank sorts them: total score, then win rate, descending, and
+    team id among equals. Placing a team only shifts the places between its old and new position,
+    so changes compares just the range of places moved since the last call, not the whole table.
+    Ranks and scores already reported are kept in arrays indexed by team id (0 while unranked).
+    """
+
+    def __init__(self, max_team_id):
+        self.keys = []
+        self.team_ids = []
+        self.team_scores = []
+        self.key_of = {}
+        self.low = self.high = None
+        self.ranks = np.zeros(max_team_id + 1, dtype=np.int64)
+        self.scores = np.zeros(max_team_id + 1, dtype=np.int64)
+
+    def place(self, team_id, games_played, wins, total_score):
+        """Add a team or move it to its place for these totals"""
+        win_rate = round(wins / games_played, 3) if games_played > 0 else 0
+        total_score = int(total_score)
+        key = (-total_score, -win_rate, team_id)
+        old_key = self.key_of.get(team_id)
+        if key == old_key:
+            return
+
+        positions = []
+        if old_key is not None:
+            position = bisect_left(self.keys, old_key)
+            del self.keys[position]
+            del self.team_ids[position]
+            del self.team_scores[position]
+            positions.append(position)
+        position = bisect_left(self.keys, key)
+        self.keys.insert(position, key)
+        self.team_ids.insert(position, team_id)
+        self.team_scores.insert(position, total_score)
+        positions.append(position)
+        self.key_of[team_id] = key
+
+        # A new team shifts every place below it
+        low, high = min(positions), max(positions) + 1 if old_key is not None else len(self.keys)
+        self.low = low if self.low is None else min(self.low, low)
+        self.high = high if self.high is None else max(self.high, high)
+
+    def changes(self):
+        """Like _changes, for the places moved since the last call"""
+        if self.low is None:
+            return [], [], []
+
+        team_ids = np.array(self.team_ids[self.low:self.high], dtype=np.int64)
+        ranks = np.arange(self.low + 1, self.high + 1, dtype=np.int64)
+        scores = np.array(self.team_scores[self.low:self.high], dtype=np.int64)
+        changed = (self.ranks[team_ids] != ranks) | (self.scores[team_ids] != scores)
+        team_ids, ranks, scores = team_ids[changed], ranks[changed], scores[changed]
+        self.ranks[team_ids] = ranks
+        self.scores[team_ids] = scores
+        self.low = self.high = None
+        return team_ids.tolist(), ranks.tolist(), scores.tolist()
+
+
+class RankHistory:
+    """
+    The ranks and scores after the latest snapshot, folded from the snapshot table.
+    New snapshots are folded in incrementally; a table that was cleared is folded again from scratch.
+    """
+
+    def __init__(self):
+        self.first_id = None
+        self.snapshot_id = 0
+        self.ranks = {}
+        self.scores = {}
+        self.lock = threading.Lock()
+
+    def latest(self, session):
+        """Return ({team_id: rank}, {team_id: score}) as of the last committed snapshot"""
+        first_id, last_id = session.execute(
+            select(func.min(RankSnapshot.id), func.max(RankSnapshot.id))
+        ).one()
+
+        with self.lock:
+            if first_id != self.first_id:
+                # Only a clear deletes snapshots, so a new first row means start over
+                self.first_id, self.snapshot_id, self.ranks, self.scores = first_id, 0, {}, {}
+            if last_id is not None and last_id > self.snapshot_id:
+                rows = session.execute(
+                    select(RankSnapshot.team_ids, RankSnapshot.ranks, RankSnapshot.scores)
+                    .where(RankSnapshot.id > self.snapshot_id, RankSnapshot.id <= last_id)
+                    .order_by(RankSnapshot.id)
+                )
+                for row in rows:
+                    _fold(self.ranks, self.scores, *row)
+                self.snapshot_id = last_id
+            return dict(self.ranks), dict(self.scores)
+
+
+class RankHistoryService:
+    def __init__(self, db):
+        self.db = db
+
+    def record(self, result):
+        """
+        Store the rank and score changes caused by a result, in the result's transaction.
+        Only teams whose position or score moved since the previous snapshot are written.
+        """
+        from services.ranking_service import RankingService
+
+        session = self.db.session
+        # Flushing applies the result to the standings table the rankings are read from
+        session.flush()
+        rankings = RankingService(self.db).get_rankings()
+        previous_ranks, previous_scores = current_app.extensions['rank_history'].latest(session)
+        team_ids, ranks, scores = _changes(rankings, previous_ranks, previous_scores)
+
+        snapshot = RankSnapshot(result_id=result.id, team_ids=team_ids, ranks=ranks, scores=scores)
+        session.add(snapshot)
+        return snapshot
+
+    def rebuild(self):
+        """
+        Replace every snapshot with the ones record would have written for the results now in the
+        tables, one per result in completion order, e.g. after an event replay recreated them.
+        Teams count from their creation on, as they did live. Without tie-breakers a result only
+        re-ranks the places its teams moved across (see _RankOrder). Does not commit.
+        """
+        from services.ranking_service import RankingService, ResultMatrix
+        from services.ranking_timeline import RankingTimeline
+
+        session = self.db.session
+        session.execute(delete(RankSnapshot))
+
+        ranking_service = RankingService(self.db)
+        tie_breakers = current_app.config.get('RANKING_TIE_BREAKERS', ())
+        teams = session.execute(
+            select(Team.id, Team.name, Team.player1, Team.player2, Team.created_at).order_by(Team.id)
+        ).all()
+        results = {game_id: (result_id, created_at) for result_id, game_id, created_at in session.execute(
+            select(Result.id, Result.game_id, Result.created_at)
+        )}
+        # Teams in the order they joined, those without a creation time from the start
+        pending = sorted(teams, key=lambda team: (team.created_at is not None, team.created_at or 0, team.id))
+
+        order = _RankOrder(max((team.id for team in teams), default=0))
+        totals, games, snapshots = {}, [], []
+        ranks, scores = {}, {}
+        for _, game_id, team1_id, team2_id, winning_team_id, score in RankingTimeline.completed_games(session):
+            step = (team1_id, team2_id, winning_team_id, score or 0)
+            RankingTimeline.apply(totals, step)
+            games.append(step)
+            for team_id in (team1_id, team2_id):
+                if team_id in order.key_of:
+                    order.place(team_id, *totals[team_id])
+            if game_id not in results:
+                continue
+
+            result_id, created_at = results[game_id]
+            while pending and (pending[0].created_at is None or created_at is None
+                               or pending[0].created_at <= created_at):
+                team_id = pending.pop(0).id
+                order.place(team_id, *totals.get(team_id, (0, 0, 0)))
+
+            if tie_breakers:
+                team_stats = [
+                    (team_id, name, player1, player2, *totals.get(team_id, (0, 0, 0)))
+                    for team_id, name, player1, player2, _ in teams if team_id in order.key_of
+                ]
+                rankings = ranking_service._rank(team_stats)
+                ranking_service._break_ties(rankings, ResultMatrix([row[0] for row in team_stats], games), tie_breakers)
+                changes = _changes(rankings, ranks, scores)
+                _fold(ranks, scores, *changes)
+                order.low = order.high = None
+            else:
+                changes = order.changes()
+
+            snapshots.append({
+                'result_id': result_id, 'team_ids': changes[0], 'ranks': changes[1], 'scores': changes[2],
+                'created_at': created_at
+            })
+
+        if snapshots:
+            session.execute(insert(RankSnapshot), snapshots)
+        return len(snapshots)
+
+    def get_history(self):
+        """
+        Return the rank and score of every team after each result as columns:
+        one series per team, aligned with result_ids and timestamps (null while unranked),
+        plus how many places each team moved with the latest result (positive means it climbed).
+        """
+        rows = self.db.session.execute(
+            select(RankSnapshot.result_id, RankSnapshot.created_at, RankSnapshot.team_ids,
+                   RankSnapshot.ranks, RankSnapshot.scores)
+            .order_by(RankSnapshot.id)
+        ).all()
+
+        ranks, scores = {}, {}
+        folded = []
+        for _, _, team_ids, new_ranks, new_scores in rows:
+            _fold(ranks, scores, team_ids, new_ranks, new_scores)
+            folded.append((dict(ranks), dict(scores)))
+
+        team_ids = sorted({team_id for step_ranks, _ in folded for team_id in step_ranks})
+        names = dict(self.db.session.execute(select(Team.id, Team.name).where(Team.id.in_(team_ids))).all())
+
+        rank_series = [[step_ranks.get(team_id) for step_ranks, _ in folded] for team_id in team_ids]
+        score_series = [[step_scores.get(team_id) for _, step_scores in folded] for team_id in team_ids]
+
+        movement = []
+        for series in rank_series:
+            before, after = (series[-2], series[-1]) if len(series) > 1 else (None, None)
+            movement.append(before - after if before is not None and after is not None else None)
+
+        return {
+            'team_ids': team_ids,
+            'team_names': [names.get(team_id) for team_id in team_ids],
+            'result_ids': [result_id for result_id, _, _, _, _ in rows],
+            'timestamps': [created_at.isoformat() for _, created_at, _, _, _ in rows],
+            'ranks': rank_series,
+            'scores': score_series,
+            'movement': movement
+        }
@@ -1,34 +1,223 @@
 from models.team import Team
 from models.game import Game
 from models.result import Result
-from sqlalchemy import func
+from models.standing import Standing
+from flask import current_app
+from itertools import groupby
+from sqlalchemy import func, select, union_all
+import numpy as np
+
+# Tie-breakers for teams level on (total_score, win_rate), applied in the order requested
+TIE_BREAKERS = ('head_to_head', 'buchholz', 'points_differential')
+
+
+def check_tie_breakers(names):
+    """Raise ValueError unless names are distinct tie-breakers from TIE_BREAKERS"""
+    if any(name not in TIE_BREAKERS for name in names) or len(set(names)) != len(names):
+        raise ValueError(f"tie_breakers must be distinct values from: {', '.join(TIE_BREAKERS)}")
+
+
+# Fields of a ranking row; tie_breakers only appears with tie-breakers set, the rating ones with a rating mode
+RANKING_FIELDS = (
+    'rank', 'team_id', 'team_name', 'players', 'total_score', 'games_played', 'games_won', 'games_lost',
+    'win_rate', 'tie_breakers', 'rating', 'rating_deviation', 'volatility'
+)
+
+
+class ResultMatrix:
+    """
+    Dense team x team tallies of completed games, rows and columns in team_ids order:
+    games played between two teams, wins of the row team over the column team, and
+    points the row team scored in those wins.
+    """
+
+    def __init__(self, team_ids, games):
+        """Build from (team1_id, team2_id, winning_team_id, score) rows of completed games"""
+        self.index = {team_id: i for i, team_id in enumerate(team_ids)}
+        size = len(team_ids)
+        self.played = np.zeros((size, size), dtype=np.int64)
+        self.wins = np.zeros((size, size), dtype=np.int64)
+        self.points = np.zeros((size, size), dtype=np.int64)
+
+        # Games of teams outside team_ids (not created yet at a point in time) are skipped
+        games = [
+            (self.index[team1_id], self.index[team2_id], winning_team_id == team2_id, winning_team_id is not None, score or 0)
+            for team1_id, team2_id, winning_team_id, score in games
+            if team1_id in self.index and team2_id in self.index
+        ]
+        if not games:
+            return
+
+        team1, team2, team2_won, decided, score = (np.array(column) for column in zip(*games))
+        np.add.at(self.played, (team1, team2), 1)
+        np.add.at(self.played, (team2, team1), 1)
+        winner = np.where(team2_won, team2, team1)[decided]
+        loser = np.where(team2_won, team1, team2)[decided]
+        np.add.at(self.wins, (winner, loser), 1)
+        np.add.at(self.points, (winner, loser), score[decided])
+
+    def head_to_head(self, team_ids):
+        """Wins of each of the given teams against the others in the group"""
+        members = [self.index[team_id] for team_id in team_ids]
+        return self.wins[np.ix_(members, members)].sum(axis=1).tolist()
+
+    def buchholz(self, total_scores):
+        """Sum of the current total scores of every opponent faced, once per game"""
+        return (self.played @ np.asarray(total_scores, dtype=np.int64)).tolist()
+
+    def points_differential(self):
+        """Points scored in wins minus points conceded in losses"""
+        return (self.points.sum(axis=1) - self.points.sum(axis=0)).tolist()
+
 
 class RankingService:
     def __init__(self, db):
         self.db = db
 
-    def get_rankings(self):
-        """Calculate and return team rankings"""
-        teams = Team.query.all()
-        rankings = []
+    def _aggregate_team_stats(self):
+        """
+        Fetch games played, wins and total score for every team in one grouped query.
+        Returns rows of (team_id, name, player1, player2, games_played, wins, total_score).
+        """
+        # Each completed game counts once for each of its two teams
+        appearances = union_all(
+            select(Game.team1_id.label('team_id')).where(Game.status == 'completed'),
+            select(Game.team2_id.label('team_id')).where(Game.status == 'completed'),
+        ).subquery()
+
+        played = select(
+            appearances.c.team_id,
+            func.count().label('games_played')
+        ).group_by(appearances.c.team_id).subquery()
+
+        won = select(
+            Result.winning_team_id.label('team_id'),
+            func.count(Result.id).label('wins'),
+            func.sum(Result.score).label('total_score')
+        ).join(Game, Game.id == Result.game_id).group_by(Result.winning_team_id).subquery()
+
+        return self.db.session.query(
+            Team.id,
+            Team.name,
+            Team.player1,
+            Team.player2,
+            func.coalesce(played.c.games_played, 0),
+            func.coalesce(won.c.wins, 0),
+            func.coalesce(won.c.total_score, 0)
+        ).outerjoin(
+            played, played.c.team_id == Team.id
+        ).outerjoin(
+            won, won.c.team_id == Team.id
+        ).order_by(Team.id).all()
+
+    def _stored_team_stats(self):
+        """
+        Read games played, wins and total score for every team from the standings table.
+        Returns rows shaped like _aggregate_team_stats.
+        """
+        return self.db.session.query(
+            Team.id,
+            Team.name,
+            Team.player1,
+            Team.player2,
+            func.coalesce(Standing.games_played, 0),
+            func.coalesce(Standing.games_won, 0),
+            func.coalesce(Standing.total_score, 0)
+        ).outerjoin(
+            Standing, Standing.team_id == Team.id
+        ).order_by(Team.id).all()
 
-        for team in teams:
-            # Count games played
-            games_played = Game.query.filter(
-                ((Game.team1_id == team.id) | (Game.team2_id == team.id)) &
-                (Game.status == 'completed')
-            ).count()
+    def _completed_games(self):
+        """(team1_id, team2_id, winning_team_id, score) for every completed game, in one query"""
+        return self.db.session.execute(
+            select(Game.team1_id, Game.team2_id, Result.winning_team_id, Result.score)
+            .outerjoin(Result, Result.game_id == Game.id)
+            .where(Game.status == 'completed')
+        ).all()
 
-            # Count wins
-            wins = Result.query.filter_by(winning_team_id=team.id).count()
+    def get_rankings(self, as_of=None, after_game=None, tie_breakers=None):
+        """
+        Return team rankings from the incrementally maintained standings table.
+        With as_of (a datetime) or after_game (a number of completed games, in completion order),
+        return the standings exactly as they were at that point instead.
+        tie_breakers (names from TIE_BREAKERS, default RANKING_TIE_BREAKERS) order teams level on
+        score and win rate; their values are returned under 'tie_breakers'.
+        """
+        if tie_breakers is None:
+            tie_breakers = current_app.config.get('RANKING_TIE_BREAKERS', ())
 
-            # Calculate total score
-            total_score = self.db.session.query(
-                func.sum(Result.score)
-            ).join(Game).filter(
-                Result.winning_team_id == team.id
-            ).scalar() or 0
+        if as_of is None and after_game is None:
+            team_stats = self._stored_team_stats()
+            games = self._completed_games() if tie_breakers else None
+        else:
+            team_stats, games = self._team_stats_at(as_of, after_game)
 
+        rankings = self._rank(team_stats)
+        if tie_breakers:
+            self._break_ties(rankings, ResultMatrix([row[0] for row in team_stats], games), tie_breakers)
+        return rankings
+
+    def get_ratings(self, mode):
+        """
+        Return team rankings ordered by a rating engine (see services.rating_engine.RATING_ENGINES),
+        with the usual game counts alongside each team's rating.
+        """
+        from services.rating_engine import get_rating_cache
+
+        cache = get_rating_cache(mode)
+        with cache.lock:
+            cache.sync(self.db.session)
+            ratings = cache.ratings
+            engine = cache.engine
+            initial = engine.initial()
+
+            rankings = []
+            for row in self._rank(self._stored_team_stats()):
+                rating = ratings.get(row['team_id'], initial)
+                row.update(engine.to_dict(rating))
+                rankings.append((engine.sort_key(rating), row))
+
+        rankings.sort(key=lambda entry: entry[0], reverse=True)
+        for i, (_, ranking) in enumerate(rankings):
+            ranking['rank'] = i + 1
+
+        return [ranking for _, ranking in rankings]
+
+    def _team_stats_at(self, as_of=None, after_game=None):
+        """
+        Rebuild per-team stats at a point in time from the cached ranking timeline.
+        Returns rows shaped like _aggregate_team_stats, and the games completed by then
+        shaped like _completed_games.
+        """
+        teams = self.db.session.query(Team.id, Team.name, Team.player1, Team.player2)
+        if as_of is not None:
+            # Teams created later did not exist yet
+            teams = teams.filter((Team.created_at <= as_of) | (Team.created_at.is_(None)))
+        teams = teams.order_by(Team.id).all()
+
+        timeline = current_app.extensions['ranking_timeline']
+        with timeline.lock:
+            timeline.sync(self.db.session)
+            game_count = len(timeline.steps)
+            if as_of is not None:
+                game_count = timeline.games_completed_by(as_of)
+            if after_game is not None:
+                if after_game > len(timeline.steps):
+                    raise ValueError(f'Only {len(timeline.steps)} games have been completed')
+                game_count = min(game_count, after_game)
+            totals = timeline.totals_after(game_count)
+            games = timeline.steps[:game_count]
+
+        return [
+            (team_id, name, player1, player2, *totals.get(team_id, (0, 0, 0)))
+            for team_id, name, player1, player2 in teams
+        ], games
+
+    def _rank(self, team_stats):
+        """Format (team_id, name, player1, player2, games_played, wins, total_score) rows as ranked standings"""
+        rankings = []
+
+        for team_id, name, player1, player2, games_played, wins, total_score in team_stats:
             # Calculate losses
             losses = games_played - wins
 
@@ -36,9 +225,9 @@ class RankingService:
             win_rate = wins / games_played if games_played > 0 else 0
 
             rankings.append({
-                'team_id': team.id,
-                'team_name': team.name,
-                'players': [team.player1, team.player2],
+                'team_id': team_id,
+                'team_name': name,
+                'players': [player1, player2],
                 'total_score': int(total_score),
                 'games_played': games_played,
                 'games_won': wins,
@@ -54,3 +243,38 @@ class RankingService:
             ranking['rank'] = i + 1
 
         return rankings
+
+    @staticmethod
+    def _break_ties(rankings, matrix, tie_breakers):
+        """
+        Reorder ranked teams level on (total_score, win_rate) by the given tie-breakers, in order,
+        and renumber ranks. Head-to-head counts wins within the whole level group.
+        """
+        scores = [0] * len(matrix.index)
+        for ranking in rankings:
+            scores[matrix.index[ranking['team_id']]] = ranking['total_score']
+
+        values = {}
+        if 'buchholz' in tie_breakers:
+            values['buchholz'] = matrix.buchholz(scores)
+        if 'points_differential' in tie_breakers:
+            values['points_differential'] = matrix.points_differential()
+
+        for ranking in rankings:
+            i = matrix.index[ranking['team_id']]
+            ranking['tie_breakers'] = {name: values[name][i] for name in tie_breakers if name in values}
+
+        ordered = []
+        for _, group in groupby(rankings, key=lambda x: (x['total_score'], x['win_rate'])):
+            group = list(group)
+            if 'head_to_head' in tie_breakers:
+                head_to_head = matrix.head_to_head([ranking['team_id'] for ranking in group])
+                for ranking, wins in zip(group, head_to_head):
+                    ranking['tie_breakers']['head_to_head'] = wins
+            group.sort(key=lambda x: tuple(x['tie_breakers'][name] for name in tie_breakers), reverse=True)
+            ordered.extend(group)
+
+        for i, ranking in enumerate(ordered):
+            ranking['rank'] = i + 1
+            ranking['tie_breakers'] = {name: ranking['tie_breakers'][name] for name in tie_breakers}
+        rankings[:] = ordered
@@ -0,0 +1,139 @@
+from models.game import Game
+from models.result import Result
+from models.tournament_event import TournamentEvent
+from bisect import bisect_right
+from datetime import datetime
+from sqlalchemy import func, select
+import threading
+
+# Steps between stored prefix aggregates; a rewind replays at most this many games
+CHECKPOINT_INTERVAL = 32
+
+
+class RankingTimeline:
+    """
+    Completed games in the order they finished, with per-team totals stored every
+    CHECKPOINT_INTERVAL games. Standings after any number of games start from the nearest
+    checkpoint instead of aggregating the whole history. When the tournament version moves,
+    games completed since are appended from the event log; only edits that rewrite history
+    (see extend) reload every game. Hold lock across sync and reads so a concurrent reload
+    cannot mix two versions.
+    """
+
+    def __init__(self):
+        self.version = None
+        self.event_id = 0
+        self.times = []
+        self.steps = []
+        self.checkpoints = [{}]
+        self.game_ids = set()
+        self.last_key = None
+        self.totals = {}
+        self.lock = threading.RLock()
+
+    @staticmethod
+    def completed_games(session, game_ids=None):
+        """Completed games (finished_at, game_id, team1_id, team2_id, winning_team_id, score) in completion order"""
+        finished_at = func.coalesce(Game.completed_at, Result.created_at, Game.created_at)
+        query = (
+            select(finished_at, Game.id, Game.team1_id, Game.team2_id, Result.winning_team_id, Result.score)
+            .outerjoin(Result, Result.game_id == Game.id)
+            .where(Game.status == 'completed')
+            .order_by(finished_at, Game.id)
+        )
+        if game_ids is not None:
+            query = query.where(Game.id.in_(game_ids))
+        return session.execute(query).all()
+
+    def _append(self, finished, game_id, team1_id, team2_id, winning_team_id, score):
+        step = (team1_id, team2_id, winning_team_id, score or 0)
+        self.apply(self.totals, step)
+        self.times.append(finished or datetime.min)
+        self.steps.append(step)
+        self.game_ids.add(game_id)
+        self.last_key = (finished or datetime.min, game_id)
+        if len(self.steps) % CHECKPOINT_INTERVAL == 0:
+            self.checkpoints.append({team_id: tuple(values) for team_id, values in self.totals.items()})
+
+    def load(self, session, version):
+        """Read every completed game with its result in one query, in completion order"""
+        # Read the log position first: events committed meanwhile are seen again by extend,
+        # which reloads when they touch a game that is already loaded
+        self.event_id = session.execute(select(func.max(TournamentEvent.id))).scalar() or 0
+        self.times, self.steps, self.checkpoints = [], [], [{}]
+        self.game_ids, self.last_key, self.totals = set(), None, {}
+
+        for row in self.completed_games(session):
+            self._append(*row)
+        self.version = version
+
+    def extend(self, session, version):
+        """
+        Append the games completed since the last sync, found through the event log.
+        Returns False, changing nothing, when the new events rewrite history instead: a clear,
+        a result edited or deleted, any event on a game already in the timeline, a game that
+        finished before the last one, or a version bump with no events (e.g. an event replay).
+        Team events are ignored, they never change which games completed or who won.
+        """
+        events = session.execute(
+            select(TournamentEvent.id, TournamentEvent.type, TournamentEvent.entity,
+                   TournamentEvent.entity_id, TournamentEvent.data)
+            .where(TournamentEvent.id > self.event_id)
+            .order_by(TournamentEvent.id)
+        ).all()
+        if not events:
+            return False
+
+        candidates = set()
+        for _, event_type, entity, entity_id, data in events:
+            if entity == 'team':
+                continue
+            if entity is None or (entity == 'result' and event_type != 'result_created'):
+                return False
+            game_id = data.get('game_id') if entity == 'result' else entity_id
+            if game_id in self.game_ids:
+                return False
+            candidates.add(game_id)
+
+        rows = self.completed_games(session, candidates) if candidates else []
+        if rows and self.last_key is not None and (rows[0][0] or datetime.min, rows[0][1]) < self.last_key:
+            return False
+
+        for row in rows:
+            self._append(*row)
+        self.event_id = events[-1][0]
+        self.version = version
+        return True
+
+    def sync(self, session):
+        from services.tournament_version import current_version
+
+        version = current_version(session)
+        with self.lock:
+            if self.version != version:
+                if self.version is None or not self.extend(session, version):
+                    self.load(session, version)
+        return self
+
+    @staticmethod
+    def apply(totals, step):
+        """Add one completed game to {team_id: [games_played, games_won, total_score]}"""
+        team1_id, team2_id, winning_team_id, score = step
+        for team_id in (team1_id, team2_id):
+            totals.setdefault(team_id, [0, 0, 0])[0] += 1
+        if winning_team_id is not None:
+            totals.setdefault(winning_team_id, [0, 0, 0])
+            totals[winning_team_id][1] += 1
+            totals[winning_team_id][2] += score
+
+    def games_completed_by(self, as_of):
+        """Number of games completed at or before the given time"""
+        return bisect_right(self.times, as_of)
+
+    def totals_after(self, game_count):
+        """{team_id: (games_played, games_won, total_score)} after the first game_count completed games"""
+        checkpoint = game_count // CHECKPOINT_INTERVAL
+        totals = {team_id: list(values) for team_id, values in self.checkpoints[checkpoint].items()}
+        for step in self.steps[checkpoint * CHECKPOINT_INTERVAL:game_count]:
+            self.apply(totals, step)
+        return totals
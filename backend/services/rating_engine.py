@@ -0,0 +1,428 @@
+from models.game import Game
+from models.result import Result
+from models.tournament_event import TournamentEvent
+from flask import current_app
+from sqlalchemy import func, select
+from abc import ABC, abstractmethod
+from datetime import datetime
+from operator import itemgetter
+import numpy as np
+import math
+import threading
+
+# Results between stored rating checkpoints; a change in history replays at most this many extra results
+CHECKPOINT_INTERVAL = 256
+
+THREE_OVER_PI_SQUARED = 3 / math.pi ** 2
+
+# Below this many games numpy's per-call overhead outweighs rating a wave of games at once
+VECTORIZE_MIN_GAMES = 32
+
+
+class RatingEngine(ABC):
+    """
+    A rating system updated one result at a time, in chronological order.
+    Ratings are immutable values so checkpoints can share them without copying.
+    """
+    name = None
+
+    @abstractmethod
+    def initial(self):
+        """Rating of a team that has not played"""
+
+    @abstractmethod
+    def update(self, winner, loser):
+        """Return the new (winner, loser) ratings after one game"""
+
+    @abstractmethod
+    def to_dict(self, rating):
+        """Response fields for a rating"""
+
+    @abstractmethod
+    def sort_key(self, rating):
+        """Value teams are ranked by, highest first"""
+
+    def replay(self, ratings, games, checkpoint_every=None):
+        """
+        Apply (winner_id, loser_id) games in order to {team_id: rating}, in place. With checkpoint_every,
+        return a copy of the ratings after every game whose 1-based position is a multiple of it.
+        """
+        initial = self.initial()
+        update = self.update
+        step = checkpoint_every or len(games) or 1
+        checkpoints = []
+        for start in range(0, len(games), step):
+            for winner, loser in games[start:start + step]:
+                ratings[winner], ratings[loser] = update(ratings.get(winner, initial), ratings.get(loser, initial))
+            if checkpoint_every and start + step <= len(games):
+                checkpoints.append(dict(ratings))
+        return checkpoints
+
+
+class EloEngine(RatingEngine):
+    name = 'elo'
+
+    def __init__(self, k_factor=32, initial_rating=1500):
+        self.k_factor = k_factor
+        self.initial_rating = initial_rating
+
+    def initial(self):
+        return float(self.initial_rating)
+
+    def update(self, winner, loser):
+        expected = 1 / (1 + 10 ** ((loser - winner) / 400))
+        change = self.k_factor * (1 - expected)
+        return winner + change, loser - change
+
+    def to_dict(self, rating):
+        return {'rating': round(rating, 1)}
+
+    def sort_key(self, rating):
+        return rating
+
+
+class Glicko2Engine(RatingEngine):
+    """
+    Glicko-2 with every game treated as its own rating period, so ratings move as each result lands.
+    Ratings are (mu, phi, sigma) on the Glicko-2 scale.
+    """
+    name = 'glicko2'
+    SCALE = 173.7178
+
+    def __init__(self, tau=0.5, initial_rating=1500, initial_deviation=350, initial_volatility=0.06, tolerance=1e-6):
+        self.tau = tau
+        self.initial_rating = initial_rating
+        self.initial_deviation = initial_deviation
+        self.initial_volatility = initial_volatility
+        self.tolerance = tolerance
+
+    def initial(self):
+        return (0.0, self.initial_deviation / self.SCALE, self.initial_volatility)
+
+    def update(self, winner, loser):
+        return self._rate(winner, loser, 1.0), self._rate(loser, winner, 0.0)
+
+    def _rate(self, player, opponent, score):
+        mu, phi, sigma = player
+        opponent_mu, opponent_phi, _ = opponent
+
+        g = 1 / math.sqrt(1 + THREE_OVER_PI_SQUARED * opponent_phi * opponent_phi)
+        expected = 1 / (1 + math.exp(-g * (mu - opponent_mu)))
+        variance = 1 / (g * g * expected * (1 - expected))
+        delta = variance * g * (score - expected)
+
+        sigma = self._volatility(phi, sigma, delta, variance)
+        phi = 1 / math.sqrt(1 / (phi * phi + sigma * sigma) + 1 / variance)
+        mu = mu + phi * phi * g * (score - expected)
+        return (mu, phi, sigma)
+
+    def _volatility(self, phi, sigma, delta, variance):
+        """New volatility by the Illinois iteration from Glickman's Glicko-2 paper"""
+        exp, tau, tolerance = math.exp, self.tau, self.tolerance
+        a = math.log(sigma * sigma)
+        inverse_tau_squared = 1 / (tau * tau)
+        spread = phi * phi + variance
+        delta_squared = delta * delta
+
+        def f(x):
+            exp_x = exp(x)
+            denominator = spread + exp_x
+            return exp_x * (delta_squared - spread - exp_x) / (2 * denominator * denominator) - (x - a) * inverse_tau_squared
+
+        upper = a
+        if delta_squared > spread:
+            lower = math.log(delta_squared - spread)
+        else:
+            k = 1
+            while f(a - k * tau) < 0:
+                k += 1
+            lower = a - k * tau
+
+        f_upper, f_lower = f(upper), f(lower)
+        while abs(lower - upper) > tolerance:
+            candidate = upper + (upper - lower) * f_upper / (f_lower - f_upper)
+            f_candidate = f(candidate)
+            if f_candidate * f_lower <= 0:
+                upper, f_upper = lower, f_lower
+            else:
+                f_upper /= 2
+            lower, f_lower = candidate, f_candidate
+
+        return exp(upper / 2)
+
+    def replay(self, ratings, games, checkpoint_every=None):
+        """
+        Apply games in waves: a game joins the wave after the last one either team played in,
+        so the games of a wave share no team and are rated together with numpy, in the same
+        order of updates as one game at a time. Short runs (a single new result) stay scalar.
+        Game i writes the winner's new rating to slot 2i and the loser's to 2i + 1, so the
+        ratings at a checkpoint are the latest slot of each team by then.
+        """
+        if len(games) < VECTORIZE_MIN_GAMES:
+            return super().replay(ratings, games, checkpoint_every)
+
+        count = len(games)
+        team_ids, teams = np.unique(np.array(games, dtype=np.int64), return_inverse=True)
+        teams = teams.reshape(count, 2)
+        winners, losers = teams[:, 0], teams[:, 1]
+
+        initial = self.initial()
+        mu, phi, sigma = np.array([ratings.get(team_id, initial) for team_id in team_ids.tolist()]).T.copy()
+        slots = np.empty((3, 2 * count))
+        for wave in self._waves(teams):
+            players = np.concatenate((winners[wave], losers[wave]))
+            opponents = np.concatenate((losers[wave], winners[wave]))
+            rated = self._rate_many(mu[players], phi[players], sigma[players], mu[opponents], phi[opponents],
+                                    np.repeat((1.0, 0.0), len(wave)))
+            mu[players], phi[players], sigma[players] = rated
+            slots[:, np.concatenate((2 * wave, 2 * wave + 1))] = rated
+
+        # Ratings after each checkpoint's games, then after all of them
+        ends = list(range(checkpoint_every, count + 1, checkpoint_every)) if checkpoint_every else []
+        last_slot = np.full(len(team_ids), -1)
+        states, start = [], 0
+        for end in ends + [count]:
+            positions = np.arange(start, end)
+            np.maximum.at(last_slot, winners[start:end], 2 * positions)
+            np.maximum.at(last_slot, losers[start:end], 2 * positions + 1)
+            played = np.flatnonzero(last_slot >= 0)
+            state = dict(ratings)
+            state.update(zip(team_ids[played].tolist(), map(tuple, slots[:, last_slot[played]].T.tolist())))
+            states.append(state)
+            start = end
+
+        ratings.update(states.pop())
+        return states
+
+    @staticmethod
+    def _waves(teams):
+        """
+        Yield arrays of game positions, wave by wave, for (winner, loser) team index pairs:
+        a topological sort by levels over the links from each game to its teams' next games.
+        """
+        count = len(teams)
+        games = np.tile(np.arange(count), 2)
+        sides = teams.T.ravel()
+        order = np.lexsort((games, sides))
+        following = np.full(2 * count, -1)
+        same_team = sides[order[1:]] == sides[order[:-1]]
+        following[order[:-1][same_team]] = games[order[1:][same_team]]
+        following = following.reshape(2, count)
+
+        waiting = np.bincount(following[following >= 0], minlength=count)
+        wave = np.flatnonzero(waiting == 0)
+        while wave.size:
+            yield wave
+            successors = following[:, wave].ravel()
+            successors = successors[successors >= 0]
+            np.subtract.at(waiting, successors, 1)
+            wave = np.unique(successors[waiting[successors] == 0])
+
+    def _rate_many(self, mu, phi, sigma, opponent_mu, opponent_phi, score):
+        """_rate over arrays of players, each against its own opponent"""
+        g = 1 / np.sqrt(1 + THREE_OVER_PI_SQUARED * opponent_phi * opponent_phi)
+        expected = 1 / (1 + np.exp(-g * (mu - opponent_mu)))
+        variance = 1 / (g * g * expected * (1 - expected))
+        delta = variance * g * (score - expected)
+
+        sigma = self._volatility_many(phi, sigma, delta, variance)
+        phi = 1 / np.sqrt(1 / (phi * phi + sigma * sigma) + 1 / variance)
+        mu = mu + phi * phi * g * (score - expected)
+        return mu, phi, sigma
+
+    def _volatility_many(self, phi, sigma, delta, variance):
+        """_volatility over arrays; elements that have converged keep their value while the rest iterate"""
+        tau, tolerance = self.tau, self.tolerance
+        a = np.log(sigma * sigma)
+        inverse_tau_squared = 1 / (tau * tau)
+        spread = phi * phi + variance
+        delta_squared = delta * delta
+
+        def f(x):
+            exp_x = np.exp(x)
+            denominator = spread + exp_x
+            return exp_x * (delta_squared - spread - exp_x) / (2 * denominator * denominator) - (x - a) * inverse_tau_squared
+
+        large = delta_squared > spread
+        k = np.ones_like(a)
+        below = ~large & (f(a - tau) < 0)
+        while below.any():
+            k += below
+            below &= f(a - k * tau) < 0
+        upper = a
+        with np.errstate(divide="ignore"):
+            lower = np.where(large, np.log(np.abs(delta_squared - spread)), a - k * tau)
+
+        f_upper, f_lower = f(upper), f(lower)
+        active = np.abs(lower - upper) > tolerance
+        with np.errstate(divide='ignore', invalid='ignore'):
+            while active.any():
+                candidate = upper + (upper - lower) * f_upper / (f_lower - f_upper)
+                f_candidate = f(candidate)
+                crossed = active & (f_candidate * f_lower <= 0)
+                upper = np.where(crossed, lower, upper)
+                f_upper = np.where(crossed, f_lower, np.where(active, f_upper / 2, f_upper))
+                lower = np.where(active, candidate, lower)
+                f_lower = np.where(active, f_candidate, f_lower)
+                active &= np.abs(lower - upper) > tolerance
+
+        return np.exp(upper / 2)
+
+    def to_dict(self, rating):
+        mu, phi, sigma = rating
+        return {
+            'rating': round(self.initial_rating + self.SCALE * mu, 1),
+            'rating_deviation': round(self.SCALE * phi, 1),
+            'volatility': round(sigma, 5)
+        }
+
+    def sort_key(self, rating):
+        return rating[0]
+
+
+RATING_ENGINES = {engine.name: engine for engine in (EloEngine, Glicko2Engine)}
+
+
+class RatingCache:
+    """
+    Per-team ratings from one engine, computed in a single chronological pass over results.
+    Ratings are checkpointed every CHECKPOINT_INTERVAL results. When the tournament version moves,
+    results submitted since are found through the event log and applied on their own, so a newly
+    submitted result costs a single update. Edits that rewrite history (see extend) reload the
+    results and replay from the last checkpoint before the first changed one.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.version = None
+        self.event_id = 0
+        self.history = []
+        self.game_ids = set()
+        self.last_key = None
+        self.checkpoints = [{}]
+        self.ratings = {}
+        self.replayed = 0
+        self.lock = threading.RLock()
+
+    @staticmethod
+    def _results(session, result_ids=None):
+        """(result_id, game_id, winner_id, loser_id) rows in the order results were submitted"""
+        query = (
+            select(Result.id, Result.game_id, Result.winning_team_id,
+                   Game.team1_id + Game.team2_id - Result.winning_team_id)
+            .join(Game, Game.id == Result.game_id)
+            .order_by(Result.created_at, Result.id)
+        )
+        if result_ids is not None:
+            query = query.where(Result.id.in_(result_ids))
+        return session.execute(query).all()
+
+    @staticmethod
+    def _keys(session, result_ids=None):
+        """(created_at, result_id) of the given results, or of the last one, in submission order"""
+        query = select(Result.created_at, Result.id)
+        if result_ids is None:
+            query = query.order_by(Result.created_at.desc(), Result.id.desc()).limit(1)
+        else:
+            query = query.where(Result.id.in_(result_ids)).order_by(Result.created_at, Result.id)
+        return [(created_at or datetime.min, result_id) for created_at, result_id in session.execute(query)]
+
+    def sync(self, session):
+        from services.tournament_version import current_version
+
+        version = current_version(session)
+        with self.lock:
+            if self.version != version:
+                if self.version is None or not self.extend(session, version):
+                    self.load(session, version)
+        return self
+
+    def extend(self, session, version):
+        """
+        Apply the results submitted since the last sync, found through the event log.
+        Returns False, changing nothing, when the new events rewrite history instead: a clear,
+        a result edited or deleted, a change to a game that has a result, a result dated before
+        the last one, or a version bump with no events (e.g. an event replay).
+        """
+        events = session.execute(
+            select(TournamentEvent.id, TournamentEvent.type, TournamentEvent.entity, TournamentEvent.entity_id)
+            .where(TournamentEvent.id > self.event_id)
+            .order_by(TournamentEvent.id)
+        ).all()
+        if not events:
+            return False
+
+        result_ids = []
+        for _, event_type, entity, entity_id in events:
+            if entity == 'team':
+                continue
+            if entity is None or (entity == 'result' and event_type != 'result_created'):
+                return False
+            if entity == 'game' and entity_id in self.game_ids:
+                return False
+            if entity == 'result':
+                result_ids.append(entity_id)
+
+        keys = self._keys(session, result_ids) if result_ids else []
+        if keys and self.last_key is not None and keys[0] < self.last_key:
+            return False
+
+        results = self._results(session, result_ids) if result_ids else []
+        start = len(self.history)
+        self.history += results
+        self.game_ids.update(map(itemgetter(1), results))
+        if keys:
+            self.last_key = keys[-1]
+        self._replay(self.ratings, start)
+        self.event_id = events[-1][0]
+        self.version = version
+        return True
+
+    def load(self, session, version):
+        """Read the results in order and replay them from the last checkpoint before the first change"""
+        # Read the log position first, as RankingTimeline.load does
+        self.event_id = session.execute(select(func.max(TournamentEvent.id))).scalar() or 0
+        history = self._results(session)
+
+        unchanged = 0
+        for cached, current in zip(self.history, history):
+            if cached != current:
+                break
+            unchanged += 1
+
+        checkpoint = unchanged // CHECKPOINT_INTERVAL
+        del self.checkpoints[checkpoint + 1:]
+        ratings = dict(self.checkpoints[checkpoint])
+        start = checkpoint * CHECKPOINT_INTERVAL
+
+        # A new result can only extend the cached ratings when nothing before it changed
+        if unchanged == len(self.history):
+            ratings = self.ratings
+            start = unchanged
+
+        self.history = history
+        self.game_ids = set(map(itemgetter(1), history))
+        self.last_key = next(iter(self._keys(session)), None)
+        self._replay(ratings, start)
+        self.version = version
+
+    def _replay(self, ratings, start):
+        """Apply history[start:] to ratings, appending a checkpoint at every CHECKPOINT_INTERVAL results"""
+        # Up to the next checkpoint boundary, then the whole rest in one run for vectorized engines
+        boundary = min(-(-start // CHECKPOINT_INTERVAL) * CHECKPOINT_INTERVAL, len(self.history))
+        games = list(map(itemgetter(2, 3), self.history[start:]))
+        self.engine.replay(ratings, games[:boundary - start])
+        if boundary > start and boundary % CHECKPOINT_INTERVAL == 0:
+            self.checkpoints.append(dict(ratings))
+        self.checkpoints += self.engine.replay(ratings, games[boundary - start:], CHECKPOINT_INTERVAL)
+
+        self.replayed = len(self.history) - start
+        self.ratings = ratings
+
+
+def get_rating_cache(mode):
+    """Return this process's rating cache for an engine name"""
+    caches = current_app.extensions['rating_caches']
+    if mode not in caches:
+        caches.setdefault(mode, RatingCache(RATING_ENGINES[mode]()))
+    return caches[mode]
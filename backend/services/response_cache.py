@@ -0,0 +1,81 @@
+from flask import current_app, g, request, make_response
+from functools import wraps
+import threading
+import zlib
+
+
+class ResponseCache:
+    """
+    Serialized JSON bodies of read endpoints, valid for a single tournament version.
+    Entries from older versions are dropped as soon as a newer version is stored.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.version = None
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, version):
+        with self._lock:
+            if version != self.version:
+                return None
+            return self._entries.get(key)
+
+    def put(self, key, version, body):
+        with self._lock:
+            if self.version is not None and version < self.version:
+                return
+            if version != self.version:
+                self.version = version
+                self._entries.clear()
+            if len(self._entries) >= self.max_entries:
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = body
+
+    def clear(self):
+        with self._lock:
+            self.version = None
+            self._entries.clear()
+
+
+def version_etag(key, version):
+    """Strong ETag for a URL at a tournament version: same version and URL, same body"""
+    return f'v{version}-{zlib.crc32(key.encode()):08x}'
+
+
+def cached_response(view):
+    """
+    Serve a GET view from the response cache until the tournament version changes.
+    Responses carry a version-derived ETag and a matching If-None-Match gets a 304.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        from database import db
+        from services.tournament_version import current_version
+
+        cache = current_app.extensions['response_cache']
+        version = g.tournament_version = current_version(db.session)
+        key = request.full_path
+        etag = version_etag(key, version)
+
+        if request.if_none_match.contains(etag):
+            response = current_app.response_class(status=304)
+            response.set_etag(etag)
+            return response
+
+        body = cache.get(key, version)
+        if body is not None:
+            response = current_app.response_class(body, status=200, mimetype='application/json')
+            response.headers['X-Cache'] = 'HIT'
+            response.set_etag(etag)
+            return response
+
+        response = make_response(view(*args, **kwargs))
+        if response.status_code == 200:
+            cache.put(key, version, response.get_data())
+            response.set_etag(etag)
+        response.headers['X-Cache'] = 'MISS'
+        return response
+
+    return wrapper
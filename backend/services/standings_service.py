@@ -0,0 +1,185 @@
+from models.team import Team
+from models.game import Game
+from models.result import Result
+from models.standing import Standing
+from collections import defaultdict
+from datetime import datetime
+from sqlalchemy import event, inspect, select, insert, update, delete
+from sqlalchemy.orm import Session
+
+STANDING_FIELDS = ('games_played', 'games_won', 'total_score')
+
+
+def _previous_value(session, obj, attr):
+    """Return the value an attribute had before the pending change"""
+    history = inspect(obj).attrs[attr].history
+    if history.deleted:
+        return history.deleted[0]
+    if not history.has_changes():
+        return getattr(obj, attr)
+
+    # The old value was expired before being overwritten, read it from the database
+    column = getattr(type(obj), attr)
+    return session.connection().execute(
+        select(column).where(type(obj).id == obj.id)
+    ).scalar()
+
+
+def _collect_deltas(session):
+    """Translate pending Game and Result changes into per-team standing deltas"""
+    deltas = defaultdict(lambda: defaultdict(int))
+
+    def game_completed(team1_id, team2_id, sign):
+        deltas[team1_id]['games_played'] += sign
+        deltas[team2_id]['games_played'] += sign
+
+    def result_recorded(winning_team_id, score, sign):
+        deltas[winning_team_id]['games_won'] += sign
+        deltas[winning_team_id]['total_score'] += sign * (score or 0)
+
+    for obj in session.new:
+        if isinstance(obj, Game) and obj.status == 'completed':
+            game_completed(obj.team1_id, obj.team2_id, 1)
+        elif isinstance(obj, Result):
+            result_recorded(obj.winning_team_id, obj.score, 1)
+
+    for obj in session.dirty:
+        if isinstance(obj, Game) and session.is_modified(obj):
+            was_completed = _previous_value(session, obj, 'status') == 'completed'
+            if was_completed:
+                game_completed(
+                    _previous_value(session, obj, 'team1_id'),
+                    _previous_value(session, obj, 'team2_id'),
+                    -1
+                )
+            if obj.status == 'completed':
+                game_completed(obj.team1_id, obj.team2_id, 1)
+        elif isinstance(obj, Result) and session.is_modified(obj):
+            result_recorded(
+                _previous_value(session, obj, 'winning_team_id'),
+                _previous_value(session, obj, 'score'),
+                -1
+            )
+            result_recorded(obj.winning_team_id, obj.score, 1)
+
+    for obj in session.deleted:
+        if isinstance(obj, Game) and _previous_value(session, obj, 'status') == 'completed':
+            game_completed(obj.team1_id, obj.team2_id, -1)
+        elif isinstance(obj, Result):
+            result_recorded(obj.winning_team_id, obj.score, -1)
+
+    return deltas
+
+
+def track_standing_changes(session, flush_context, instances):
+    """
+    Keep the standings table in step with pending Game and Result changes.
+    Runs before every flush so the update shares the transaction of the change itself.
+    """
+    deltas = _collect_deltas(session)
+    deleted_team_ids = [obj.id for obj in session.deleted if isinstance(obj, Team)]
+
+    if not deltas and not deleted_team_ids:
+        return
+
+    connection = session.connection()
+    now = datetime.utcnow()
+
+    for team_id, delta in deltas.items():
+        changes = {field: delta[field] for field in STANDING_FIELDS if delta[field]}
+        if not changes:
+            continue
+
+        # Relative UPDATE so concurrent writers never lose an increment
+        updated = connection.execute(
+            update(Standing)
+            .where(Standing.team_id == team_id)
+            .values(updated_at=now, **{
+                field: getattr(Standing, field) + amount
+                for field, amount in changes.items()
+            })
+        )
+        if updated.rowcount == 0:
+            connection.execute(insert(Standing).values(
+                team_id=team_id,
+                updated_at=now,
+                **{field: changes.get(field, 0) for field in STANDING_FIELDS}
+            ))
+
+    if deleted_team_ids:
+        connection.execute(delete(Standing).where(Standing.team_id.in_(deleted_team_ids)))
+
+
+def register_standings_listener():
+    """Attach the standings tracker to every SQLAlchemy session (idempotent)"""
+    if not event.contains(Session, 'before_flush', track_standing_changes):
+        event.listen(Session, 'before_flush', track_standing_changes)
+
+
+class StandingsService:
+    def __init__(self, db):
+        self.db = db
+
+    def find_drift(self):
+        """
+        Compare the stored standings with a full recomputation from games and results.
+        Returns (drift, expected) where drift lists every team whose stored row is wrong.
+        """
+        from services.ranking_service import RankingService
+
+        expected = {
+            team_id: dict(zip(STANDING_FIELDS, (games_played, wins, int(total_score))))
+            for team_id, _, _, _, games_played, wins, total_score
+            in RankingService(self.db)._aggregate_team_stats()
+        }
+        stored = {
+            standing.team_id: {field: getattr(standing, field) for field in STANDING_FIELDS}
+            for standing in Standing.query.all()
+        }
+
+        empty = dict.fromkeys(STANDING_FIELDS, 0)
+        drift = []
+        for team_id in sorted(set(expected) | set(stored)):
+            stored_values = stored.get(team_id, empty)
+            expected_values = expected.get(team_id, empty)
+            if stored_values != expected_values or team_id not in expected:
+                drift.append({
+                    'team_id': team_id,
+                    'stored': stored_values,
+                    'expected': expected_values if team_id in expected else None
+                })
+
+        return drift, expected
+
+    def rebuild(self, dry_run=False):
+        """Recompute the standings table from results and games, returning the drift found"""
+        drift, expected = self.find_drift()
+
+        if not dry_run:
+            self._store(expected)
+
+        return drift
+
+    def rebuild_if_drifted(self):
+        """
+        Rebuild the standings only when they disagree with games and results, e.g. on a database
+        that had results before the standings table existed. Returns the drift found.
+        """
+        drift, expected = self.find_drift()
+
+        if drift:
+            self._store(expected)
+
+        return drift
+
+    def _store(self, expected):
+        from services.tournament_version import bump_version
+
+        Standing.query.delete()
+        bump_version(self.db.session)
+        now = datetime.utcnow()
+        self.db.session.add_all([
+            Standing(team_id=team_id, updated_at=now, **values)
+            for team_id, values in expected.items()
+        ])
+        self.db.session.commit()
@@ -0,0 +1,83 @@
+from models.team import Team
+from models.game import Game
+from models.result import Result
+from models.tournament_event import TournamentEvent
+from services.event_log import CLEAR_EVENT, LOGGED_MODELS
+from sqlalchemy import select, func
+
+
+# Entities clients can sync, by the name stored in the event log
+SYNCED_MODELS = LOGGED_MODELS
+
+
+class SyncService:
+    def __init__(self, db):
+        self.db = db
+
+    def changes_since(self, since):
+        """
+        Return the teams, games and results changed after version `since`, plus tombstones.
+        Work depends on the number of changes, not on the size of the tournament.
+        reset is set for a full snapshot (since=0, or the database was cleared or replaced since):
+        drop everything held locally, then apply.
+        Clients pass the returned version as `since` on their next call.
+        """
+        from services.tournament_version import current_version
+
+        session = self.db.session
+        version = current_version(session)
+        queries = {
+            'team': Team.query,
+            'game': Game.query_with_teams(),
+            'result': Result.query_with_team(),
+        }
+
+        # A first sync, or a version from the future (the database was replaced), gets everything
+        if since == 0 or since > version:
+            return self._payload(version, True, {
+                entity: query.order_by(SYNCED_MODELS[entity].id).all() for entity, query in queries.items()
+            }, {})
+
+        # Versions commit in order under the tournament lock, so nothing at or below it can still appear
+        window = (TournamentEvent.version > since, TournamentEvent.version <= version)
+        cleared_at = session.execute(
+            select(func.max(TournamentEvent.version)).where(TournamentEvent.type == CLEAR_EVENT, *window)
+        ).scalar()
+        if cleared_at is not None:
+            window = (TournamentEvent.version >= cleared_at, TournamentEvent.version <= version)
+
+        # Only the latest event per row matters: it either still exists or was deleted
+        latest = {}
+        for entity, entity_id, event_type in session.execute(
+            select(TournamentEvent.entity, TournamentEvent.entity_id, TournamentEvent.type)
+            .where(TournamentEvent.entity.is_not(None), *window)
+            .order_by(TournamentEvent.id)
+        ):
+            latest[entity, entity_id] = event_type.endswith('_deleted')
+
+        upserted = {name: [] for name in SYNCED_MODELS}
+        deleted = {name: set() for name in SYNCED_MODELS}
+        for (entity, entity_id), was_deleted in latest.items():
+            if was_deleted:
+                deleted[entity].add(entity_id)
+            else:
+                upserted[entity].append(entity_id)
+
+        rows = {}
+        for entity, model in SYNCED_MODELS.items():
+            rows[entity] = []
+            if upserted[entity]:
+                rows[entity] = queries[entity].filter(model.id.in_(upserted[entity])).order_by(model.id).all()
+            # Changed, then deleted by a writer that committed after `version` was read
+            deleted[entity].update(set(upserted[entity]) - {row.id for row in rows[entity]})
+
+        return self._payload(version, cleared_at is not None, rows, deleted)
+
+    @staticmethod
+    def _payload(version, reset, rows, deleted):
+        return {
+            'version': version,
+            'reset': reset,
+            **{f'{entity}s': [row.to_dict() for row in rows[entity]] for entity in SYNCED_MODELS},
+            'deleted': {f'{entity}s': sorted(deleted.get(entity, ())) for entity in SYNCED_MODELS}
+        }
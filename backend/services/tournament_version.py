@@ -0,0 +1,142 @@
+from models.team import Team
+from models.game import Game
+from models.result import Result
+from models.standing import Standing
+from models.tournament_state import TournamentState
+from sqlalchemy import event, select, insert, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+import time
+
+STATE_ID = 1
+VERSION_SPAN_KEY = 'tournament_version_span'
+
+# Writes to these models change what the read endpoints return
+VERSIONED_MODELS = (Team, Game, Result, Standing)
+
+
+def current_version(session):
+    """Return the tournament version visible to this session (0 before the first write)"""
+    return session.connection().execute(
+        select(TournamentState.version).where(TournamentState.id == STATE_ID)
+    ).scalar() or 0
+
+
+def pending_version_span(session):
+    """
+    Return (version_before, version_after) for the bumps made in the session's open
+    transaction, or None if it has not bumped the version yet.
+    """
+    return session.info.get(VERSION_SPAN_KEY)
+
+
+def bump_version(session):
+    """
+    Increment the tournament version inside the session's current transaction.
+    Returns the new version and records the span covered by this transaction.
+    """
+    connection = session.connection()
+    statement = (
+        update(TournamentState)
+        .where(TournamentState.id == STATE_ID)
+        .values(version=TournamentState.version + 1)
+    )
+
+    if connection.dialect.update_returning:
+        new_version = connection.execute(statement.returning(TournamentState.version)).scalar()
+    else:
+        new_version = None
+        if connection.execute(statement).rowcount:
+            new_version = connection.execute(
+                select(TournamentState.version).where(TournamentState.id == STATE_ID)
+            ).scalar()
+
+    if new_version is None:
+        new_version = 1
+        connection.execute(insert(TournamentState).values(id=STATE_ID, version=new_version))
+
+    before, _ = session.info.get(VERSION_SPAN_KEY, (new_version - 1, None))
+    session.info[VERSION_SPAN_KEY] = (before, new_version)
+    return new_version
+
+
+def _forget_version_span(session, transaction):
+    # Savepoints end inside the outer transaction, which still owns the span
+    if transaction.parent is None:
+        session.info.pop(VERSION_SPAN_KEY, None)
+
+
+def bump_on_change(session, flush_context, instances):
+    """Bump the version once per transaction that flushes a change to a versioned model"""
+    if pending_version_span(session) is not None:
+        return
+    pending = (session.new, session.dirty, session.deleted)
+    if any(isinstance(obj, VERSIONED_MODELS) for objects in pending for obj in objects):
+        bump_version(session)
+
+
+class WriteConflict(Exception):
+    """A write was refused after taking the tournament lock, e.g. a team is already playing"""
+
+
+def lock_tournament(session):
+    """
+    Serialize the session's transaction against every other writer, in any worker.
+    The version row is updated first, so a concurrent writer blocks on it (row lock on
+    server databases, write lock on SQLite) until this transaction ends. Everything read
+    afterwards is current until commit. Returns the version committed before this one.
+    """
+    span = pending_version_span(session)
+    if span is None:
+        bump_version(session)
+        span = pending_version_span(session)
+    return span[0]
+
+
+# Driver error codes of a lock that may be free on the next attempt: PostgreSQL serialization
+# failure, deadlock and lock not available; MySQL lock wait timeout and deadlock
+RETRYABLE_PGCODES = ('40001', '40P01', '55P03')
+RETRYABLE_MYSQL_CODES = (1205, 1213)
+
+
+def is_lock_busy(error):
+    """Whether an OperationalError only means another writer holds the lock (worth retrying)"""
+    original = error.orig
+    message = str(original).lower()
+    if 'database is locked' in message or 'database is busy' in message or 'database table is locked' in message:
+        return True
+    if getattr(original, 'pgcode', None) in RETRYABLE_PGCODES:
+        return True
+    args = getattr(original, 'args', ())
+    return bool(args) and args[0] in RETRYABLE_MYSQL_CODES
+
+
+def serialized_write(session, work, retries=5, backoff=0.05):
+    """
+    Run work(version_before) in a transaction holding the tournament lock and commit it.
+    work must not commit. Busy locks ("database is locked", serialization failures) are
+    retried with a growing delay; any other error, and a WriteConflict raised by work,
+    rolls back and propagates at once.
+    """
+    for attempt in range(retries):
+        try:
+            result = work(lock_tournament(session))
+            session.commit()
+            return result
+        except OperationalError as e:
+            session.rollback()
+            if not is_lock_busy(e) or attempt == retries - 1:
+                raise
+            time.sleep(backoff * (attempt + 1))
+        except Exception:
+            session.rollback()
+            raise
+
+
+def register_version_listener():
+    """Attach the version bump to every SQLAlchemy session (idempotent)"""
+    if not event.contains(Session, 'before_flush', bump_on_change):
+        event.listen(Session, 'before_flush', bump_on_change)
+    # The span only describes the open transaction; after_commit listeners still see it
+    if not event.contains(Session, 'after_transaction_end', _forget_version_span):
+        event.listen(Session, 'after_transaction_end', _forget_version_span)
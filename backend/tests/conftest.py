@@ -1,19 +1,37 @@
 """Pytest configuration and fixtures for backend tests"""
+import os
 import pytest
+from sqlalchemy import event
 from app import create_app
+from config import Config, engine_options
 from database import db as _db
 from models.team import Team
 from models.game import Game
 from models.result import Result
 
 
+class TestConfig(Config):
+    """Run against TEST_DATABASE_URL (any SQLAlchemy backend) or a SQLite file in instance/"""
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = os.environ.get('TEST_DATABASE_URL') or 'sqlite:///test.db'
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip timing tests unless RUN_TIMING_TESTS is set"""
+    if os.environ.get('RUN_TIMING_TESTS'):
+        return
+    skip = pytest.mark.skip(reason='timing test, set RUN_TIMING_TESTS=1 to run')
+    for item in items:
+        if 'timing' in item.keywords:
+            item.add_marker(skip)
+
+
 @pytest.fixture(scope='function')
 def app():
     """Create a Flask application configured for testing"""
-    app = create_app()
-    app.config['TESTING'] = True
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
-    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app = create_app(TestConfig)
 
     with app.app_context():
         _db.create_all()
@@ -34,6 +52,53 @@ def client(app):
     return app.test_client()
 
 
+@pytest.fixture(scope='function')
+def query_counter(db):
+    """Record every SQL statement executed while the fixture is active"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    yield statements
+    event.remove(db.engine, 'before_cursor_execute', record)
+
+
+@pytest.fixture(scope='function')
+def make_tournament(db):
+    """
+    Build a tournament of team_count teams where every team has played its next neighbour.
+    The lower team id always wins. Returns (teams, games).
+    """
+    def build(team_count, status='completed'):
+        teams = [
+            Team(name=f'Team {i + 1}', player1=f'Player {2 * i}', player2=f'Player {2 * i + 1}')
+            for i in range(team_count)
+        ]
+        db.session.add_all(teams)
+        db.session.commit()
+
+        games = [
+            Game(team1_id=teams[i].id, team2_id=teams[i + 1].id, status=status)
+            for i in range(team_count - 1)
+        ]
+        db.session.add_all(games)
+        db.session.commit()
+
+        if status == 'completed':
+            db.session.add_all([
+                Result(game_id=game.id, winning_team_id=game.team1_id, score=i % 7)
+                for i, game in enumerate(games)
+            ])
+            db.session.commit()
+
+        db.session.expire_all()
+        return teams, games
+
+    return build
+
+
 @pytest.fixture(scope='function')
 def sample_teams(db):
     """Create sample teams for testing"""
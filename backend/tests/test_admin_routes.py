@@ -102,3 +102,36 @@ class TestAdminRoutes:
         assert response2.status_code == 200
         data = json.loads(response2.data)
         assert data['deleted']['teams'] == 0
+
+    def test_clear_database_clears_standings(self, client, db, completed_game_with_result):
+        """Test that clearing the database also empties the standings table"""
+        from models.standing import Standing
+        assert Standing.query.count() == 2
+
+        response = client.post('/api/admin/clear-database')
+
+        assert response.status_code == 200
+        assert Standing.query.count() == 0
+
+    def test_rebuild_standings(self, client, db, completed_game_with_result, sample_teams):
+        """Test rebuilding standings through the admin endpoint"""
+        from models.standing import Standing
+        Standing.query.delete()
+        db.session.commit()
+
+        response = client.post('/api/admin/rebuild-standings')
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['rebuilt'] is True
+        assert len(data['drift']) == 2
+        assert db.session.get(Standing, sample_teams[0].id).total_score == 10
+
+    def test_rebuild_standings_dry_run(self, client, db, completed_game_with_result):
+        """Test that a dry run reports drift without rebuilding"""
+        response = client.post('/api/admin/rebuild-standings', json={'dry_run': True})
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['rebuilt'] is False
+        assert data['drift'] == []
@@ -0,0 +1,140 @@
+"""Multi-threaded stress tests: concurrent game creation must never double-book a team"""
+import pytest
+import sqlite3
+import threading
+from collections import Counter
+from sqlalchemy.exc import OperationalError
+from models.game import Game
+from services.tournament_version import is_lock_busy, serialized_write
+
+
+def run_concurrently(app, requests_per_thread, thread_count=8):
+    """Fire POST requests from several threads released at the same moment"""
+    barrier = threading.Barrier(thread_count)
+    statuses = []
+    errors = []
+
+    def worker(index):
+        client = app.test_client()
+        try:
+            barrier.wait()
+            for url, body in requests_per_thread(index):
+                response = client.post(url, json=body)
+                statuses.append(response.status_code)
+        except Exception as e:  # pragma: no cover - reported by the assertion below
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(thread_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    return statuses
+
+
+def assert_no_team_double_booked(db):
+    db.session.rollback()
+    in_progress = Game.query.filter_by(status='in_progress').all()
+    bookings = Counter()
+    for game in in_progress:
+        bookings[game.team1_id] += 1
+        bookings[game.team2_id] += 1
+    assert bookings and max(bookings.values()) == 1
+    return in_progress
+
+
+class TestConcurrentGeneration:
+    """Stress tests for the tournament lock around game creation"""
+
+    def test_concurrent_generate_never_double_books(self, app, db, make_tournament):
+        """Test that simultaneous /games/generate calls hand out disjoint teams"""
+        make_tournament(20, status='scheduled')
+        db.session.remove()
+
+        statuses = run_concurrently(app, lambda i: [('/api/games/generate', None)] * 3)
+
+        in_progress = assert_no_team_double_booked(db)
+        # 20 teams fill exactly 10 tables; every other request must be refused cleanly
+        assert len(in_progress) == 10
+        assert statuses.count(201) == 10
+        assert set(statuses) <= {201, 400}
+
+    def test_concurrent_rounds_and_single_games(self, app, db, make_tournament):
+        """Test that round generation and single generation interleave safely"""
+        make_tournament(16, status='scheduled')
+        db.session.remove()
+
+        def requests(index):
+            if index % 2:
+                return [('/api/games/generate-round', {'tables': 2})] * 2
+            return [('/api/games/generate', None)] * 2
+
+        statuses = run_concurrently(app, requests)
+
+        in_progress = assert_no_team_double_booked(db)
+        assert len(in_progress) == 8
+        assert set(statuses) <= {201, 400}
+
+    def test_concurrent_manual_creation_is_serialized(self, app, db, make_tournament):
+        """Test that manually created games sharing teams, started at once, never double-book a team"""
+        teams, _ = make_tournament(6, status='scheduled')
+        team_ids = [team.id for team in teams]
+        db.session.remove()
+
+        # Manual games are scheduled, so the same matchups may be created many times over
+        statuses = run_concurrently(app, lambda i: [
+            ('/api/games', {'team1_id': team_ids[0], 'team2_id': team_ids[5]}),
+            ('/api/games', {'team1_id': team_ids[0], 'team2_id': team_ids[i % 4 + 1]}),
+        ])
+        assert statuses == [201] * 16
+
+        game_ids = [game.id for game in Game.query.filter_by(status='scheduled').order_by(Game.id)]
+        db.session.remove()
+        statuses = run_concurrently(app, lambda i: [(f'/api/games/{game_id}/start', None) for game_id in game_ids[i::8]])
+
+        in_progress = assert_no_team_double_booked(db)
+        assert statuses.count(200) == len(in_progress)
+        assert set(statuses) <= {200, 400}
+
+
+class TestSerializedWriteRetries:
+    """Test suite for which database errors serialized_write retries"""
+
+    @staticmethod
+    def failing_work(message, calls):
+        def work(version):
+            calls.append(version)
+            raise OperationalError('UPDATE tournament_state', {}, sqlite3.OperationalError(message))
+        return work
+
+    def test_busy_lock_is_retried(self, db):
+        """Test that a locked database is retried until the attempts run out"""
+        calls = []
+
+        with pytest.raises(OperationalError):
+            serialized_write(db.session, self.failing_work('database is locked', calls), retries=3, backoff=0)
+
+        assert len(calls) == 3
+
+    def test_other_errors_are_not_retried(self, db):
+        """Test that schema or I/O errors are raised on the first attempt, without sleeping"""
+        calls = []
+
+        with pytest.raises(OperationalError):
+            serialized_write(db.session, self.failing_work('no such table: games', calls), retries=3, backoff=10)
+
+        assert len(calls) == 1
+
+    def test_lock_codes(self):
+        """Test the driver error codes recognised as a busy lock"""
+        class DriverError(Exception):
+            pgcode = None
+
+        serialization_failure = DriverError('could not serialize access')
+        serialization_failure.pgcode = '40001'
+        assert is_lock_busy(OperationalError('', {}, serialization_failure))
+        assert is_lock_busy(OperationalError('', {}, DriverError(1205, 'Lock wait timeout exceeded')))
+        assert not is_lock_busy(OperationalError('', {}, DriverError(1045, 'Access denied')))
+        assert not is_lock_busy(OperationalError('', {}, sqlite3.OperationalError('disk I/O error')))
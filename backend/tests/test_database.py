@@ -0,0 +1,196 @@
+"""Tests for the SQLite engine profiles"""
+import pytest
+import threading
+import time
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from config import SQLITE_PROFILES, sqlite_pragmas, engine_options
+from database import apply_sqlite_pragmas
+
+
+class TestSqliteProfiles:
+    """Test suite for PRAGMA profile selection and application"""
+
+    def test_default_profile_is_production(self, monkeypatch):
+        """Test that the production profile is used when nothing is configured"""
+        monkeypatch.delenv('SQLITE_PROFILE', raising=False)
+        assert sqlite_pragmas() == SQLITE_PROFILES['production']
+
+    def test_profile_selected_by_environment(self, monkeypatch):
+        """Test selecting SQLite's defaults through SQLITE_PROFILE"""
+        monkeypatch.setenv('SQLITE_PROFILE', 'default')
+        assert sqlite_pragmas() == {}
+
+    def test_single_pragma_override(self, monkeypatch):
+        """Test that SQLITE_<PRAGMA> overrides one value of the profile"""
+        monkeypatch.setenv('SQLITE_BUSY_TIMEOUT', '10000')
+        pragmas = sqlite_pragmas('production')
+        assert pragmas['busy_timeout'] == '10000'
+        assert pragmas['journal_mode'] == 'WAL'
+
+    def test_unknown_profile_rejected(self):
+        """Test that a typo in SQLITE_PROFILE fails loudly"""
+        with pytest.raises(ValueError):
+            sqlite_pragmas('fast')
+
+    def test_pragmas_applied_to_app_connections(self, app, db):
+        """Test that every connection of the app engine runs the configured PRAGMAs"""
+        if db.engine.dialect.name != 'sqlite':
+            pytest.skip('PRAGMAs only apply to SQLite')
+
+        pragmas = app.config['SQLITE_PRAGMAS']
+        with db.engine.connect() as connection:
+            if 'busy_timeout' in pragmas:
+                assert connection.execute(text('PRAGMA busy_timeout')).scalar() == int(pragmas['busy_timeout'])
+            if 'temp_store' in pragmas:
+                # 2 = MEMORY
+                assert connection.execute(text('PRAGMA temp_store')).scalar() == 2
+            if 'journal_mode' in pragmas and db.engine.url.database not in (None, '', ':memory:'):
+                assert connection.execute(text('PRAGMA journal_mode')).scalar() == 'wal'
+
+
+class TestEngineOptions:
+    """Test suite for environment-driven database URI and connection pool settings"""
+
+    def test_pool_defaults_for_server_databases(self, monkeypatch):
+        """Test the multi-worker pool sizing used when nothing is configured"""
+        for name in ('DB_POOL_SIZE', 'DB_MAX_OVERFLOW', 'DB_POOL_RECYCLE', 'DB_POOL_PRE_PING'):
+            monkeypatch.delenv(name, raising=False)
+
+        options = engine_options('postgresql://poul:secret@db/tournament')
+
+        assert options['pool_size'] == 10
+        assert options['max_overflow'] == 10
+        assert options['pool_recycle'] == 1800
+        assert options['pool_pre_ping'] is True
+
+    def test_pool_settings_from_environment(self, monkeypatch):
+        """Test that every pool setting can be overridden"""
+        monkeypatch.setenv('DB_POOL_SIZE', '3')
+        monkeypatch.setenv('DB_MAX_OVERFLOW', '0')
+        monkeypatch.setenv('DB_POOL_RECYCLE', '60')
+        monkeypatch.setenv('DB_POOL_PRE_PING', 'false')
+
+        options = engine_options('postgresql://poul:secret@db/tournament')
+
+        assert options['pool_size'] == 3
+        assert options['max_overflow'] == 0
+        assert options['pool_recycle'] == 60
+        assert options['pool_pre_ping'] is False
+
+    def test_in_memory_sqlite_has_no_pool_sizing(self):
+        """Test that the single shared in-memory connection is not given pool sizes"""
+        options = engine_options('sqlite:///:memory:')
+        assert 'pool_size' not in options
+        assert 'max_overflow' not in options
+
+    def test_database_url_from_environment(self, monkeypatch):
+        """Test that DATABASE_URL selects the backend"""
+        import importlib
+        import config
+
+        monkeypatch.setenv('DATABASE_URL', 'sqlite:///from-env.db')
+        try:
+            reloaded = importlib.reload(config)
+            assert reloaded.Config.SQLALCHEMY_DATABASE_URI == 'sqlite:///from-env.db'
+            assert reloaded.Config.SQLALCHEMY_ENGINE_OPTIONS['pool_size'] == 10
+        finally:
+            monkeypatch.delenv('DATABASE_URL')
+            importlib.reload(config)
+
+    def test_app_engine_uses_configured_pool(self, app, db):
+        """Test that Flask-SQLAlchemy builds the engine from SQLALCHEMY_ENGINE_OPTIONS"""
+        options = app.config['SQLALCHEMY_ENGINE_OPTIONS']
+        if 'pool_size' not in options:
+            pytest.skip('the configured test database does not use a sized pool')
+
+        assert db.engine.pool.size() == options['pool_size']
+        assert db.engine.pool._max_overflow == options['max_overflow']
+        assert db.engine.pool._pre_ping == options['pool_pre_ping']
+
+    def test_pool_caps_concurrent_connections(self, monkeypatch, tmp_path):
+        """Test against a local stand-in database that the pool bounds concurrent checkouts"""
+        from sqlalchemy.exc import TimeoutError as PoolTimeout
+
+        monkeypatch.setenv('DB_POOL_SIZE', '2')
+        monkeypatch.setenv('DB_MAX_OVERFLOW', '1')
+        monkeypatch.setenv('DB_POOL_TIMEOUT', '1')
+        uri = f'sqlite:///{tmp_path / "stand-in.db"}'
+        engine = create_engine(uri, **engine_options(uri))
+
+        held = [engine.connect() for _ in range(3)]
+        try:
+            for connection in held:
+                assert connection.execute(text('SELECT 1')).scalar() == 1
+            with pytest.raises(PoolTimeout):
+                engine.connect()
+        finally:
+            for connection in held:
+                connection.close()
+            engine.dispose()
+
+
+class TestSqliteConcurrencyBenchmark:
+    """Benchmark: read/write throughput under concurrent result entry and polling"""
+
+    DURATION = 0.5
+    READERS = 3
+
+    def _run(self, path, pragmas):
+        engine = create_engine(f'sqlite:///{path}', connect_args={'timeout': 0.1})
+        apply_sqlite_pragmas(engine, pragmas)
+        with engine.begin() as connection:
+            connection.execute(text('CREATE TABLE results (id INTEGER PRIMARY KEY, score INTEGER)'))
+
+        counts = {'writes': 0, 'reads': 0, 'locked': 0}
+        lock = threading.Lock()
+        deadline = time.perf_counter() + self.DURATION
+
+        def count(key):
+            with lock:
+                counts[key] += 1
+
+        def writer():
+            while time.perf_counter() < deadline:
+                try:
+                    with engine.begin() as connection:
+                        connection.execute(text('INSERT INTO results (score) VALUES (1)'))
+                    count('writes')
+                except OperationalError:
+                    count('locked')
+
+        def reader():
+            while time.perf_counter() < deadline:
+                try:
+                    with engine.connect() as connection:
+                        connection.execute(text('SELECT COUNT(*), SUM(score) FROM results')).all()
+                    count('reads')
+                except OperationalError:
+                    count('locked')
+
+        threads = [threading.Thread(target=writer)] + [
+            threading.Thread(target=reader) for _ in range(self.READERS)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        engine.dispose()
+        return counts
+
+    def test_benchmark_profiles(self, tmp_path):
+        """Test that the production profile sustains concurrent reads and writes without lock errors"""
+        before = self._run(tmp_path / 'default.db', sqlite_pragmas('default'))
+        after = self._run(tmp_path / 'production.db', {**sqlite_pragmas('production'), 'busy_timeout': 100})
+
+        print(
+            f"\ndefault:    {before['writes'] / self.DURATION:.0f} writes/s, "
+            f"{before['reads'] / self.DURATION:.0f} reads/s, {before['locked']} lock errors"
+            f"\nproduction: {after['writes'] / self.DURATION:.0f} writes/s, "
+            f"{after['reads'] / self.DURATION:.0f} reads/s, {after['locked']} lock errors"
+        )
+
+        assert after['locked'] == 0
+        assert after['writes'] > 0
+        assert after['reads'] > 0
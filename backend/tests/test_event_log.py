@@ -0,0 +1,246 @@
+"""Tests for the append-only event log and its replay"""
+import pytest
+import json
+import time
+from datetime import datetime
+from sqlalchemy import func, insert, select
+from models.team import Team
+from models.game import Game
+from models.result import Result
+from models.standing import Standing
+from models.rank_snapshot import RankSnapshot
+from models.tournament_event import TournamentEvent
+from services.event_log import EventReplayer
+from services.tournament_version import current_version
+
+
+def logged(db):
+    db.session.expire_all()
+    return [(event.type, event.entity_id) for event in TournamentEvent.query.order_by(TournamentEvent.id)]
+
+
+def snapshot(db):
+    """Every row of the rebuilt tables, in a comparable form"""
+    db.session.expire_all()
+    return {
+        'teams': [team.to_dict() for team in Team.query.order_by(Team.id)],
+        'games': [game.to_dict() for game in Game.query.order_by(Game.id)],
+        'results': [result.to_dict() for result in Result.query.order_by(Result.id)],
+        'standings': [
+            (standing.team_id, standing.games_played, standing.games_won, standing.total_score)
+            for standing in Standing.query.order_by(Standing.team_id)
+        ]
+    }
+
+
+def play_tournament(client):
+    """Drive a small tournament through the API, touching every kind of write"""
+    client.post('/api/teams', json={'players': [f'P{i}' for i in range(10)]})
+    doomed = client.post('/api/teams/manual', json={'player1': 'X', 'player2': 'Y'}).get_json()
+    client.delete(f"/api/teams/{doomed['id']}")
+
+    games = client.post('/api/games/generate-round', json={'tables': 'max'}).get_json()['games']
+    for i, game in enumerate(games):
+        client.post('/api/results', json={'game_id': game['id'], 'winning_team_id': game['team1']['id'], 'score': i + 3})
+
+    # A scheduled game whose teams are changed, then started
+    team_ids = [game['team1']['id'] for game in games] + [game['team2']['id'] for game in games]
+    scheduled = client.post('/api/games', json={'team1_id': team_ids[0], 'team2_id': team_ids[1]}).get_json()
+    client.put(f"/api/games/{scheduled['id']}", json={'team2_id': team_ids[3]})
+    client.post(f"/api/games/{scheduled['id']}/start")
+
+
+class TestEventLog:
+    """Test suite for events written alongside every mutation"""
+
+    def test_team_creation_logged(self, client, db):
+        """Test that a created team is logged with all its columns"""
+        team = client.post('/api/teams/manual', json={'player1': 'A', 'player2': 'B'}).get_json()
+
+        event = TournamentEvent.query.one()
+        assert (event.type, event.entity, event.entity_id) == ('team_created', 'team', team['id'])
+        assert event.data == team
+        assert event.version == current_version(db.session)
+
+    def test_game_lifecycle_logged(self, client, db, sample_game):
+        """Test that starting and completing a game log only the changed columns"""
+        client.post(f'/api/games/{sample_game.id}/start')
+        client.post('/api/results', json={'game_id': sample_game.id, 'winning_team_id': sample_game.team1_id, 'score': 3})
+
+        events = TournamentEvent.query.filter(TournamentEvent.entity != 'team').order_by(TournamentEvent.id).all()
+        assert [event.type for event in events] == ['game_created', 'game_started', 'result_created', 'game_completed']
+        assert set(events[1].data) == {'id', 'status', 'started_at'}
+        assert events[3].data['status'] == 'completed'
+
+    def test_deletions_logged(self, client, db, sample_teams, sample_game):
+        """Test that deleting a game or team logs a tombstone event"""
+        client.delete(f'/api/games/{sample_game.id}')
+        client.delete(f'/api/teams/{sample_teams[3].id}')
+
+        assert logged(db)[-2:] == [('game_deleted', sample_game.id), ('team_deleted', sample_teams[3].id)]
+
+    def test_rolled_back_writes_not_logged(self, db):
+        """Test that the log shares the transaction of the change"""
+        db.session.add(Team(name='Team 1', player1='A', player2='B'))
+        db.session.flush()
+        db.session.rollback()
+
+        assert TournamentEvent.query.count() == 0
+
+    def test_unmodified_rows_not_logged(self, db, sample_teams):
+        """Test that assigning an unchanged value writes nothing"""
+        before = TournamentEvent.query.count()
+        team = Team.query.first()
+        team.name = team.name
+        db.session.commit()
+
+        assert TournamentEvent.query.count() == before
+
+    def test_clear_is_appended(self, client, db, sample_teams):
+        """Test that clearing keeps the history and appends a clear event"""
+        client.post('/api/admin/clear-database')
+
+        assert [event_type for event_type, _ in logged(db)] == ['team_created'] * 4 + ['database_cleared']
+
+
+class TestEventReplay:
+    """Test suite for rebuilding the tournament from the log"""
+
+    def test_rebuild_restores_every_table(self, client, db):
+        """Test that replaying the log reproduces teams, games, results and standings exactly"""
+        play_tournament(client)
+        expected = snapshot(db)
+
+        db.session.execute(Result.__table__.delete())
+        db.session.execute(Game.__table__.delete())
+        db.session.execute(Standing.__table__.delete())
+        db.session.execute(Team.__table__.delete())
+        db.session.commit()
+
+        replayed = EventReplayer(db).rebuild()
+
+        assert snapshot(db) == expected
+        assert replayed['teams'] == len(expected['teams'])
+        assert replayed['results'] == len(expected['results'])
+
+    def test_rebuild_is_not_logged_again(self, client, db):
+        """Test that replay does not append to the log it reads"""
+        play_tournament(client)
+        before = TournamentEvent.query.count()
+
+        EventReplayer(db).rebuild()
+
+        assert TournamentEvent.query.count() == before
+
+    def test_rebuild_refreshes_caches(self, client, db):
+        """Test that reads after a rebuild see the replayed data"""
+        play_tournament(client)
+        rankings = client.get('/api/rankings').get_json()
+        db.session.execute(Standing.__table__.delete())
+        db.session.commit()
+
+        EventReplayer(db).rebuild()
+
+        assert client.get('/api/rankings').get_json() == rankings
+        assert client.post('/api/games/generate').status_code in (201, 400)
+
+    def test_rebuild_restores_rank_history(self, client, db):
+        """Test that rank snapshots are cleared and rebuilt for the replayed results"""
+        play_tournament(client)
+        history = client.get('/api/rankings/history').get_json()
+        db.session.execute(RankSnapshot.__table__.delete())
+        db.session.add(RankSnapshot(result_id=999, team_ids=[1], ranks=[1], scores=[0]))
+        db.session.commit()
+
+        EventReplayer(db).rebuild()
+
+        rebuilt = client.get('/api/rankings/history').get_json()
+        # Snapshots are dated by their result, the original rows were a moment later
+        created = {result.id: result.created_at.isoformat() for result in Result.query}
+        assert rebuilt.pop('timestamps') == [created[result_id] for result_id in rebuilt['result_ids']]
+        history.pop('timestamps')
+        assert rebuilt == history
+        assert RankSnapshot.query.count() == Result.query.count()
+
+    def test_new_rows_after_rebuild(self, client, db):
+        """Test that ids keep counting from the replayed rows (sequences on server databases)"""
+        play_tournament(client)
+        EventReplayer(db).rebuild()
+        last_team_id = db.session.execute(select(func.max(Team.id))).scalar()
+
+        response = client.post('/api/teams/manual', json={'player1': 'New', 'player2': 'Pair'})
+
+        assert response.status_code == 201
+        assert response.get_json()['id'] > last_team_id
+
+    def test_replay_starts_after_last_clear(self, client, db, sample_teams):
+        """Test that history before a clear is skipped"""
+        client.post('/api/admin/clear-database')
+        client.post('/api/teams/manual', json={'player1': 'A', 'player2': 'B'})
+
+        state, applied = EventReplayer(db).fold()
+
+        assert applied == 1
+        assert [team['player1'] for team in state['team'].values()] == ['A']
+
+    def test_fold_until_point_in_time(self, client, db, sample_game):
+        """Test that folding up to an event id gives the tournament as it was then"""
+        client.post(f'/api/games/{sample_game.id}/start')
+        started = TournamentEvent.query.filter_by(type='game_started').one().id
+        client.post('/api/results', json={'game_id': sample_game.id, 'winning_team_id': sample_game.team1_id, 'score': 3})
+
+        state, _ = EventReplayer(db).fold(until=started)
+
+        assert state['game'][sample_game.id]['status'] == 'in_progress'
+        assert state['result'] == {}
+
+    def test_replay_route(self, client, db, sample_teams):
+        """Test the admin endpoint"""
+        response = client.post('/api/admin/replay-events')
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['replayed'] == {'events': 4, 'teams': 4, 'games': 0, 'results': 0}
+
+    @pytest.mark.timing
+    def test_replay_100k_events_benchmark(self, db):
+        """Benchmark: a 100k-event log replays in a few seconds"""
+        now = datetime.utcnow().isoformat()
+        team_count = 1000
+        events = [
+            {'version': 1, 'type': 'team_created', 'entity': 'team', 'entity_id': i,
+             'data': {'id': i, 'name': f'Team {i}', 'player1': f'A{i}', 'player2': f'B{i}', 'created_at': now}}
+            for i in range(1, team_count + 1)
+        ]
+        game_id = 0
+        while len(events) < 100_000:
+            game_id += 1
+            team1_id = game_id % team_count + 1
+            team2_id = (game_id * 7 + 3) % team_count + 1
+            if team1_id == team2_id:
+                continue
+            team1_id, team2_id = min(team1_id, team2_id), max(team1_id, team2_id)
+            events += [
+                {'version': 2, 'type': 'game_created', 'entity': 'game', 'entity_id': game_id,
+                 'data': {'id': game_id, 'team1_id': team1_id, 'team2_id': team2_id, 'status': 'scheduled',
+                          'created_at': now, 'started_at': None, 'completed_at': None}},
+                {'version': 3, 'type': 'game_started', 'entity': 'game', 'entity_id': game_id,
+                 'data': {'id': game_id, 'status': 'in_progress', 'started_at': now}},
+                {'version': 4, 'type': 'result_created', 'entity': 'result', 'entity_id': game_id,
+                 'data': {'id': game_id, 'game_id': game_id, 'winning_team_id': team1_id,
+                          'score': game_id % 7, 'created_at': now}},
+                {'version': 4, 'type': 'game_completed', 'entity': 'game', 'entity_id': game_id,
+                 'data': {'id': game_id, 'status': 'completed', 'completed_at': now}},
+            ]
+        db.session.execute(insert(TournamentEvent), events)
+        db.session.commit()
+
+        start = time.perf_counter()
+        replayed = EventReplayer(db).rebuild()
+        elapsed = time.perf_counter() - start
+
+        print(f'\nReplayed {replayed["events"]} events in {elapsed:.2f}s')
+        assert replayed['events'] == len(events)
+        assert replayed['games'] == Game.query.count()
+        assert Result.query.count() == replayed['results']
+        assert elapsed < 10
@@ -0,0 +1,235 @@
+"""Tests for the Server-Sent Events stream"""
+import pytest
+import json
+import threading
+from sqlalchemy import insert
+from models.tournament_event import TournamentEvent
+from services.event_stream import EventStream
+
+
+def parse_events(chunks):
+    """Parse text/event-stream chunks into (id, event, data) tuples, skipping comments"""
+    events = []
+    for chunk in chunks:
+        if isinstance(chunk, bytes):
+            chunk = chunk.decode()
+        fields = {}
+        for line in chunk.strip().split('\n'):
+            if line and not line.startswith(':'):
+                name, _, value = line.partition(': ')
+                fields[name] = value
+        if 'event' in fields:
+            events.append((int(fields['id']), fields['event'], json.loads(fields['data'])))
+    return events
+
+
+def read_chunks(response, count):
+    """Read the first count chunks of a streamed response, then close it"""
+    iterator = iter(response.response)
+    try:
+        return [next(iterator) for _ in range(count)]
+    finally:
+        response.close()
+
+
+@pytest.fixture
+def stream(app):
+    return app.extensions['event_stream']
+
+
+def log_event(db, event_type, data, entity='team'):
+    """Append an event through a plain connection, as another worker's commit would (no local wake-up)"""
+    with db.engine.begin() as connection:
+        connection.execute(insert(TournamentEvent).values(
+            version=1, type=event_type, entity=entity, entity_id=data.get('id'), data=data
+        ))
+
+
+class TestEventStream:
+    """Test suite for the event stream read from the event log"""
+
+    def test_event_ids_are_log_ids(self, client, db, stream):
+        """Test that streamed events carry the ids of the durable log"""
+        for player in ('A', 'B', 'C'):
+            client.post('/api/teams/manual', json={'player1': player, 'player2': 'X'})
+
+        logged = [event.id for event in TournamentEvent.query.order_by(TournamentEvent.id)]
+        assert [event[0] for event in stream.events_after(db.session, 0)] == logged
+
+    def test_unstreamed_events_skipped(self, client, db, stream, sample_teams):
+        """Test that scheduled games, edits and deletions are logged but not streamed"""
+        game = client.post('/api/games', json={'team1_id': sample_teams[0].id, 'team2_id': sample_teams[1].id}).get_json()
+        client.delete(f"/api/games/{game['id']}")
+
+        last_team = TournamentEvent.query.filter_by(type='team_created').order_by(TournamentEvent.id.desc()).first()
+        assert stream.events_after(db.session, last_team.id) == []
+
+    def test_events_after(self, db, stream):
+        """Test resuming after a given event id"""
+        for i in range(1, 6):
+            log_event(db, 'team_created', {'id': i})
+
+        assert [event[0] for event in stream.events_after(db.session, 2)] == [3, 4, 5]
+        assert stream.events_after(db.session, 5) == []
+
+    def test_events_after_too_far_behind(self, db):
+        """Test that a gap longer than the history is not replayed"""
+        stream = EventStream(history=3)
+        for i in range(1, 6):
+            log_event(db, 'team_created', {'id': i})
+
+        assert stream.events_after(db.session, 1) is None
+        assert [event[0] for event in stream.events_after(db.session, 2)] == [3, 4, 5]
+
+    def test_commit_wakes_waiting_subscriber(self, app, client, stream):
+        """Test that a commit which logged events wakes subscribers of this process before the next poll"""
+        commits = stream._commits
+        woken = []
+
+        thread = threading.Thread(target=lambda: woken.append(stream.wait(commits, timeout=5)))
+        thread.start()
+        client.post('/api/teams/manual', json={'player1': 'A', 'player2': 'B'})
+        thread.join(timeout=5)
+
+        assert woken == [True]
+
+    def test_wait_timeout(self):
+        """Test that an idle wait returns False after the timeout"""
+        stream = EventStream()
+        assert stream.wait(stream._commits, timeout=0.01) is False
+
+    def test_other_worker_events_found_by_polling(self, app, db, stream):
+        """Test that events committed without a local wake-up still reach subscribers"""
+        chunks = stream.subscribe(app, last_event_id=0, keepalive=5, poll_interval=0.01)
+        next(chunks)
+
+        log_event(db, 'team_created', {'id': 1, 'player1': 'A'})
+
+        assert parse_events([next(chunks)]) == [(1, 'team_created', {'id': 1, 'player1': 'A'})]
+
+    def test_generated_game_streams_as_started(self, db, stream):
+        """Test that a game created in progress is streamed as game_started"""
+        log_event(db, 'game_created', {'id': 1, 'status': 'in_progress'}, entity='game')
+        log_event(db, 'game_created', {'id': 2, 'status': 'scheduled'}, entity='game')
+
+        assert [event[:2] for event in stream.events_after(db.session, 0)] == [(1, 'game_started')]
+
+    def test_subscribe_sends_keepalive(self, app, stream):
+        """Test that an idle stream sends comment lines"""
+        chunks = stream.subscribe(app, keepalive=0.01)
+        assert next(chunks).startswith('retry:')
+        assert next(chunks) == ': keepalive\n\n'
+
+    def test_subscribe_resyncs_after_gap(self, app, db):
+        """Test that a client too far behind is told to refetch"""
+        stream = EventStream(history=2)
+        for i in range(1, 6):
+            log_event(db, 'team_created', {'id': i})
+
+        chunks = stream.subscribe(app, last_event_id=1, keepalive=0.01)
+        next(chunks)
+        assert parse_events([next(chunks)]) == [(5, 'resync', {})]
+
+    def test_subscribe_resyncs_for_unknown_id(self, app, db, stream):
+        """Test that an id beyond the log (e.g. from a recreated database) triggers a refetch"""
+        log_event(db, 'team_created', {'id': 1})
+
+        chunks = stream.subscribe(app, last_event_id=40, keepalive=0.01)
+        next(chunks)
+        assert parse_events([next(chunks)]) == [(1, 'resync', {})]
+
+
+class TestEventsRoute:
+    """Test suite for GET /api/events"""
+
+    def test_stream_headers(self, client):
+        """Test that the endpoint streams text/event-stream without caching"""
+        response = client.get('/api/events', buffered=False)
+
+        assert response.status_code == 200
+        assert response.mimetype == 'text/event-stream'
+        assert response.headers['Cache-Control'] == 'no-cache'
+        response.close()
+
+    def test_invalid_last_event_id(self, client):
+        """Test that a non-numeric Last-Event-ID is rejected"""
+        response = client.get('/api/events', headers={'Last-Event-ID': 'abc'})
+        assert response.status_code == 400
+
+    def test_resume_with_last_event_id(self, client, stream):
+        """Test that a reconnecting client receives only the events it missed"""
+        client.post('/api/teams/manual', json={'player1': 'A', 'player2': 'B'})
+        client.post('/api/teams/manual', json={'player1': 'C', 'player2': 'D'})
+
+        response = client.get('/api/events', headers={'Last-Event-ID': '1'}, buffered=False)
+        events = parse_events(read_chunks(response, 2))
+
+        assert [(event_id, event_type) for event_id, event_type, _ in events] == [(2, 'team_created')]
+        assert events[0][2]['player1'] == 'C'
+
+    def test_last_event_id_query_parameter(self, client, stream):
+        """Test that the last id can be passed as a query parameter"""
+        client.post('/api/teams/manual', json={'player1': 'A', 'player2': 'B'})
+
+        response = client.get('/api/events?last_event_id=0', buffered=False)
+        events = parse_events(read_chunks(response, 2))
+
+        assert [event[1] for event in events] == ['team_created']
+
+
+class TestRouteEvents:
+    """Test suite for the events emitted by mutating routes"""
+
+    @pytest.fixture
+    def published(self, db, stream):
+        """Return a reader of the streamed (type, data) logged since the test's own setup"""
+        after = stream.latest_id(db.session)
+        return lambda: [(event_type, data) for _, event_type, data in stream.events_after(db.session, after) or []]
+
+    def test_create_teams_emits_team_created(self, client, published):
+        """Test that each created team gets its own event"""
+        client.post('/api/teams', json={'players': ['A', 'B', 'C', 'D']})
+
+        assert [event_type for event_type, _ in published()] == ['team_created', 'team_created']
+
+    def test_game_lifecycle_events(self, client, sample_game, published):
+        """Test that starting a game and submitting its result are pushed"""
+        client.post(f'/api/games/{sample_game.id}/start')
+        client.post('/api/results', json={
+            'game_id': sample_game.id,
+            'winning_team_id': sample_game.team1_id,
+            'score': 7
+        })
+
+        events = published()
+        assert [event_type for event_type, _ in events] == ['game_started', 'result_created', 'game_completed']
+        events = dict(events)
+        assert events['game_started']['status'] == 'in_progress'
+        assert events['game_completed']['status'] == 'completed'
+        assert events['result_created']['score'] == 7
+
+    def test_update_game_status_emits_events(self, client, sample_game, published):
+        """Test that status changes through PUT /games/<id> are pushed like start and result"""
+        client.put(f'/api/games/{sample_game.id}', json={'status': 'in_progress'})
+        client.put(f'/api/games/{sample_game.id}', json={'status': 'completed'})
+
+        assert [event_type for event_type, _ in published()] == ['game_started', 'game_completed']
+
+    def test_generated_games_emit_game_started(self, client, sample_teams, published):
+        """Test that generated games, which start immediately, are pushed"""
+        client.post('/api/games/generate-round', json={'tables': 'max'})
+
+        assert [event_type for event_type, _ in published()] == ['game_started', 'game_started']
+
+    def test_rejected_write_emits_nothing(self, client, sample_game, published):
+        """Test that failed requests publish no events"""
+        client.post('/api/results', json={'game_id': sample_game.id, 'winning_team_id': 1, 'score': 5})
+        assert published() == []
+
+    def test_clear_database_emits_database_cleared(self, client, sample_teams, published):
+        """Test that clearing the database is pushed with the deleted counts"""
+        client.post('/api/admin/clear-database')
+
+        assert published() == [
+            ('database_cleared', {'deleted': {'results': 0, 'games': 0, 'teams': 4}})
+        ]
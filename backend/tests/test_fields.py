@@ -0,0 +1,177 @@
+"""Tests for fields= projection on /games, /results, /teams and /rankings"""
+import pytest
+import json
+import time
+from sqlalchemy import insert
+from models.fields import parse_fields
+from models.team import Team
+from models.game import Game
+from services.tournament_version import bump_version
+
+
+def get_json(client, url):
+    response = client.get(url)
+    assert response.status_code == 200, response.data
+    return json.loads(response.data)
+
+
+def selects(statements, table):
+    return [s for s in statements if s.lstrip().upper().startswith('SELECT') and f'FROM {table}' in s]
+
+
+class TestParseFields:
+    """Test suite for the fields argument parser"""
+
+    def test_nested_fields(self):
+        """Test that dotted names nest under their relationship"""
+        assert parse_fields('id,status,team1.id,team1.name') == {
+            'id': None, 'status': None, 'team1': {'id': None, 'name': None}
+        }
+
+    def test_whole_relationship_wins(self):
+        """Test that asking for a relationship and one of its fields gives the whole relationship"""
+        assert parse_fields('team1.id,team1') == {'team1': None}
+        assert parse_fields('team1,team1.id') == {'team1': None}
+
+    def test_missing_means_everything(self):
+        """Test that without the argument every field is serialized"""
+        assert parse_fields(None) is None
+
+    @pytest.mark.parametrize('value', ['', 'id,', 'team1.', '.id'])
+    def test_empty_names(self, value):
+        """Test that empty names are rejected"""
+        with pytest.raises(ValueError):
+            parse_fields(value)
+
+
+class TestFieldsRoutes:
+    """Test suite for fields on the list endpoints"""
+
+    def test_games_projection(self, client, db, make_tournament, query_counter):
+        """Test that only the requested fields are returned and loaded"""
+        make_tournament(4)
+
+        query_counter.clear()
+        data = get_json(client, '/api/games?fields=id,status,team1.id,team2.id')
+
+        assert len(data['games']) == 3
+        for game in data['games']:
+            assert set(game) == {'id', 'status', 'team1', 'team2'}
+            assert game['team1'].keys() == {'id'} and game['team2'].keys() == {'id'}
+        statement = selects(query_counter, 'games')[0]
+        assert 'JOIN teams' in statement
+        assert 'created_at' not in statement and 'player1' not in statement
+
+    def test_games_without_team_fields_skip_the_join(self, client, db, make_tournament, query_counter):
+        """Test that teams are neither joined nor lazily loaded when no team field is asked for"""
+        make_tournament(4)
+
+        query_counter.clear()
+        data = get_json(client, '/api/games?fields=id,team1_id,team2_id')
+
+        assert data['games'][0] == {'id': 1, 'team1_id': 1, 'team2_id': 2}
+        assert not any('teams' in statement for statement in query_counter)
+
+    def test_whole_team(self, client, db, make_tournament):
+        """Test that a relationship without nested fields is serialized in full"""
+        make_tournament(3)
+
+        game = get_json(client, '/api/games?fields=team1')['games'][0]
+
+        assert set(game) == {'team1'}
+        assert set(game['team1']) == {'id', 'name', 'player1', 'player2', 'created_at'}
+
+    def test_results_projection(self, client, db, make_tournament):
+        """Test nested winning_team fields and timestamp formatting"""
+        make_tournament(3)
+
+        result = get_json(client, '/api/results?fields=score,created_at,winning_team.name')['results'][0]
+
+        assert set(result) == {'score', 'created_at', 'winning_team'}
+        assert result['winning_team'] == {'name': 'Team 1'}
+        assert isinstance(result['created_at'], str)
+
+    def test_teams_projection_with_paging(self, client, db, make_tournament):
+        """Test that fields combine with the keyset cursor even when id is not requested"""
+        make_tournament(5)
+
+        data = get_json(client, '/api/teams?fields=name&limit=2')
+
+        assert data['teams'] == [{'name': 'Team 1'}, {'name': 'Team 2'}]
+        assert data['next_after'] == 2
+
+    def test_rankings_projection(self, client, db, make_tournament):
+        """Test that ranking rows keep only the requested keys"""
+        make_tournament(3)
+
+        rankings = get_json(client, '/api/rankings?fields=rank,team_id')['rankings']
+        assert rankings[0] == {'rank': 1, 'team_id': rankings[0]['team_id']}
+
+        rankings = get_json(client, '/api/rankings?mode=elo&fields=team_id,rating')['rankings']
+        assert set(rankings[0]) == {'team_id', 'rating'}
+
+    def test_full_rows_are_unchanged(self, client, db, sample_game):
+        """Test that without fields every field is returned as before"""
+        game = get_json(client, '/api/games')['games'][0]
+
+        assert set(game) == {'id', 'team1', 'team2', 'status', 'created_at', 'started_at', 'completed_at'}
+
+    @pytest.mark.parametrize('url', [
+        '/api/games?fields=id,score',
+        '/api/games?fields=status.id',
+        '/api/games?fields=team1.rank',
+        '/api/games?fields=',
+        '/api/results?fields=winning_team.player3',
+        '/api/teams?fields=team1',
+        '/api/rankings?fields=rank,name',
+        '/api/rankings?fields=players.0',
+    ])
+    def test_invalid_fields(self, client, db, url):
+        """Test that unknown or wrongly nested fields are rejected"""
+        response = client.get(url)
+
+        assert response.status_code == 400
+        assert 'error' in json.loads(response.data)
+
+
+class TestFieldsBenchmark:
+    """Benchmark of payload size and latency per projection"""
+
+    PROJECTIONS = {
+        'full': '',
+        'ids and teams': '&fields=id,status,team1.id,team2.id',
+        'ids only': '&fields=id,status,team1_id,team2_id',
+    }
+
+    def test_bytes_and_latency_per_projection_benchmark(self, app, db):
+        """Benchmark: 500 games per page, full rows against two projections"""
+        db.session.execute(insert(Team), [
+            {'id': i, 'name': f'Team {i}', 'player1': f'Player {i}a', 'player2': f'Player {i}b'} for i in range(1, 101)
+        ])
+        db.session.execute(insert(Game), [
+            {'id': game_id, 'team1_id': game_id % 99 + 1, 'team2_id': 100, 'status': 'completed'}
+            for game_id in range(1, 5_001)
+        ])
+        bump_version(db.session)
+        db.session.commit()
+        client = app.test_client()
+
+        sizes, timings = {}, {}
+        for name, projection in self.PROJECTIONS.items():
+            samples = []
+            for i in range(10):
+                # Distinct URLs so the response cache never answers
+                url = f'/api/games?limit=500&after={i * 400}{projection}'
+                started = time.perf_counter()
+                response = client.get(url)
+                samples.append(time.perf_counter() - started)
+                assert response.status_code == 200
+            sizes[name] = len(response.data)
+            timings[name] = sorted(samples)[len(samples) // 2]
+
+        # Latency is reported only: on a shared machine the medians are too noisy to compare
+        print()
+        for name in self.PROJECTIONS:
+            print(f'{name}: {sizes[name] / 1024:.1f} KiB, {timings[name] * 1000:.1f} ms per page of 500')
+        assert sizes['ids and teams'] < sizes['full'] / 3
+        assert sizes['ids only'] < sizes['ids and teams']
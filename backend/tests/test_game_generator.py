@@ -265,3 +265,245 @@ class TestGameGenerator:
         assert len(generator.played_matchups) == 1
         assert generator.team_game_count[sample_teams[0].id] == 1
         assert generator.team_game_count[sample_teams[1].id] == 1
+
+    def test_remaining_matchups(self, app, db, sample_teams):
+        """Test that every pair without a completed game remains, in-progress ones included"""
+        ids = [team.id for team in sample_teams]
+        db.session.add_all([
+            Game(team1_id=ids[0], team2_id=ids[1], status='completed'),
+            Game(team1_id=ids[2], team2_id=ids[3], status='in_progress'),
+        ])
+        db.session.commit()
+
+        remaining = GameGenerator(db).remaining_matchups()
+
+        assert remaining == [(ids[0], ids[2]), (ids[0], ids[3]), (ids[1], ids[2]), (ids[1], ids[3]), (ids[2], ids[3])]
+
+
+class TestMatchupState:
+    """Test suite for the shared, incrementally maintained matchup state"""
+
+    def test_state_is_shared_between_generators(self, app, db, sample_teams):
+        """Test that a second generator reuses the state built by the first"""
+        first = GameGenerator(db)
+        second = GameGenerator(db)
+        assert first.state is second.state
+
+    def test_generation_cost_does_not_depend_on_completed_games(self, app, db, make_tournament, query_counter):
+        """Test that a warm state answers generation without reloading game history"""
+        make_tournament(40)
+        GameGenerator(db)
+        query_counter.clear()
+
+        game = GameGenerator(db).generate_next_game()
+
+        assert game is not None
+        history_loads = [s for s in query_counter if 'FROM games' in s and 'status' in s.split('WHERE')[-1]]
+        assert history_loads == []
+
+    def test_state_follows_committed_writes_by_delta(self, client, db, in_progress_game, sample_teams):
+        """Test that starting and completing games updates the state without a rebuild"""
+        state = GameGenerator(db).state
+        assert set(state.busy_teams) == {sample_teams[0].id, sample_teams[1].id}
+
+        client.post('/api/results', json={
+            'game_id': in_progress_game.id,
+            'winning_team_id': sample_teams[0].id,
+            'score': 3
+        })
+
+        assert state.version is not None
+        assert not state.busy_teams
+        assert frozenset([sample_teams[0].id, sample_teams[1].id]) in state.played_matchups
+        assert state.team_game_count[sample_teams[0].id] == 1
+
+        client.post('/api/teams/manual', json={'player1': 'Ivy', 'player2': 'Jack'})
+        assert len(state.team_ids) == 5
+
+    def test_state_rebuilds_after_foreign_write(self, app, db, sample_teams):
+        """Test that a write the process did not observe forces a rebuild"""
+        from sqlalchemy import text
+        generator = GameGenerator(db)
+        state = generator.state
+
+        # Simulate another worker committing a game directly
+        with db.engine.begin() as connection:
+            connection.execute(text(
+                "INSERT INTO games (team1_id, team2_id, status, created_at) "
+                f"VALUES ({sample_teams[0].id}, {sample_teams[1].id}, 'completed', CURRENT_TIMESTAMP)"
+            ))
+            connection.execute(text('UPDATE tournament_state SET version = version + 1'))
+        db.session.rollback()
+
+        game = generator.generate_next_game()
+
+        assert frozenset([sample_teams[0].id, sample_teams[1].id]) in state.played_matchups
+        assert frozenset([game.team1_id, game.team2_id]) != frozenset([sample_teams[0].id, sample_teams[1].id])
+
+    def test_clear_database_invalidates_state(self, client, db, sample_teams):
+        """Test that bulk deletes drop the state instead of leaving stale teams behind"""
+        state = GameGenerator(db).state
+        client.post('/api/admin/clear-database')
+
+        assert GameGenerator(db).state.team_ids == set()
+        assert state.version is not None
+
+
+class TestBestMatchupSelection:
+    """The indexed selection must pick exactly the pair the exhaustive scoring would"""
+
+    def _generator_with_state(self, db, team_count, played_pairs, busy_pairs=()):
+        from services.matchup_state import MatchupState
+
+        state = MatchupState()
+        state.team_ids = set(range(1, team_count + 1))
+        for team1_id, team2_id in played_pairs:
+            state._apply_game(team1_id, team2_id, 'completed', 1)
+        for team1_id, team2_id in busy_pairs:
+            state._apply_game(team1_id, team2_id, 'in_progress', 1)
+
+        generator = GameGenerator(db)
+        generator.state = state
+        return generator
+
+    def _exhaustive_best(self, generator, available_team_ids):
+        """The original algorithm: score every unplayed pair and sort"""
+        from itertools import combinations
+
+        scored = [
+            (generator._score_matchup(t1, t2), t1, t2)
+            for t1, t2 in combinations(available_team_ids, 2)
+            if frozenset([t1, t2]) not in generator.played_matchups
+        ]
+        if not scored:
+            return None
+        scored.sort(reverse=True)
+        return scored[0][1], scored[0][2]
+
+    def _round_robin_rounds(self, team_count, rounds):
+        """Pairs of the first rounds of a circle-method round robin"""
+        ids = list(range(1, team_count + 1))
+        pairs = []
+        for _ in range(rounds):
+            half = len(ids) // 2
+            pairs.extend(zip(ids[:half], reversed(ids[half:])))
+            ids = [ids[0]] + [ids[-1]] + ids[1:-1]
+        return pairs
+
+    @pytest.mark.parametrize('seed', range(40))
+    def test_matches_exhaustive_scoring(self, app, db, seed):
+        """Test random tournaments against the exhaustive O(n^2 log n) selection"""
+        import random
+        from itertools import combinations
+
+        rng = random.Random(seed)
+        team_count = rng.randint(2, 24)
+        all_pairs = list(combinations(range(1, team_count + 1), 2))
+        played = rng.sample(all_pairs, rng.randint(0, len(all_pairs)))
+        generator = self._generator_with_state(db, team_count, played)
+
+        busy = set(rng.sample(range(1, team_count + 1), rng.randint(0, team_count // 3)))
+        available = [tid for tid in range(1, team_count + 1) if tid not in busy]
+
+        assert generator._select_best_matchup(available) == self._exhaustive_best(generator, available)
+
+    def test_tie_break_prefers_highest_ids(self, app, db):
+        """Test that among equally fair pairs the highest (team1, team2) wins, as with the sort"""
+        generator = self._generator_with_state(db, 5, [])
+        assert generator._select_best_matchup([1, 2, 3, 4, 5]) == (4, 5)
+
+    def test_returns_none_when_everything_played(self, app, db):
+        """Test exhaustion among the available teams"""
+        generator = self._generator_with_state(db, 3, [(1, 2), (1, 3), (2, 3)])
+        assert generator._select_best_matchup([1, 2, 3]) is None
+
+    @pytest.mark.timing
+    @pytest.mark.parametrize('team_count', [20, 200, 2000])
+    def test_benchmark_selection(self, app, db, team_count):
+        """Benchmark: selection stays fast at 20, 200 and 2,000 teams"""
+        import time
+
+        played = self._round_robin_rounds(team_count, 5)
+        generator = self._generator_with_state(db, team_count, played)
+        available = list(range(1, team_count + 1))
+
+        start = time.perf_counter()
+        best = generator._select_best_matchup(available)
+        elapsed = time.perf_counter() - start
+
+        assert best is not None
+        assert frozenset(best) not in generator.played_matchups
+        if team_count <= 200:
+            assert best == self._exhaustive_best(generator, available)
+        # Exhaustive scoring of 2,000 teams takes seconds; the indexed scan takes milliseconds
+        assert elapsed < 0.5
+        print(f'\n{team_count} teams: best matchup selected in {elapsed * 1000:.2f} ms')
+
+
+class TestRoundSelection:
+    """Round generation must be a maximum-weight matching, not repeated greedy picks"""
+
+    def _generator_with_state(self, db, team_count, played_pairs):
+        return TestBestMatchupSelection()._generator_with_state(db, team_count, played_pairs)
+
+    def _all_matchings(self, team_ids, allowed):
+        """Every set of disjoint allowed pairs (exhaustive, small inputs only)"""
+        if not team_ids:
+            yield []
+            return
+        first, rest = team_ids[0], team_ids[1:]
+        yield from self._all_matchings(rest, allowed)
+        for partner in rest:
+            if frozenset([first, partner]) in allowed:
+                remaining = [tid for tid in rest if tid != partner]
+                for matching in self._all_matchings(remaining, allowed):
+                    yield [(first, partner)] + matching
+
+    def test_round_beats_repeated_greedy(self, app, db):
+        """Test that pairing everyone wins over taking the single best pair first"""
+        # Greedy would take (3, 4) and leave 1 and 2, who already played each other
+        generator = self._generator_with_state(db, 4, [(1, 2), (1, 3)])
+
+        assert generator._select_best_round([1, 2, 3, 4]) == [(1, 4), (2, 3)]
+
+    def test_round_respects_table_limit(self, app, db):
+        """Test that a table limit keeps the fairest pairs"""
+        generator = self._generator_with_state(db, 6, [(1, 2), (1, 3), (2, 3)])
+
+        pairs = generator._select_best_round(list(range(1, 7)), tables=1)
+
+        assert len(pairs) == 1
+        assert pairs[0] in [(4, 5), (4, 6), (5, 6)]
+
+    @pytest.mark.parametrize('seed', range(25))
+    def test_round_is_optimal(self, app, db, seed):
+        """Test against exhaustive enumeration: most games first, then highest total fairness"""
+        import random
+        from itertools import combinations
+
+        rng = random.Random(seed)
+        team_count = rng.randint(2, 8)
+        all_pairs = list(combinations(range(1, team_count + 1), 2))
+        played = rng.sample(all_pairs, rng.randint(0, len(all_pairs)))
+        generator = self._generator_with_state(db, team_count, played)
+        tables = rng.choice([None, 1, 2, 3])
+
+        team_ids = list(range(1, team_count + 1))
+        allowed = {frozenset(pair) for pair in all_pairs} - generator.played_matchups
+
+        def quality(matching):
+            games = min(len(matching), tables) if tables else len(matching)
+            total = sum(generator._score_matchup(*pair) for pair in matching)
+            return games, total
+
+        candidates = [
+            m for m in self._all_matchings(team_ids, allowed)
+            if tables is None or len(m) <= tables
+        ]
+        best = max(quality(m) for m in candidates)
+
+        pairs = generator._select_best_round(team_ids, tables)
+
+        assert all(frozenset(pair) in allowed for pair in pairs)
+        assert len({tid for pair in pairs for tid in pair}) == 2 * len(pairs)
+        assert quality(pairs) == best
@@ -246,6 +246,18 @@ class TestGamesRoutes:
         data = json.loads(response.data)
         assert 'error' in data
 
+    def test_start_game_team_busy(self, client, db, sample_teams):
+        """Test that a game cannot start while one of its teams is playing another"""
+        client.post('/api/games', json={'team1_id': sample_teams[0].id, 'team2_id': sample_teams[1].id})
+        other = client.post('/api/games', json={'team1_id': sample_teams[0].id, 'team2_id': sample_teams[2].id}).get_json()
+        first = Game.query.filter_by(team2_id=sample_teams[1].id).one()
+        assert client.post(f'/api/games/{first.id}/start').status_code == 200
+
+        response = client.post(f"/api/games/{other['id']}/start")
+
+        assert response.status_code == 400
+        assert db.session.get(Game, other['id']).status == 'scheduled'
+
     def test_start_game_not_found(self, client, db):
         """Test starting a non-existent game"""
         response = client.post('/api/games/999/start')
@@ -303,6 +315,18 @@ class TestGamesRoutes:
         data = json.loads(response.data)
         assert data['status'] == 'in_progress'
 
+    def test_update_game_status_team_busy(self, client, db, sample_teams):
+        """Test that setting in_progress is refused while a team is playing"""
+        db.session.add(Game(team1_id=sample_teams[0].id, team2_id=sample_teams[1].id, status='in_progress'))
+        game = Game(team1_id=sample_teams[1].id, team2_id=sample_teams[2].id, status='scheduled')
+        db.session.add(game)
+        db.session.commit()
+
+        response = client.put(f'/api/games/{game.id}', json={'status': 'in_progress'})
+
+        assert response.status_code == 400
+        assert 'already playing' in response.get_json()['error']
+
     def test_update_game_no_data(self, client, db, sample_teams):
         """Test update with no data"""
         game = Game(team1_id=sample_teams[0].id, team2_id=sample_teams[1].id, status='scheduled')
@@ -348,3 +372,107 @@ class TestGamesRoutes:
         """Test deleting a non-existent game"""
         response = client.delete('/api/games/999')
         assert response.status_code == 404
+
+
+class TestGamesRoutesQueryCount:
+    """Listing games must not lazy-load teams one row at a time"""
+
+    @pytest.mark.parametrize('team_count', [3, 30])
+    @pytest.mark.parametrize('url,status', [
+        ('/api/games', 'completed'),
+        ('/api/games?status=in_progress', 'in_progress'),
+        ('/api/games/current', 'in_progress'),
+    ])
+    def test_list_statement_count_is_fixed(self, client, db, make_tournament, query_counter,
+                                           team_count, url, status):
+        """Test that a list request costs a version lookup and one query, whatever the row count"""
+        _, games = make_tournament(team_count, status=status)
+        query_counter.clear()
+
+        response = client.get(url)
+
+        data = json.loads(response.data)
+        assert len(data['games']) == len(games)
+        assert all(game['team1'] and game['team2'] for game in data['games'])
+        assert len(query_counter) == 2
+
+    @pytest.mark.parametrize('team_count', [4, 30])
+    def test_generate_response_loads_teams_in_bulk(self, client, db, make_tournament, query_counter, team_count):
+        """Test that serializing a generated game does not lazy-load each team"""
+        make_tournament(team_count)
+        query_counter.clear()
+
+        response = client.post('/api/games/generate')
+        assert response.status_code == 201
+
+        team_lazy_loads = [s for s in query_counter if 'FROM teams' in s and 'WHERE teams.id = ?' in s]
+        assert team_lazy_loads == []
+
+
+    def test_create_game_manually_reads_no_game_history(self, client, db, make_tournament, query_counter):
+        """Test that busy and already-played checks come from the shared matchup state"""
+        teams, _ = make_tournament(30)
+        client.get('/api/match-matrix')
+        query_counter.clear()
+
+        response = client.post('/api/games', json={'team1_id': teams[0].id, 'team2_id': teams[5].id})
+        assert response.status_code == 201
+
+        # Only the created game itself is read back, by primary key
+        history_reads = [s for s in query_counter if 'FROM games' in s and 'games.id = ?' not in s]
+        assert history_reads == []
+
+        response = client.post('/api/games', json={'team1_id': teams[1].id, 'team2_id': teams[0].id})
+        assert response.status_code == 400
+        assert 'already played' in json.loads(response.data)['error']
+
+
+class TestGenerateRound:
+    """Test suite for generating a whole round in one call"""
+
+    def test_generate_round_fills_all_tables(self, client, db, sample_teams):
+        """Test that "as many as possible" pairs every available team"""
+        response = client.post('/api/games/generate-round')
+
+        assert response.status_code == 201
+        games = json.loads(response.data)['games']
+        assert len(games) == 2
+        team_ids = [game['team1']['id'] for game in games] + [game['team2']['id'] for game in games]
+        assert sorted(team_ids) == sorted(team.id for team in sample_teams)
+        assert all(game['status'] == 'in_progress' for game in games)
+
+    def test_generate_round_respects_table_count(self, client, db, sample_teams):
+        """Test that no more games than tables are started"""
+        response = client.post('/api/games/generate-round', json={'tables': 1})
+
+        assert response.status_code == 201
+        assert len(json.loads(response.data)['games']) == 1
+        assert Game.query.filter_by(status='in_progress').count() == 1
+
+    def test_generate_round_skips_busy_and_played(self, client, db, sample_teams):
+        """Test that busy teams and played matchups are excluded"""
+        db.session.add_all([
+            Game(team1_id=sample_teams[0].id, team2_id=sample_teams[1].id, status='in_progress'),
+            Game(team1_id=sample_teams[2].id, team2_id=sample_teams[3].id, status='completed'),
+        ])
+        db.session.commit()
+
+        response = client.post('/api/games/generate-round', json={'tables': 'max'})
+
+        assert response.status_code == 400
+
+    def test_generate_round_invalid_tables(self, client, db, sample_teams):
+        """Test validation of the tables parameter"""
+        for tables in [0, -1, 'two', True, 1.5]:
+            response = client.post('/api/games/generate-round', json={'tables': tables})
+            assert response.status_code == 400
+
+    def test_generate_round_is_one_transaction(self, client, db, make_tournament, query_counter):
+        """Test that all games of the round are committed together"""
+        make_tournament(10, status='scheduled')
+        query_counter.clear()
+
+        response = client.post('/api/games/generate-round')
+
+        assert len(json.loads(response.data)['games']) == 5
+        assert sum(1 for s in query_counter if s.startswith('UPDATE tournament_state')) == 1
@@ -0,0 +1,141 @@
+"""Tests for the orjson JSON provider and pre-encoded team fragments"""
+import json
+import pytest
+import time
+from datetime import datetime
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import insert
+from models.team import Team
+from models.game import Game
+from services.json_provider import TeamFragments
+from services.tournament_version import bump_version
+
+
+class TestOrjsonProvider:
+    """Test suite for the Flask JSON provider"""
+
+    def test_datetimes_match_isoformat(self, app):
+        """Test that native datetime encoding gives the same strings as isoformat()"""
+        moments = [datetime(2024, 5, 1, 12, 30), datetime(2024, 5, 1, 12, 30, 5, 123456)]
+
+        assert json.loads(app.json.dumps(moments)) == [moment.isoformat() for moment in moments]
+
+    def test_keys_sorted_and_non_string_keys(self, app):
+        """Test key order matches the default provider and integer keys are accepted"""
+        assert app.json.dumps({'b': 1, 'a': {2: None, 1: 'x'}}) == '{"a":{"1":"x","2":null},"b":1}'
+
+    def test_keyword_arguments_fall_back(self, app):
+        """Test that json.dumps options still work"""
+        assert app.json.dumps({'a': 1}, indent=1) == '{\n "a": 1\n}'
+
+    def test_loads(self, app):
+        """Test that request bodies are parsed by orjson"""
+        assert app.json.loads(b'{"a": [1, 2]}') == {'a': [1, 2]}
+
+
+class TestTeamFragments:
+    """Test suite for the per-version team fragment cache"""
+
+    def test_same_fragment_for_every_embedding(self, db, sample_teams):
+        """Test that a team is encoded once per version"""
+        encode = TeamFragments().encoder(1)
+
+        assert encode(sample_teams[0]) is encode(sample_teams[0])
+        assert encode(None) is None
+
+    def test_new_version_re_encodes(self, app, db, sample_teams):
+        """Test that fragments of an older version are not reused"""
+        fragments = TeamFragments()
+        first = fragments.encoder(1)(sample_teams[0])
+
+        sample_teams[0].name = 'Renamed'
+        second = fragments.encoder(2)(sample_teams[0])
+
+        assert second is not first
+        assert json.loads(app.json.dumps(second))['name'] == 'Renamed'
+
+    def test_rows_match_to_dict(self, client, db, make_tournament):
+        """Test that the fast path returns exactly what to_dict serialized"""
+        make_tournament(4)
+
+        games = json.loads(client.get('/api/games').data)['games']
+        results = json.loads(client.get('/api/results').data)['results']
+        teams = json.loads(client.get('/api/teams').data)['teams']
+
+        assert games == [game.to_dict() for game in Game.query.order_by(Game.id)]
+        assert results[0]['winning_team'] == teams[0]
+        assert teams == [team.to_dict() for team in Team.query.order_by(Team.id)]
+
+    def test_each_team_encoded_once_per_list(self, app, db, make_tournament, monkeypatch):
+        """Test that a list reuses one fragment per team instead of serializing it for every game"""
+        make_tournament(8)
+        games = Game.query_with_teams().all()
+        encoded = []
+        to_dict = Team.to_dict
+        monkeypatch.setattr(Team, 'to_dict', lambda team, *args: encoded.append(team.id) or to_dict(team, *args))
+
+        encode_team = TeamFragments().encoder(1)
+        rows = [game.to_dict(encode_related=encode_team) for game in games]
+
+        teams = {game.team1_id for game in games} | {game.team2_id for game in games}
+        assert sorted(encoded) == sorted(teams)
+        assert all(row['team1'] is encode_team(game.team1) for row, game in zip(rows, games))
+
+    def test_expired_rows_load_through_the_orm(self, app, db, sample_game):
+        """Test that the fast path still reads attributes that are not loaded"""
+        db.session.expire(sample_game)
+
+        row = sample_game.to_dict(encode_related=TeamFragments().encoder(1))
+
+        assert row['status'] == 'scheduled'
+        assert json.loads(app.json.dumps(row)) == sample_game.to_dict()
+
+    def test_whole_rows_fall_back_when_a_field_is_not_loaded(self, app, db, sample_teams):
+        """Test that whole rows with an expired field are read through the ORM, not from a partial state"""
+        db.session.expire(sample_teams[1], ['name'])
+
+        rows = Team.to_json_rows(sample_teams, TeamFragments().encoder(1))
+
+        assert json.loads(app.json.dumps(rows)) == [team.to_dict() for team in sample_teams]
+
+
+class TestSerializationBenchmark:
+    """Benchmark of serializing a 1,000-game list"""
+
+    def test_1000_games_benchmark(self, app, db):
+        """Benchmark: Flask's json against team fragments + orjson"""
+        db.session.execute(insert(Team), [
+            {'id': i, 'name': f'Team {i}', 'player1': f'Player {i}a', 'player2': f'Player {i}b'} for i in range(1, 101)
+        ])
+        db.session.execute(insert(Game), [
+            {'id': game_id, 'team1_id': game_id % 99 + 1, 'team2_id': 100, 'status': 'completed',
+             'started_at': datetime(2024, 5, 1), 'completed_at': datetime(2024, 5, 1, 0, 20)}
+            for game_id in range(1, 1_001)
+        ])
+        version = bump_version(db.session)
+        db.session.commit()
+        games = Game.query_with_teams().order_by(Game.id).all()
+        default_provider = DefaultJSONProvider(app)
+
+        def default():
+            return default_provider.dumps({'games': [game.to_dict() for game in games]})
+
+        def fast():
+            encode_team = TeamFragments().encoder(version)
+            return app.json.dumps({'games': Game.to_json_rows(games, encode_team)})
+
+        assert json.loads(fast()) == json.loads(default())
+
+        timings = {}
+        for name, serialize in (('default', default), ('orjson', fast)):
+            samples = []
+            for _ in range(15):
+                started = time.perf_counter()
+                serialize()
+                samples.append(time.perf_counter() - started)
+            timings[name] = sorted(samples)[len(samples) // 2]
+
+        speedup = timings['default'] / timings['orjson']
+        print(f"\n1,000 games: {timings['default'] * 1000:.1f} ms with to_dict + json, "
+              f"{timings['orjson'] * 1000:.1f} ms with fragments + orjson ({speedup:.1f}x)")
+        assert speedup >= 5
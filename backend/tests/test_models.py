@@ -346,3 +346,52 @@ class TestModelRelationships:
         # Note: Teams with games should not be deletable
         # This is enforced at the application level
         # (see teams routes tests for that validation)
+
+
+class TestIndexes:
+    """Query-plan assertions for the hot lookups on games and results"""
+
+    def _plan(self, db, query):
+        """SQLite's EXPLAIN QUERY PLAN details for an ORM query"""
+        from sqlalchemy import text
+        statement = query.statement.compile(db.engine, compile_kwargs={'literal_binds': True})
+        rows = db.session.execute(text(f'EXPLAIN QUERY PLAN {statement}')).all()
+        return ' | '.join(row[-1] for row in rows)
+
+    @pytest.fixture(autouse=True)
+    def sqlite_only(self, db):
+        if db.engine.dialect.name != 'sqlite':
+            pytest.skip('query plans are checked on SQLite')
+
+    def test_indexes_exist(self, app, db):
+        """Test that create_app creates the declared indexes"""
+        from sqlalchemy import inspect
+        inspector = inspect(db.engine)
+        game_indexes = {index['name'] for index in inspector.get_indexes('games')}
+        result_indexes = {index['name'] for index in inspector.get_indexes('results')}
+
+        assert {'ix_games_status_team1_id_team2_id', 'ix_games_team1_id', 'ix_games_team2_id'} <= game_indexes
+        assert 'ix_results_winning_team_id' in result_indexes
+
+    def test_status_filter_uses_composite_index(self, app, db):
+        """Test the generator and /games/current lookup"""
+        plan = self._plan(db, Game.query.filter_by(status='in_progress'))
+        assert 'USING INDEX ix_games_status_team1_id_team2_id' in plan
+
+    def test_matchup_lookup_uses_composite_index(self, app, db):
+        """Test the already-played check in manual game creation"""
+        plan = self._plan(db, Game.query.filter_by(team1_id=1, team2_id=2, status='completed'))
+        assert 'ix_games_status_team1_id_team2_id' in plan
+        assert 'status=? AND team1_id=? AND team2_id=?' in plan
+
+    def test_team_games_lookup_uses_both_side_indexes(self, app, db):
+        """Test the games-of-a-team check used before deleting a team"""
+        plan = self._plan(db, Game.query.filter((Game.team1_id == 1) | (Game.team2_id == 1)))
+        assert 'MULTI-INDEX OR' in plan
+        assert 'ix_games_team1_id' in plan
+        assert 'ix_games_team2_id' in plan
+
+    def test_winning_team_lookup_uses_index(self, app, db):
+        """Test the per-team result lookup"""
+        plan = self._plan(db, Result.query.filter_by(winning_team_id=1))
+        assert 'USING INDEX ix_results_winning_team_id' in plan
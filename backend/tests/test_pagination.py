@@ -0,0 +1,155 @@
+"""Tests for keyset pagination of /games, /results and /teams"""
+import pytest
+import json
+import time
+from sqlalchemy import insert
+from models.team import Team
+from models.game import Game
+from services.pagination import MAX_PAGE_SIZE
+from services.tournament_version import bump_version
+
+
+def get_json(client, url):
+    response = client.get(url)
+    assert response.status_code == 200, response.data
+    return json.loads(response.data)
+
+
+def walk(client, url, key, limit):
+    """Follow next_after cursors from the first page to the last"""
+    rows, after, pages = [], None, 0
+    while True:
+        separator = '&' if '?' in url else '?'
+        cursor = f'&after={after}' if after is not None else ''
+        data = get_json(client, f'{url}{separator}limit={limit}{cursor}')
+        rows.extend(data[key])
+        pages += 1
+        after = data['next_after']
+        if after is None:
+            return rows, pages
+
+
+class TestKeysetPagination:
+    """Test suite for limit / after / total on list endpoints"""
+
+    @pytest.mark.parametrize('url,key', [
+        ('/api/games', 'games'),
+        ('/api/results', 'results'),
+        ('/api/teams', 'teams'),
+    ])
+    def test_pages_cover_the_full_list(self, client, db, make_tournament, url, key):
+        """Test that walking the cursors returns every row once, in id order"""
+        make_tournament(12)
+        full = get_json(client, url)[key]
+
+        rows, pages = walk(client, url, key, 5)
+
+        assert [row['id'] for row in rows] == sorted(row['id'] for row in full)
+        assert pages == -(-len(full) // 5)
+
+    def test_first_page_without_limit(self, client, db, sample_teams):
+        """Test that without limit a short list is one page with no cursor"""
+        data = get_json(client, '/api/teams')
+
+        assert len(data['teams']) == 4
+        assert data['next_after'] is None
+        assert 'total' not in data
+
+    def test_default_page_size(self, app, db):
+        """Test that without limit a long list is cut at MAX_PAGE_SIZE with a cursor"""
+        db.session.execute(insert(Team), [
+            {'id': i, 'name': f'Team {i}', 'player1': f'A{i}', 'player2': f'B{i}'} for i in range(1, MAX_PAGE_SIZE + 2)
+        ])
+        bump_version(db.session)
+        db.session.commit()
+        client = app.test_client()
+
+        data = get_json(client, '/api/teams')
+        assert len(data['teams']) == MAX_PAGE_SIZE
+        assert data['next_after'] == MAX_PAGE_SIZE
+
+        data = get_json(client, f"/api/teams?after={data['next_after']}")
+        assert [team['id'] for team in data['teams']] == [MAX_PAGE_SIZE + 1]
+        assert data['next_after'] is None
+
+    def test_last_full_page_has_no_cursor(self, client, db, sample_teams):
+        """Test that a page ending exactly on the last row does not announce another"""
+        data = get_json(client, '/api/teams?limit=4')
+
+        assert len(data['teams']) == 4
+        assert data['next_after'] is None
+
+    def test_status_filter_is_paged(self, client, db, make_tournament):
+        """Test that status combines with the cursor"""
+        teams, _ = make_tournament(10)
+        db.session.add_all([
+            Game(team1_id=teams[0].id, team2_id=teams[i].id, status='scheduled') for i in range(2, 9)
+        ])
+        db.session.commit()
+
+        rows, _ = walk(client, '/api/games?status=scheduled', 'games', 3)
+
+        assert len(rows) == 7
+        assert {row['status'] for row in rows} == {'scheduled'}
+
+    def test_total_only_when_requested(self, client, db, make_tournament, query_counter):
+        """Test that the count query runs only with total=true and ignores the cursor"""
+        make_tournament(10)
+
+        query_counter.clear()
+        data = get_json(client, '/api/games?limit=2')
+        assert 'total' not in data
+        assert not any('count(' in statement.lower() for statement in query_counter)
+
+        data = get_json(client, f"/api/games?limit=2&after={data['next_after']}&total=true")
+        assert data['total'] == 9
+        assert len(data['games']) == 2
+
+    @pytest.mark.parametrize('query', ['limit=0', 'limit=501', 'limit=x', 'after=-1', 'total=maybe'])
+    def test_invalid_arguments(self, client, db, query):
+        """Test that malformed paging arguments are rejected"""
+        for url in ('/api/games', '/api/results', '/api/teams'):
+            assert client.get(f'{url}?{query}').status_code == 400
+
+    def test_page_is_a_range_scan(self, client, db, make_tournament, query_counter):
+        """Test that a page is one query seeking past the cursor in id order"""
+        make_tournament(10)
+
+        query_counter.clear()
+        get_json(client, '/api/games?limit=2&after=3')
+
+        page = [statement for statement in query_counter if 'FROM games' in statement]
+        assert len(page) == 1
+        assert 'WHERE games.id > ? ORDER BY games.id' in page[0] and 'LIMIT' in page[0]
+
+    @pytest.mark.timing
+    def test_page_time_stays_flat_benchmark(self, app, db):
+        """Benchmark: a deep page of 50 games costs the same with 1,000 or 50,000 games"""
+        db.session.execute(insert(Team), [
+            {'id': i, 'name': f'Team {i}', 'player1': 'A', 'player2': 'B'} for i in range(1, 101)
+        ])
+        client = app.test_client()
+
+        timings = {}
+        next_id = 1
+        for game_count in (1_000, 50_000):
+            db.session.execute(insert(Game), [
+                {'id': game_id, 'team1_id': game_id % 99 + 1, 'team2_id': 100, 'status': 'completed'}
+                for game_id in range(next_id, game_count + 1)
+            ])
+            next_id = game_count + 1
+            bump_version(db.session)
+            db.session.commit()
+
+            # Distinct URLs so the response cache never answers
+            samples = []
+            for i in range(20):
+                started = time.perf_counter()
+                data = get_json(client, f'/api/games?limit=50&after={game_count - 100 - i}')
+                samples.append(time.perf_counter() - started)
+                assert len(data['games']) == 50
+            timings[game_count] = sorted(samples)[len(samples) // 2]
+
+        print(f"\npage of 50: {timings[1_000] * 1000:.1f} ms with 1,000 games, "
+              f"{timings[50_000] * 1000:.1f} ms with 50,000")
+        assert timings[50_000] < timings[1_000] * 3
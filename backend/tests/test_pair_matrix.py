@@ -0,0 +1,123 @@
+"""Tests for the bit matrix of played pairs"""
+import pytest
+import sys
+from services.pair_matrix import PairMatrix, PairSet
+from services.matchup_state import MatchupState
+
+
+class TestPairMatrix:
+    """Test suite for PairMatrix"""
+
+    def test_add_and_remove_are_symmetric(self):
+        """Test that a pair is found from either team"""
+        matrix = PairMatrix()
+        matrix.add(3, 7)
+
+        assert matrix.has(3, 7) and matrix.has(7, 3)
+        assert not matrix.has(3, 4) and not matrix.has(9, 10)
+        assert len(matrix) == 1
+
+        matrix.remove(7, 3)
+        assert not matrix.has(3, 7)
+        assert len(matrix) == 0
+
+    def test_repeated_pairs_are_counted(self):
+        """Test that removing one of two games between the same teams keeps the pair"""
+        matrix = PairMatrix()
+        matrix.add(1, 2)
+        matrix.add(2, 1)
+
+        matrix.remove(1, 2)
+        assert matrix.has(1, 2)
+        matrix.remove(1, 2)
+        assert not matrix.has(1, 2)
+
+    def test_partners_and_counts(self):
+        """Test row iteration and masked popcounts"""
+        matrix = PairMatrix()
+        for pair in [(1, 2), (1, 3), (1, 4), (2, 3)]:
+            matrix.add(*pair)
+
+        assert sorted(matrix.partners(1)) == [2, 3, 4]
+        assert list(matrix.partners(99)) == []
+        assert matrix.count_among(1, matrix.mask({2, 3})) == 2
+        assert matrix.count_among(4, matrix.mask({2, 3})) == 0
+        assert sorted(matrix.pairs()) == [(1, 2), (1, 3), (1, 4), (2, 3)]
+
+    def test_set_view(self):
+        """Test that the view behaves like the set of frozenset pairs it replaces"""
+        matrix = PairMatrix()
+        matrix.add(1, 2)
+        played = PairSet(matrix)
+
+        assert frozenset([2, 1]) in played
+        assert frozenset([1, 3]) not in played
+        assert len(played) == 1
+        assert {frozenset([1, 2]), frozenset([1, 3])} - played == {frozenset([1, 3])}
+
+    def test_memory_for_2000_teams(self):
+        """Benchmark: rows stay a few hundred KB for 2,000 teams, however many games are played"""
+        team_count = 2000
+        matrix = PairMatrix()
+        # Pairing every team with the last-indexed one makes every row as wide as a full round robin's
+        for team_id in range(1, team_count):
+            matrix.add(team_id, team_id + 1)
+        for team_id in range(1, team_count - 1):
+            matrix.add(team_id, team_count)
+
+        size = sum(sys.getsizeof(row) for row in matrix.rows)
+        print(f'\n{team_count} teams: {size / 1024:.0f} KB of rows')
+        assert size < 600 * 1024
+
+
+class TestMatchupStateLatestGames:
+    """Test suite for the latest game of each pair kept by the matchup state"""
+
+    def test_status_follows_the_game(self):
+        """Test that a game moving from in progress to completed keeps its pair entry"""
+        state = MatchupState()
+        state._apply_game(1, 2, 'in_progress', 1, 10)
+        assert state.pair_status(2, 1) == (10, 'in_progress')
+        assert state.in_progress.has(1, 2)
+
+        state._apply_game(1, 2, 'in_progress', -1, 10)
+        state._apply_game(1, 2, 'completed', 1, 10)
+        assert state._settle_latest_games()
+
+        assert state.pair_status(1, 2) == (10, 'completed')
+        assert state.played.has(1, 2) and not state.in_progress.has(1, 2)
+
+    def test_untracked_game_drops_the_pair(self):
+        """Test that a deleted game leaves the pair unplayed"""
+        state = MatchupState()
+        state._apply_game(1, 2, 'in_progress', 1, 10)
+        state._apply_game(1, 2, 'in_progress', -1, 10)
+
+        assert state._settle_latest_games()
+        assert state.pair_status(1, 2) is None
+
+    def test_unknown_older_game_forces_a_rebuild(self):
+        """Test that losing the latest of two games between a pair cannot be resolved by delta"""
+        state = MatchupState()
+        state._apply_game(1, 2, 'completed', 1, 10)
+        state._apply_game(1, 2, 'in_progress', 1, 11)
+        state._apply_game(1, 2, 'in_progress', -1, 11)
+
+        assert not state._settle_latest_games()
+
+    def test_delta_rebuild_agrees_with_load(self, client, db, sample_teams):
+        """Test that the state after API writes equals one rebuilt from the database"""
+        ids = [team.id for team in sample_teams]
+        client.post('/api/games/generate-round')
+        games = client.get('/api/games/current').get_json()['games']
+        client.post('/api/results', json={'game_id': games[0]['id'], 'winning_team_id': games[0]['team1']['id'], 'score': 2})
+        client.post('/api/games', json={'team1_id': ids[0], 'team2_id': ids[3]})
+
+        from services.matchup_state import get_matchup_state
+        state = get_matchup_state(db.session)
+        rebuilt = MatchupState()
+        rebuilt.load(db.session, state.version)
+
+        assert state.latest_games == rebuilt.latest_games
+        assert set(state.played.pairs()) == set(rebuilt.played.pairs())
+        assert set(state.in_progress.pairs()) == set(rebuilt.in_progress.pairs())
@@ -0,0 +1,159 @@
+"""Tests for the Monte-Carlo projection of final standings"""
+import pytest
+import json
+import threading
+import time
+import numpy as np
+import services.projection as projection_module
+from services.projection import simulate_standings, win_probabilities
+
+
+class TestWinProbabilities:
+    """Test suite for per-game win probabilities"""
+
+    def test_equal_records_are_even(self):
+        """Test that teams with the same record are a coin flip"""
+        p = win_probabilities(np.array([3, 3]), np.array([5, 5]), np.array([0]), np.array([1]))
+        assert p[0] == pytest.approx(0.5)
+
+    def test_complementary(self):
+        """Test that P(a beats b) + P(b beats a) = 1 and the better record is favoured"""
+        wins, played = np.array([4, 1]), np.array([5, 5])
+        forward = win_probabilities(wins, played, np.array([0]), np.array([1]))[0]
+        backward = win_probabilities(wins, played, np.array([1]), np.array([0]))[0]
+        assert forward + backward == pytest.approx(1)
+        assert 0.5 < forward < 1
+
+
+class TestSimulateStandings:
+    """Test suite for the vectorized simulation"""
+
+    def test_probabilities_form_a_doubly_stochastic_matrix(self):
+        """Test that every team gets exactly one rank and every rank exactly one team per run"""
+        team_ids = [1, 2, 3, 4]
+        remaining = [(1, 2), (1, 3), (2, 4), (3, 4)]
+        probabilities = simulate_standings(team_ids, [1, 1, 1, 1], [1, 0, 1, 0], [5, 0, 3, 0], remaining, [1, 2, 3], 2000, seed=1)
+
+        assert probabilities.shape == (4, 4)
+        assert probabilities.sum(axis=1) == pytest.approx(np.ones(4))
+        assert probabilities.sum(axis=0) == pytest.approx(np.ones(4))
+
+    def test_finished_tournament_is_certain(self):
+        """Test that with no games left the current ranking is the only outcome"""
+        probabilities = simulate_standings([1, 2, 3], [2, 2, 2], [1, 2, 0], [4, 9, 0], [], [4, 5], 100, seed=1)
+
+        assert probabilities.tolist() == [[0, 1, 0], [1, 0, 0], [0, 0, 1]]
+
+    def test_ties_keep_team_order(self):
+        """Test that level teams are ranked like RankingService, in team order"""
+        probabilities = simulate_standings([1, 2], [0, 0], [0, 0], [0, 0], [], [], 10, seed=1)
+
+        assert probabilities.tolist() == [[1, 0], [0, 1]]
+
+    def test_batches_match_a_single_pass(self, monkeypatch):
+        """Test that splitting runs into batches draws the same runs"""
+        args = ([1, 2, 3], [0, 0, 0], [0, 0, 0], [0, 0, 0], [(1, 2), (1, 3), (2, 3)], [1, 5], 500)
+        single = simulate_standings(*args, seed=7)
+
+        monkeypatch.setattr(projection_module, 'BATCH_CELLS', 30)
+        batched = simulate_standings(*args, seed=7)
+
+        assert batched.sum(axis=1) == pytest.approx(np.ones(3))
+        assert np.abs(batched - single).max() < 0.15
+
+    def test_strong_record_leads(self):
+        """Test that a team far ahead is most likely to finish first"""
+        team_ids = list(range(1, 7))
+        remaining = [(a, b) for a in team_ids for b in team_ids if a < b and b - a > 1]
+        probabilities = simulate_standings(team_ids, [1] * 6, [1, 0, 1, 0, 1, 0], [40, 0, 2, 0, 1, 0], remaining, [1, 2, 3], 5000, seed=3)
+
+        assert probabilities[0].argmax() == 0
+        assert probabilities[0, 0] > 0.9
+
+    @pytest.mark.timing
+    def test_10k_runs_benchmark(self):
+        """Benchmark: 10,000 runs of a 40-team round robin with every game left"""
+        team_ids = list(range(1, 41))
+        remaining = [(a, b) for a in team_ids for b in team_ids if a < b]
+
+        started = time.perf_counter()
+        probabilities = simulate_standings(team_ids, [0] * 40, [0] * 40, [0] * 40, remaining, list(range(10)), 10_000, seed=1)
+        elapsed = time.perf_counter() - started
+
+        print(f'\n10,000 runs x {len(remaining)} games in {elapsed:.2f} s')
+        assert probabilities.sum(axis=1) == pytest.approx(np.ones(40))
+        assert elapsed < 5.0
+
+
+class TestProjectionRoute:
+    """Test suite for GET /api/rankings/projection"""
+
+    @pytest.fixture(autouse=True)
+    def seeded(self, app):
+        app.config['PROJECTION_SEED'] = 1
+        app.config['PROJECTION_WAIT'] = 30
+
+    def test_projection(self, client, db, make_tournament):
+        """Test the per-team rank probabilities"""
+        make_tournament(5)
+
+        response = client.get('/api/rankings/projection?runs=500')
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['runs'] == 500
+        # 10 pairs among 5 teams, 4 already played
+        assert data['remaining_games'] == 6
+        assert len(data['teams']) == 5
+        for team in data['teams']:
+            assert len(team['rank_probabilities']) == 5
+            assert sum(team['rank_probabilities']) == pytest.approx(1, abs=1e-3)
+        expected = [team['expected_rank'] for team in data['teams']]
+        assert expected == sorted(expected)
+
+    def test_cached_until_next_result(self, app, client, db, sample_game):
+        """Test that the simulation reruns only when a result changes the standings"""
+        worker = app.extensions['projection']
+        client.get('/api/rankings/projection?runs=100')
+        first = worker.future
+
+        client.post(f'/api/games/{sample_game.id}/start')
+        client.get('/api/rankings/projection?runs=100')
+        assert worker.future is first
+
+        client.post('/api/results', json={'game_id': sample_game.id, 'winning_team_id': sample_game.team1_id, 'score': 5})
+        client.get('/api/rankings/projection?runs=100')
+        assert worker.future is not first
+
+    def test_pending_while_simulating(self, app, client, db, sample_teams, monkeypatch):
+        """Test that a request answers 202 instead of blocking on a running simulation"""
+        release = threading.Event()
+        simulate = projection_module.simulate_standings
+
+        def slow_simulation(*args, **kwargs):
+            release.wait(5)
+            return simulate(*args, **kwargs)
+
+        monkeypatch.setattr(projection_module, 'simulate_standings', slow_simulation)
+        app.config['PROJECTION_WAIT'] = 0
+
+        response = client.get('/api/rankings/projection?runs=100')
+        assert response.status_code == 202
+        assert response.headers['Retry-After'] == '1'
+
+        release.set()
+        app.extensions['projection'].future.result(timeout=5)
+        response = client.get('/api/rankings/projection?runs=100')
+        assert response.status_code == 200
+
+    def test_invalid_runs(self, client, db):
+        """Test that runs must be a bounded positive integer"""
+        assert client.get('/api/rankings/projection?runs=0').status_code == 400
+        assert client.get('/api/rankings/projection?runs=abc').status_code == 400
+        assert client.get('/api/rankings/projection?runs=1000000').status_code == 400
+
+    def test_no_teams(self, client, db):
+        """Test the projection of an empty tournament"""
+        data = json.loads(client.get('/api/rankings/projection').data)
+
+        assert data['teams'] == [] and data['remaining_games'] == 0
@@ -0,0 +1,111 @@
+"""Tests for per-result rank snapshots and the rank history endpoint"""
+import pytest
+import json
+from models.rank_snapshot import RankSnapshot
+from services.ranking_service import RankingService
+
+
+def play(client, team1_id, team2_id, winner_id, score):
+    """Create, start and finish a game through the API"""
+    game = client.post('/api/games', json={'team1_id': team1_id, 'team2_id': team2_id}).get_json()
+    client.post(f"/api/games/{game['id']}/start")
+    response = client.post('/api/results', json={'game_id': game['id'], 'winning_team_id': winner_id, 'score': score})
+    assert response.status_code == 201
+    return response.get_json()
+
+
+def history(client):
+    response = client.get('/api/rankings/history')
+    assert response.status_code == 200
+    return json.loads(response.data)
+
+
+class TestRankSnapshots:
+    """Test suite for snapshots written with each result"""
+
+    def test_first_result_stores_every_ranked_team(self, client, db, sample_teams):
+        """Test that the first snapshot holds the whole table"""
+        result = play(client, sample_teams[0].id, sample_teams[1].id, sample_teams[1].id, 5)
+
+        snapshot = RankSnapshot.query.one()
+        assert snapshot.result_id == result['id']
+        assert sorted(snapshot.team_ids) == [team.id for team in sample_teams]
+
+    def test_only_moved_teams_are_stored(self, client, db, sample_teams):
+        """Test that later snapshots hold only teams whose rank or score changed"""
+        play(client, sample_teams[0].id, sample_teams[1].id, sample_teams[0].id, 5)
+        play(client, sample_teams[2].id, sample_teams[3].id, sample_teams[3].id, 1)
+
+        latest = RankSnapshot.query.order_by(RankSnapshot.id.desc()).first()
+        # Team 4 climbs from 4th to 2nd and gains a point, teams 2 and 3 drop one place
+        stored = dict(zip(latest.team_ids, latest.ranks))
+        assert stored == {sample_teams[3].id: 2, sample_teams[1].id: 3, sample_teams[2].id: 4}
+
+    def test_rejected_result_stores_nothing(self, client, db, sample_game):
+        """Test that snapshots share the result's transaction"""
+        client.post('/api/results', json={'game_id': sample_game.id, 'winning_team_id': sample_game.team1_id, 'score': 5})
+        assert RankSnapshot.query.count() == 0
+
+    def test_storage_grows_with_movement(self, client, db, make_tournament):
+        """Test that a settled table writes far fewer entries than teams times results"""
+        teams, _ = make_tournament(40)
+        result_count = 0
+        for i in range(0, 38, 2):
+            play(client, teams[i].id, teams[i + 2].id, teams[i].id, 0)
+            result_count += 1
+
+        first, *rest = RankSnapshot.query.order_by(RankSnapshot.id).all()
+        assert len(first.team_ids) == 40
+        assert sum(len(snapshot.team_ids) for snapshot in rest) < 40 * (result_count - 1) / 4
+
+
+class TestRankHistoryRoute:
+    """Test suite for GET /api/rankings/history"""
+
+    def test_empty_history(self, client, db, sample_teams):
+        """Test the history before any result"""
+        data = history(client)
+
+        assert data['team_ids'] == [] and data['result_ids'] == [] and data['ranks'] == []
+
+    def test_series_match_rankings_after_each_result(self, client, db, sample_teams):
+        """Test that folded columns reproduce the rankings after every result"""
+        ids = [team.id for team in sample_teams]
+        expected = []
+        for team1, team2, winner, score in [(0, 1, 1, 3), (2, 3, 2, 6), (0, 2, 0, 9), (1, 3, 3, 1)]:
+            play(client, ids[team1], ids[team2], ids[winner], score)
+            expected.append({r['team_id']: (r['rank'], r['total_score']) for r in RankingService(db).get_rankings()})
+
+        data = history(client)
+
+        assert data['team_ids'] == ids
+        assert data['team_names'] == [team.name for team in sample_teams]
+        assert len(data['result_ids']) == len(data['timestamps']) == 4
+        for step, rankings in enumerate(expected):
+            for column, team_id in enumerate(data['team_ids']):
+                assert (data['ranks'][column][step], data['scores'][column][step]) == rankings[team_id]
+
+    def test_movement(self, client, db, sample_teams):
+        """Test the places gained or lost with the latest result"""
+        ids = [team.id for team in sample_teams]
+        play(client, ids[0], ids[1], ids[0], 5)
+        play(client, ids[2], ids[3], ids[3], 9)
+
+        data = history(client)
+        movement = dict(zip(data['team_ids'], data['movement']))
+
+        assert movement == {ids[0]: -1, ids[1]: -1, ids[2]: -1, ids[3]: 3}
+
+    def test_clear_resets_history(self, client, db, sample_teams):
+        """Test that clearing the database starts a new history"""
+        ids = [team.id for team in sample_teams]
+        play(client, ids[0], ids[1], ids[0], 5)
+        client.post('/api/admin/clear-database')
+
+        team_ids = [team['id'] for team in client.post('/api/teams', json={'players': ['A', 'B', 'C', 'D']}).get_json()['teams']]
+        play(client, min(team_ids), max(team_ids), min(team_ids), 2)
+
+        data = history(client)
+        assert data['team_ids'] == sorted(team_ids)
+        assert len(data['result_ids']) == 1
+        assert RankSnapshot.query.count() == 1
@@ -1,6 +1,8 @@
 """Tests for RankingService"""
 import pytest
-from services.ranking_service import RankingService
+from datetime import datetime, timedelta
+from app import create_app
+from services.ranking_service import RankingService, ResultMatrix
 from models.team import Team
 from models.game import Game
 from models.result import Result
@@ -336,3 +338,331 @@ class TestRankingService:
         assert team0_ranking['games_won'] == 1
         assert team0_ranking['total_score'] == 0
         assert team0_ranking['win_rate'] == 1.0
+
+
+class TestRankingServiceQueryCount:
+    """Benchmark: the number of queries must not grow with the number of teams"""
+
+    @pytest.mark.parametrize('team_count', [5, 20, 100])
+    def test_query_count_is_constant(self, app, db, query_counter, make_tournament, team_count):
+        """Test that rankings use a single query whatever the team count"""
+        make_tournament(team_count)
+        query_counter.clear()
+
+        rankings = RankingService(db).get_rankings()
+
+        assert len(rankings) == team_count
+        assert len(query_counter) == 1
+
+    def test_aggregates_match_per_team_counts(self, app, db, make_tournament):
+        """Test that grouped aggregates agree with a naive per-team computation"""
+        make_tournament(10)
+
+        rankings = RankingService(db).get_rankings()
+
+        for ranking in rankings:
+            team_id = ranking['team_id']
+            played = Game.query.filter(
+                ((Game.team1_id == team_id) | (Game.team2_id == team_id)) &
+                (Game.status == 'completed')
+            ).count()
+            won = Result.query.filter_by(winning_team_id=team_id).all()
+
+            assert ranking['games_played'] == played
+            assert ranking['games_won'] == len(won)
+            assert ranking['games_lost'] == played - len(won)
+            assert ranking['total_score'] == sum(r.score for r in won)
+
+
+class TestPointInTimeRankings:
+    """Test suite for standings as of a time or a number of completed games"""
+
+    def build_timed_tournament(self, db, game_count, start=datetime(2024, 1, 1)):
+        """Teams created at start; game i completes (team i beats team i+1) at start + i + 1 minutes"""
+        teams = [
+            Team(name=f'Team {i + 1}', player1=f'A{i}', player2=f'B{i}', created_at=start)
+            for i in range(game_count + 1)
+        ]
+        db.session.add_all(teams)
+        db.session.commit()
+
+        finished = [start + timedelta(minutes=i + 1) for i in range(game_count)]
+        games = [
+            Game(team1_id=teams[i].id, team2_id=teams[i + 1].id, status='completed', completed_at=finished[i])
+            for i in range(game_count)
+        ]
+        db.session.add_all(games)
+        db.session.flush()
+        db.session.add_all([
+            Result(game_id=game.id, winning_team_id=game.team1_id, score=i + 1, created_at=finished[i])
+            for i, game in enumerate(games)
+        ])
+        db.session.commit()
+        return teams
+
+    def test_after_all_games_matches_current(self, app, db):
+        """Test that rewinding to the latest game gives the current standings"""
+        self.build_timed_tournament(db, 40)
+        service = RankingService(db)
+
+        assert service.get_rankings(after_game=40) == service.get_rankings()
+
+    def test_after_game(self, app, db):
+        """Test standings after the first games only"""
+        teams = self.build_timed_tournament(db, 5)
+
+        rankings = {r['team_id']: r for r in RankingService(db).get_rankings(after_game=2)}
+
+        assert rankings[teams[0].id]['games_won'] == 1
+        assert rankings[teams[1].id]['games_played'] == 2
+        assert rankings[teams[1].id]['total_score'] == 2
+        assert rankings[teams[3].id]['games_played'] == 0
+
+    def test_after_game_zero(self, app, db):
+        """Test that no completed games gives empty standings for every team"""
+        self.build_timed_tournament(db, 3)
+
+        rankings = RankingService(db).get_rankings(after_game=0)
+
+        assert len(rankings) == 4
+        assert all(r['games_played'] == 0 for r in rankings)
+
+    def test_after_game_beyond_completed(self, app, db):
+        """Test that a game number that has not happened is rejected"""
+        self.build_timed_tournament(db, 3)
+
+        with pytest.raises(ValueError):
+            RankingService(db).get_rankings(after_game=4)
+
+    def test_as_of(self, app, db):
+        """Test that as_of counts games completed at or before the timestamp"""
+        teams = self.build_timed_tournament(db, 5)
+
+        rankings = {r['team_id']: r for r in RankingService(db).get_rankings(as_of=datetime(2024, 1, 1, 0, 3))}
+
+        assert rankings[teams[2].id]['games_won'] == 1
+        assert rankings[teams[3].id]['games_played'] == 1
+        assert rankings[teams[4].id]['games_played'] == 0
+
+    def test_as_of_excludes_later_teams(self, app, db):
+        """Test that teams created after the timestamp are left out"""
+        self.build_timed_tournament(db, 2)
+        db.session.add(Team(name='Late', player1='X', player2='Y', created_at=datetime(2024, 2, 1)))
+        db.session.commit()
+
+        rankings = RankingService(db).get_rankings(as_of=datetime(2024, 1, 15))
+
+        assert 'Late' not in [r['team_name'] for r in rankings]
+
+    @pytest.mark.parametrize('after_game', [0, 31, 32, 33, 100, 499, 500])
+    def test_checkpoints_match_full_recomputation(self, app, db, after_game):
+        """Test that checkpoint-based rewinds agree with aggregating only the first games"""
+        self.build_timed_tournament(db, 500)
+        service = RankingService(db)
+
+        expected = {}
+        for game in Game.query.order_by(Game.completed_at).limit(after_game):
+            for team_id in (game.team1_id, game.team2_id):
+                expected.setdefault(team_id, [0, 0, 0])[0] += 1
+            expected.setdefault(game.result.winning_team_id, [0, 0, 0])[1] += 1
+            expected[game.result.winning_team_id][2] += game.result.score
+
+        for ranking in service.get_rankings(after_game=after_game):
+            played, won, score = expected.get(ranking['team_id'], [0, 0, 0])
+            assert (ranking['games_played'], ranking['games_won'], ranking['total_score']) == (played, won, score)
+
+    def test_rewind_uses_cached_timeline(self, app, db, query_counter):
+        """Benchmark: rewinding a 500-game tournament reads only teams once the timeline is cached"""
+        self.build_timed_tournament(db, 500)
+        service = RankingService(db)
+        service.get_rankings(after_game=1)
+        query_counter.clear()
+
+        for after_game in range(0, 501, 50):
+            service.get_rankings(after_game=after_game)
+
+        # One team query and one version check per call, no game or result reads
+        assert len(query_counter) == 2 * 11
+        assert not any('results' in statement for statement in query_counter)
+
+    @pytest.fixture
+    def loads(self, app, monkeypatch):
+        """Count full timeline reloads"""
+        timeline = app.extensions['ranking_timeline']
+        calls = []
+        load = timeline.load
+
+        def counting_load(session, version):
+            calls.append(version)
+            return load(session, version)
+
+        monkeypatch.setattr(timeline, 'load', counting_load)
+        return calls
+
+    def complete_game(self, db, team1, team2, finished, score=5):
+        game = Game(team1_id=team1.id, team2_id=team2.id, status='completed', completed_at=finished)
+        db.session.add(game)
+        db.session.flush()
+        result = Result(game_id=game.id, winning_team_id=team1.id, score=score, created_at=finished)
+        db.session.add(result)
+        db.session.commit()
+        return result
+
+    def test_new_games_extend_the_timeline(self, app, db, loads):
+        """Test that games completed later are appended without reloading every game"""
+        teams = self.build_timed_tournament(db, 40)
+        service = RankingService(db)
+        service.get_rankings(after_game=40)
+
+        self.complete_game(db, teams[0], teams[2], datetime(2024, 1, 2), score=7)
+        teams[5].name = 'Renamed'
+        db.session.commit()
+        rankings = {r['team_id']: r for r in service.get_rankings(after_game=41)}
+
+        assert len(loads) == 1
+        assert rankings[teams[0].id]['games_won'] == 2
+        assert rankings[teams[0].id]['total_score'] == 8
+        assert service.get_rankings(after_game=41) == service.get_rankings()
+
+    def test_checkpoints_are_extended(self, app, db, loads):
+        """Test that appended games fill in the next checkpoint like a full load would"""
+        from services.ranking_timeline import RankingTimeline
+
+        teams = self.build_timed_tournament(db, 30)
+        service = RankingService(db)
+        service.get_rankings(after_game=0)
+        for i in range(5):
+            self.complete_game(db, teams[i], teams[i + 2], datetime(2024, 1, 2, 0, i))
+            service.get_rankings(after_game=0)
+
+        extended = app.extensions['ranking_timeline']
+        reloaded = RankingTimeline()
+        reloaded.load(db.session, extended.version)
+        assert len(loads) == 1
+        assert extended.steps == reloaded.steps
+        assert extended.checkpoints == reloaded.checkpoints
+
+    @pytest.mark.parametrize('edit', ['delete_result', 'edit_score', 'backdated_game', 'reopen_game'])
+    def test_history_edits_reload(self, app, db, loads, edit):
+        """Test that edits to games already in the timeline, or games out of order, reload it"""
+        teams = self.build_timed_tournament(db, 5)
+        service = RankingService(db)
+        service.get_rankings(after_game=5)
+        result = Result.query.order_by(Result.id).first()
+
+        if edit == 'delete_result':
+            db.session.delete(result)
+            db.session.commit()
+        elif edit == 'edit_score':
+            result.score = 50
+            db.session.commit()
+        elif edit == 'backdated_game':
+            self.complete_game(db, teams[0], teams[3], datetime(2023, 12, 31))
+        else:
+            db.session.delete(result)
+            result.game.status = 'in_progress'
+            db.session.commit()
+
+        completed = Game.query.filter_by(status='completed').count()
+        assert service.get_rankings(after_game=completed) == service.get_rankings()
+        assert len(loads) == 2
+
+
+class TestTieBreakers:
+    """Test suite for head-to-head, Buchholz and points differential tie-breakers"""
+
+    @staticmethod
+    def build_tied_tournament(db, sample_teams):
+        """
+        A beats B 3, C beats A 1, B beats D 3, D beats C 1: A and B end on (3, 0.5),
+        C and D on (1, 0.5). A and D won their head-to-head, every Buchholz is 4.
+        """
+        a, b, c, d = [team.id for team in sample_teams]
+        for winner, loser, score in [(a, b, 3), (c, a, 1), (b, d, 3), (d, c, 1)]:
+            game = Game(team1_id=min(winner, loser), team2_id=max(winner, loser), status='completed')
+            db.session.add(game)
+            db.session.flush()
+            db.session.add(Result(game_id=game.id, winning_team_id=winner, score=score))
+        db.session.commit()
+        return a, b, c, d
+
+    def test_without_tie_breakers_ties_keep_team_order(self, app, db, sample_teams):
+        """Test that the default ordering is unchanged"""
+        a, b, c, d = self.build_tied_tournament(db, sample_teams)
+
+        rankings = RankingService(db).get_rankings()
+
+        assert [r['team_id'] for r in rankings] == [a, b, c, d]
+        assert 'tie_breakers' not in rankings[0]
+
+    def test_head_to_head(self, app, db, sample_teams):
+        """Test that the winner of the game between tied teams ranks first"""
+        a, b, c, d = self.build_tied_tournament(db, sample_teams)
+
+        rankings = RankingService(db).get_rankings(tie_breakers=['head_to_head'])
+
+        assert [r['team_id'] for r in rankings] == [a, b, d, c]
+        assert [r['rank'] for r in rankings] == [1, 2, 3, 4]
+        assert [r['tie_breakers']['head_to_head'] for r in rankings] == [1, 0, 1, 0]
+
+    def test_later_tie_breakers_apply_only_to_remaining_ties(self, app, db, sample_teams):
+        """Test that an even Buchholz defers to points differential"""
+        a, b, c, d = self.build_tied_tournament(db, sample_teams)
+
+        rankings = RankingService(db).get_rankings(tie_breakers=['buchholz', 'points_differential'])
+
+        assert [r['team_id'] for r in rankings] == [a, b, c, d]
+        assert [r['tie_breakers'] for r in rankings] == [
+            {'buchholz': 4, 'points_differential': 2},
+            {'buchholz': 4, 'points_differential': 0},
+            {'buchholz': 4, 'points_differential': 0},
+            {'buchholz': 4, 'points_differential': -2},
+        ]
+
+    def test_configured_default(self, app, db, sample_teams):
+        """Test that RANKING_TIE_BREAKERS applies when none are passed"""
+        a, b, c, d = self.build_tied_tournament(db, sample_teams)
+        app.config['RANKING_TIE_BREAKERS'] = ['head_to_head']
+
+        assert [r['team_id'] for r in RankingService(db).get_rankings()] == [a, b, d, c]
+        assert [r['team_id'] for r in RankingService(db).get_rankings(tie_breakers=[])] == [a, b, c, d]
+
+    def test_unknown_configured_tie_breaker_rejected(self):
+        """Test that a typo in RANKING_TIE_BREAKERS fails at startup"""
+        from tests.conftest import TestConfig
+
+        class TypoConfig(TestConfig):
+            RANKING_TIE_BREAKERS = ['head_to_head', 'buchholtz']
+
+        with pytest.raises(ValueError, match='tie_breakers must be distinct'):
+            create_app(TypoConfig)
+
+    def test_point_in_time(self, app, db, sample_teams):
+        """Test that tie-breakers only see the games completed by then"""
+        a, b, c, d = self.build_tied_tournament(db, sample_teams)
+
+        rankings = RankingService(db).get_rankings(after_game=2, tie_breakers=['points_differential'])
+
+        differential = {r['team_id']: r['tie_breakers']['points_differential'] for r in rankings}
+        assert differential == {a: 2, b: -3, c: 1, d: 0}
+
+    def test_result_matrix(self):
+        """Test the dense tallies, skipping unknown teams and undecided games"""
+        matrix = ResultMatrix([1, 2, 3], [(1, 2, 2, 4), (1, 3, 1, 2), (2, 3, None, None), (1, 9, 1, 5)])
+
+        assert matrix.played.tolist() == [[0, 1, 1], [1, 0, 1], [1, 1, 0]]
+        assert matrix.wins.tolist() == [[0, 0, 1], [1, 0, 0], [0, 0, 0]]
+        assert matrix.head_to_head([1, 2]) == [0, 1]
+        assert matrix.buchholz([2, 4, 0]) == [4, 2, 6]
+        assert matrix.points_differential() == [-2, 4, -2]
+
+    @pytest.mark.parametrize('team_count', [8, 64, 256])
+    def test_query_count_does_not_grow_with_teams(self, app, db, make_tournament, query_counter, team_count):
+        """Benchmark: resolving every tie-breaker costs the same queries for 8 or 256 teams"""
+        make_tournament(team_count)
+        query_counter.clear()
+
+        RankingService(db).get_rankings(tie_breakers=['head_to_head', 'buchholz', 'points_differential'])
+
+        # The stored standings and one result matrix query
+        assert len(query_counter) == 2
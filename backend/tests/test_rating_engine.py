@@ -0,0 +1,261 @@
+"""Tests for the Elo and Glicko-2 rating engines and their cache"""
+import pytest
+import gc
+import json
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from models.team import Team
+from models.game import Game
+from models.result import Result
+from services.rating_engine import EloEngine, Glicko2Engine, RatingCache, RatingEngine
+from services.tournament_version import bump_version
+
+
+def add_results(db, teams, pairs, start=datetime(2024, 1, 1)):
+    """Insert completed games and results for (winner, loser) index pairs, one minute apart"""
+    for i, (winner, loser) in enumerate(pairs):
+        team1, team2 = sorted((teams[winner].id, teams[loser].id))
+        game = Game(team1_id=team1, team2_id=team2, status='completed')
+        db.session.add(game)
+        db.session.flush()
+        db.session.add(Result(game_id=game.id, winning_team_id=teams[winner].id, score=1,
+                              created_at=start + timedelta(minutes=i)))
+    db.session.commit()
+
+
+class TestEloEngine:
+    """Test suite for Elo updates"""
+
+    def test_equal_ratings_move_by_half_k(self):
+        """Test that an even game moves both ratings by K/2"""
+        winner, loser = EloEngine().update(1500.0, 1500.0)
+        assert (winner, loser) == (1516.0, 1484.0)
+
+    def test_upset_moves_more(self):
+        """Test that beating a stronger team gains more than beating a weaker one"""
+        engine = EloEngine()
+        upset, _ = engine.update(1400.0, 1600.0)
+        expected_win, _ = engine.update(1600.0, 1400.0)
+        assert upset - 1400 > expected_win - 1600
+
+    def test_zero_sum(self):
+        """Test that points gained equal points lost"""
+        winner, loser = EloEngine().update(1532.0, 1471.0)
+        assert winner + loser == pytest.approx(1532.0 + 1471.0)
+
+
+class TestGlicko2Engine:
+    """Test suite for Glicko-2 updates"""
+
+    def test_volatility_matches_glickman_example(self):
+        """Test the volatility iteration against the worked example of the Glicko-2 paper"""
+        sigma = Glicko2Engine()._volatility(phi=1.1513, sigma=0.06, delta=-0.4834, variance=1.7785)
+        assert sigma == pytest.approx(0.05999, abs=1e-5)
+
+    def test_win_raises_rating_and_lowers_deviation(self):
+        """Test that a game raises the winner, lowers the loser and narrows both deviations"""
+        engine = Glicko2Engine()
+        winner, loser = engine.update(engine.initial(), engine.initial())
+
+        winner, loser, initial = engine.to_dict(winner), engine.to_dict(loser), engine.to_dict(engine.initial())
+        assert winner['rating'] > 1500 > loser['rating']
+        assert winner['rating'] - 1500 == pytest.approx(1500 - loser['rating'], abs=0.1)
+        assert winner['rating_deviation'] < initial['rating_deviation']
+
+    def test_vectorized_replay_matches_one_game_at_a_time(self):
+        """Test that rating games in waves gives the ratings and checkpoints of sequential updates"""
+        engine = Glicko2Engine()
+        games = [(i % 20 + 1, (i * 7 + 3) % 20 + 1) for i in range(600)]
+        games = [game for game in games if game[0] != game[1]]
+        start = {1: (0.3, 0.9, 0.06)}
+
+        vectorized, sequential = dict(start), dict(start)
+        checkpoints = engine.replay(vectorized, games, 100)
+        expected = RatingEngine.replay(engine, sequential, games, 100)
+
+        assert len(checkpoints) == len(expected) == 6
+        for ratings, expected_ratings in zip([*checkpoints, vectorized], [*expected, sequential]):
+            assert ratings.keys() == expected_ratings.keys()
+            for team_id, rating in ratings.items():
+                assert rating == pytest.approx(expected_ratings[team_id], rel=1e-9)
+
+
+class TestRatingEngine:
+    """Test suite for the engine interface"""
+
+    def test_engine_must_implement_every_method(self):
+        """Test that an engine missing part of the interface cannot be created"""
+        class Incomplete(RatingEngine):
+            def initial(self):
+                return 0
+
+        with pytest.raises(TypeError):
+            Incomplete()
+
+
+class TestRatingCache:
+    """Test suite for the incremental rating cache"""
+
+    @staticmethod
+    def count_loads(cache, monkeypatch):
+        """Count full history reloads of a cache"""
+        calls = []
+        load = cache.load
+
+        def counting_load(session, version):
+            calls.append(version)
+            return load(session, version)
+
+        monkeypatch.setattr(cache, 'load', counting_load)
+        return calls
+
+    def test_matches_full_chronological_pass(self, app, db, sample_teams):
+        """Test that cached ratings equal one pass over the results in time order"""
+        add_results(db, sample_teams, [(0, 1), (2, 3), (1, 2), (3, 0)])
+
+        cache = RatingCache(EloEngine()).sync(db.session)
+
+        engine, ratings = EloEngine(), {}
+        for winner, loser in [(0, 1), (2, 3), (1, 2), (3, 0)]:
+            winner_id, loser_id = sample_teams[winner].id, sample_teams[loser].id
+            ratings[winner_id], ratings[loser_id] = engine.update(ratings.get(winner_id, 1500.0), ratings.get(loser_id, 1500.0))
+        assert cache.ratings == ratings
+
+    def test_new_result_replays_one_update(self, app, db, sample_teams, monkeypatch):
+        """Test that a result appended to the history is applied on its own, without reloading the history"""
+        add_results(db, sample_teams, [(0, 1), (2, 3)])
+        cache = RatingCache(EloEngine()).sync(db.session)
+        loads = self.count_loads(cache, monkeypatch)
+
+        add_results(db, sample_teams, [(1, 3)], start=datetime(2024, 2, 1))
+        cache.sync(db.session)
+
+        assert cache.replayed == 1
+        assert loads == []
+        assert cache.ratings == RatingCache(EloEngine()).sync(db.session).ratings
+
+    def test_unrelated_write_replays_nothing(self, app, db, sample_teams):
+        """Test that a version change without new results costs no updates"""
+        add_results(db, sample_teams, [(0, 1)])
+        cache = RatingCache(EloEngine()).sync(db.session)
+
+        db.session.add(Team(name='Team 5', player1='I', player2='J'))
+        db.session.commit()
+        cache.sync(db.session)
+
+        assert cache.replayed == 0
+
+    def test_backdated_result_replays_whole_history(self, app, db, make_tournament, monkeypatch):
+        """Test that a result moved to the start of the history replays everything after it"""
+        make_tournament(600)
+        cache = RatingCache(EloEngine()).sync(db.session)
+        loads = self.count_loads(cache, monkeypatch)
+
+        # The last of the 599 results becomes the first one
+        last = Result.query.order_by(Result.id.desc()).first()
+        last.created_at = datetime(2000, 1, 1)
+        db.session.commit()
+        cache.sync(db.session)
+
+        assert cache.replayed == 599
+        assert len(loads) == 1
+        assert cache.ratings == RatingCache(EloEngine()).sync(db.session).ratings
+
+    def test_late_change_replays_less_than_a_checkpoint_interval(self, app, db, make_tournament):
+        """Test that changing a recent result leaves earlier checkpoints untouched"""
+        make_tournament(600)
+        cache = RatingCache(EloEngine()).sync(db.session)
+
+        result = Result.query.order_by(Result.created_at.desc(), Result.id.desc()).first()
+        game = result.game
+        result.winning_team_id = game.team2_id
+        db.session.commit()
+        cache.sync(db.session)
+
+        assert cache.replayed <= 256
+        assert cache.ratings == RatingCache(EloEngine()).sync(db.session).ratings
+
+    @pytest.mark.timing
+    @pytest.mark.parametrize('engine', [EloEngine, Glicko2Engine])
+    def test_full_recompute_10k_results_benchmark(self, app, db, engine):
+        """Benchmark: a full pass over 10,000 results takes under 100 ms with either engine"""
+        team_count = 200
+        db.session.execute(insert(Team), [
+            {'id': i, 'name': f'Team {i}', 'player1': 'A', 'player2': 'B'} for i in range(1, team_count + 1)
+        ])
+        pairs = [
+            (i % team_count + 1, (i * 7 + 3) % team_count + 1) for i in range(12_000)
+        ]
+        pairs = [tuple(sorted(pair)) for pair in pairs if pair[0] != pair[1]][:10_000]
+        db.session.execute(insert(Game), [
+            {'id': i + 1, 'team1_id': team1, 'team2_id': team2, 'status': 'completed'}
+            for i, (team1, team2) in enumerate(pairs)
+        ])
+        start = datetime(2024, 1, 1)
+        db.session.execute(insert(Result), [
+            {'id': i + 1, 'game_id': i + 1, 'winning_team_id': pair[i % 2], 'score': 1,
+             'created_at': start + timedelta(seconds=i)}
+            for i, pair in enumerate(pairs)
+        ])
+        bump_version(db.session)
+        db.session.commit()
+
+        # Best of three fresh caches, with garbage collection paused while timing as timeit does
+        samples = []
+        for _ in range(3):
+            cache = RatingCache(engine())
+            gc.disable()
+            try:
+                started = time.perf_counter()
+                cache.sync(db.session)
+                samples.append(time.perf_counter() - started)
+            finally:
+                gc.enable()
+        elapsed = min(samples)
+
+        print(f'\n{engine.name}: full pass over {cache.replayed} results in {elapsed * 1000:.1f} ms')
+        assert cache.replayed == 10_000
+        assert elapsed < 0.1
+
+
+class TestRatingRankings:
+    """Test suite for GET /api/rankings?mode="""
+
+    def test_elo_mode(self, client, db, sample_teams):
+        """Test that mode=elo orders teams by rating"""
+        add_results(db, sample_teams, [(3, 0), (3, 1), (2, 0)])
+
+        response = client.get('/api/rankings?mode=elo')
+
+        assert response.status_code == 200
+        rankings = json.loads(response.data)['rankings']
+        assert rankings[0]['team_id'] == sample_teams[3].id
+        assert [r['rank'] for r in rankings] == [1, 2, 3, 4]
+        assert rankings[0]['rating'] > 1500 > rankings[-1]['rating']
+        assert rankings[0]['games_won'] == 2
+
+    def test_glicko2_mode(self, client, db, sample_teams):
+        """Test that mode=glicko2 returns rating, deviation and volatility"""
+        add_results(db, sample_teams, [(0, 1)])
+
+        rankings = json.loads(client.get('/api/rankings?mode=glicko2').data)['rankings']
+
+        assert rankings[0]['team_id'] == sample_teams[0].id
+        assert {'rating', 'rating_deviation', 'volatility'} <= set(rankings[0])
+
+    def test_ratings_follow_new_results(self, client, db, sample_game):
+        """Test that a submitted result is reflected immediately"""
+        client.post(f'/api/games/{sample_game.id}/start')
+        client.get('/api/rankings?mode=elo')
+        client.post('/api/results', json={'game_id': sample_game.id, 'winning_team_id': sample_game.team2_id, 'score': 3})
+
+        rankings = json.loads(client.get('/api/rankings?mode=elo').data)['rankings']
+
+        assert rankings[0]['team_id'] == sample_game.team2_id
+        assert rankings[0]['rating'] == 1516.0
+
+    def test_invalid_mode(self, client, db):
+        """Test that unknown modes and point-in-time ratings are rejected"""
+        assert client.get('/api/rankings?mode=trueskill').status_code == 400
+        assert client.get('/api/rankings?mode=elo&after_game=0').status_code == 400
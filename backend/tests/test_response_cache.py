@@ -0,0 +1,185 @@
+"""Tests for the tournament version and the versioned response cache"""
+import pytest
+import json
+from services.response_cache import ResponseCache
+from services.tournament_version import current_version
+from models.game import Game
+
+
+class TestTournamentVersion:
+    """Test suite for the write-driven tournament version"""
+
+    def test_version_starts_at_zero(self, app, db):
+        """Test that an empty tournament reports version 0"""
+        assert current_version(db.session) == 0
+
+    def test_mutating_routes_bump_version(self, client, db):
+        """Test that every kind of write advances the version"""
+        versions = [current_version(db.session)]
+
+        def record():
+            db.session.rollback()
+            versions.append(current_version(db.session))
+
+        client.post('/api/teams', json={'players': ['A', 'B', 'C', 'D', 'E', 'F']})
+        record()
+        team_id = client.post('/api/teams/manual', json={'player1': 'G', 'player2': 'H'}).get_json()['id']
+        record()
+        client.delete(f'/api/teams/{team_id}')
+        record()
+        game = client.post('/api/games', json={'team1_id': 1, 'team2_id': 2}).get_json()
+        record()
+        client.put(f"/api/games/{game['id']}", json={'team1_id': 1, 'team2_id': 3})
+        record()
+        client.post(f"/api/games/{game['id']}/start")
+        record()
+        client.post('/api/results', json={'game_id': game['id'], 'winning_team_id': 1, 'score': 5})
+        record()
+        scheduled = client.post('/api/games', json={'team1_id': 2, 'team2_id': 3}).get_json()
+        record()
+        client.delete(f"/api/games/{scheduled['id']}")
+        record()
+        client.post('/api/games/generate')
+        record()
+        client.post('/api/admin/clear-database')
+        record()
+
+        assert all(later > earlier for earlier, later in zip(versions, versions[1:]))
+
+    def test_reads_do_not_bump_version(self, client, db, sample_teams):
+        """Test that GET requests leave the version unchanged"""
+        before = current_version(db.session)
+        client.get('/api/teams')
+        client.get('/api/rankings')
+        db.session.rollback()
+        assert current_version(db.session) == before
+
+
+class TestResponseCache:
+    """Test suite for cached read endpoints"""
+
+    @pytest.mark.parametrize('url', ['/api/teams', '/api/games', '/api/rankings', '/api/match-matrix'])
+    def test_second_read_is_served_from_cache(self, client, db, sample_teams, url):
+        """Test that identical reads between writes reuse the serialized body"""
+        first = client.get(url)
+        second = client.get(url)
+
+        assert first.headers['X-Cache'] == 'MISS'
+        assert second.headers['X-Cache'] == 'HIT'
+        assert first.data == second.data
+
+    def test_write_invalidates_cached_reads(self, client, db, in_progress_game, sample_teams):
+        """Test that submitting a result is visible on the next read"""
+        before = json.loads(client.get('/api/rankings').data)
+        assert before['rankings'][0]['total_score'] == 0
+
+        client.post('/api/results', json={
+            'game_id': in_progress_game.id,
+            'winning_team_id': sample_teams[0].id,
+            'score': 7
+        })
+        response = client.get('/api/rankings')
+
+        assert response.headers['X-Cache'] == 'MISS'
+        assert json.loads(response.data)['rankings'][0]['total_score'] == 7
+
+    def test_direct_model_changes_invalidate_cache(self, client, db, sample_teams):
+        """Test that writes outside the routes also invalidate cached reads"""
+        client.get('/api/games')
+
+        db.session.add(Game(team1_id=sample_teams[0].id, team2_id=sample_teams[1].id))
+        db.session.commit()
+
+        data = json.loads(client.get('/api/games').data)
+        assert len(data['games']) == 1
+
+    def test_query_string_is_part_of_key(self, client, db, sample_teams):
+        """Test that different filters are cached separately"""
+        db.session.add(Game(team1_id=sample_teams[0].id, team2_id=sample_teams[1].id, status='in_progress'))
+        db.session.commit()
+
+        all_games = json.loads(client.get('/api/games').data)
+        scheduled = json.loads(client.get('/api/games?status=scheduled').data)
+
+        assert len(all_games['games']) == 1
+        assert len(scheduled['games']) == 0
+
+    def test_cache_drops_entries_from_older_versions(self):
+        """Test that storing a newer version evicts stale bodies"""
+        cache = ResponseCache()
+        cache.put('/a', 1, b'one')
+        cache.put('/b', 2, b'two')
+
+        assert cache.get('/a', 1) is None
+        assert cache.get('/a', 2) is None
+        assert cache.get('/b', 2) == b'two'
+
+    def test_cache_ignores_bodies_from_older_versions(self):
+        """Test that a slow request cannot overwrite newer cached data"""
+        cache = ResponseCache()
+        cache.put('/a', 3, b'new')
+        cache.put('/a', 2, b'old')
+
+        assert cache.get('/a', 3) == b'new'
+
+    def test_cache_is_bounded(self):
+        """Test that the cache never grows past its entry limit"""
+        cache = ResponseCache(max_entries=2)
+        for i in range(5):
+            cache.put(f'/{i}', 1, b'x')
+
+        assert cache.get('/0', 1) is None
+        assert cache.get('/4', 1) == b'x'
+
+
+class TestConditionalGet:
+    """Test suite for ETag / If-None-Match handling on read endpoints"""
+
+    @pytest.mark.parametrize('url', [
+        '/api/teams', '/api/teams/1', '/api/games', '/api/games/current',
+        '/api/games/available-teams', '/api/results', '/api/rankings', '/api/match-matrix'
+    ])
+    def test_matching_etag_returns_304(self, client, db, sample_teams, url):
+        """Test that a client holding the current ETag gets an empty 304"""
+        first = client.get(url)
+        assert first.status_code == 200
+        etag = first.headers['ETag']
+
+        second = client.get(url, headers={'If-None-Match': etag})
+
+        assert second.status_code == 304
+        assert second.data == b''
+        assert second.headers['ETag'] == etag
+
+    def test_etag_changes_after_write(self, client, db, sample_teams):
+        """Test that a stale ETag gets the full, updated body"""
+        etag = client.get('/api/teams').headers['ETag']
+
+        client.post('/api/teams/manual', json={'player1': 'Ivy', 'player2': 'Jack'})
+        response = client.get('/api/teams', headers={'If-None-Match': etag})
+
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+        assert len(json.loads(response.data)['teams']) == 5
+
+    def test_etag_differs_per_url(self, client, db, sample_teams):
+        """Test that two endpoints at the same version do not share an ETag"""
+        teams_etag = client.get('/api/teams').headers['ETag']
+        games_etag = client.get('/api/games').headers['ETag']
+
+        assert teams_etag != games_etag
+        assert client.get('/api/games', headers={'If-None-Match': teams_etag}).status_code == 200
+
+    def test_not_found_has_no_etag(self, client, db):
+        """Test that error responses are neither cached nor tagged"""
+        response = client.get('/api/results/999')
+
+        assert response.status_code == 404
+        assert 'ETag' not in response.headers
+
+    def test_etag_header_is_exposed_for_cors(self, client, db):
+        """Test that browsers are allowed to read the ETag and send If-None-Match"""
+        response = client.get('/api/teams')
+
+        assert 'ETag' in response.headers['Access-Control-Expose-Headers']
+        assert 'If-None-Match' in response.headers['Access-Control-Allow-Headers']
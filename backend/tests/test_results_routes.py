@@ -3,7 +3,7 @@ import pytest
 import json
 from models.game import Game
 from models.result import Result
-from datetime import datetime
+from datetime import datetime, timedelta
 
 
 class TestResultsRoutes:
@@ -314,6 +314,66 @@ class TestResultsRoutes:
         assert 'games_lost' in ranking
         assert 'win_rate' in ranking
 
+    def test_get_rankings_point_in_time(self, client, db, sample_teams):
+        """Test rankings rewound by game count and by timestamp"""
+        start = datetime.utcnow() + timedelta(hours=1)
+        for i, (winner, loser) in enumerate([(0, 1), (2, 3)]):
+            game = Game(
+                team1_id=sample_teams[winner].id,
+                team2_id=sample_teams[loser].id,
+                status='completed',
+                completed_at=start + timedelta(minutes=i)
+            )
+            db.session.add(game)
+            db.session.flush()
+            db.session.add(Result(game_id=game.id, winning_team_id=sample_teams[winner].id, score=5,
+                                  created_at=game.completed_at))
+        db.session.commit()
+
+        def played(url):
+            response = client.get(url)
+            assert response.status_code == 200
+            return sum(r['games_played'] for r in json.loads(response.data)['rankings'])
+
+        between = (start + timedelta(seconds=30)).isoformat()
+        assert played('/api/rankings?after_game=1') == 2
+        assert played(f'/api/rankings?as_of={between}') == 2
+        assert played(f'/api/rankings?as_of={between}%2B00:00') == 2
+        assert played(f'/api/rankings?as_of={datetime.utcnow().isoformat()}') == 0
+        assert played('/api/rankings') == 4
+
+    def test_get_rankings_point_in_time_invalid(self, client, db, sample_teams):
+        """Test that malformed or out-of-range points in time are rejected"""
+        assert client.get('/api/rankings?as_of=yesterday').status_code == 400
+        assert client.get('/api/rankings?after_game=-1').status_code == 400
+        assert client.get('/api/rankings?after_game=5').status_code == 400
+
+    def test_get_rankings_tie_breakers(self, client, db, sample_teams):
+        """Test that tie_breakers orders level teams and reports the values used"""
+        # Teams 1 and 4 both end on 5 points and one win in two games, team 4 against stronger opponents
+        for winner, loser, score in [(0, 1, 5), (2, 3, 5), (3, 0, 5)]:
+            game = Game(team1_id=min(sample_teams[winner].id, sample_teams[loser].id),
+                        team2_id=max(sample_teams[winner].id, sample_teams[loser].id), status='completed')
+            db.session.add(game)
+            db.session.flush()
+            db.session.add(Result(game_id=game.id, winning_team_id=sample_teams[winner].id, score=score))
+        db.session.commit()
+
+        plain = json.loads(client.get('/api/rankings').data)['rankings']
+        response = client.get('/api/rankings?tie_breakers=buchholz')
+
+        assert response.status_code == 200
+        rankings = json.loads(response.data)['rankings']
+        assert [r['team_id'] for r in plain[:3]] == [sample_teams[2].id, sample_teams[0].id, sample_teams[3].id]
+        assert [r['team_id'] for r in rankings[:3]] == [sample_teams[2].id, sample_teams[3].id, sample_teams[0].id]
+        assert rankings[1]['tie_breakers'] == {'buchholz': 10}
+
+    def test_get_rankings_tie_breakers_invalid(self, client, db):
+        """Test that unknown, repeated or rating-mode tie-breakers are rejected"""
+        assert client.get('/api/rankings?tie_breakers=coin_flip').status_code == 400
+        assert client.get('/api/rankings?tie_breakers=buchholz,buchholz').status_code == 400
+        assert client.get('/api/rankings?mode=elo&tie_breakers=buchholz').status_code == 400
+
     def test_get_match_matrix_empty(self, client, db, sample_teams):
         """Test match matrix with no games"""
         response = client.get('/api/match-matrix')
@@ -381,3 +441,61 @@ class TestResultsRoutes:
 
         for team in sample_teams:
             assert matrix[str(team.id)][str(team.id)] is None
+
+    def test_get_match_matrix_compact_matches_full(self, client, db, make_tournament):
+        """Test that decoding the compact arrays gives back every cell of the full matrix"""
+        teams, games = make_tournament(6)
+        db.session.add(Game(team1_id=teams[0].id, team2_id=teams[5].id, status='in_progress'))
+        db.session.add(Game(team1_id=teams[1].id, team2_id=teams[5].id, status='scheduled'))
+        db.session.commit()
+
+        full = json.loads(client.get('/api/match-matrix').data)
+        response = client.get('/api/match-matrix?format=compact')
+
+        assert response.status_code == 200
+        compact = json.loads(response.data)
+        assert compact['format'] == 'compact'
+        assert compact['teams'] == full['teams']
+        assert len(compact['game_ids']) == len(games) + 1
+        assert all(team1_id < team2_id for team1_id, team2_id in zip(compact['team1_ids'], compact['team2_ids']))
+
+        cells = {}
+        for team1_id, team2_id, game_id, status in zip(compact['team1_ids'], compact['team2_ids'], compact['game_ids'], compact['statuses']):
+            cells[(team1_id, team2_id)] = cells[(team2_id, team1_id)] = {'game_id': game_id, 'status': status}
+        for team1 in compact['teams']:
+            for team2 in compact['teams']:
+                expected = full['matrix'][str(team1['id'])][str(team2['id'])]
+                if team1['id'] == team2['id']:
+                    assert expected is None
+                else:
+                    assert cells.get((team1['id'], team2['id']), {'status': 'unplayed'}) == expected
+
+    def test_get_match_matrix_compact_scales_with_games(self, client, db, make_tournament):
+        """Benchmark: at 200 teams the compact body grows with games played, not teams squared"""
+        make_tournament(200)
+
+        full = client.get('/api/match-matrix').data
+        compact = client.get('/api/match-matrix?format=compact').data
+        teams_only = len(json.dumps(json.loads(compact)['teams']))
+
+        print(f'\n200 teams, 199 games: full {len(full):,} bytes, compact {len(compact):,} bytes')
+        assert len(compact) < len(full) / 10
+        # Beyond the team list, a few bytes per game
+        assert len(compact) - teams_only < 199 * 40
+
+    def test_get_match_matrix_invalid_format(self, client, db):
+        """Test that unknown formats are rejected"""
+        assert client.get('/api/match-matrix?format=sparse').status_code == 400
+
+    @pytest.mark.parametrize('team_count', [3, 30])
+    def test_get_results_statement_count_is_fixed(self, client, db, make_tournament, query_counter, team_count):
+        """Test that listing results loads winning teams in the same query"""
+        _, games = make_tournament(team_count)
+        query_counter.clear()
+
+        response = client.get('/api/results')
+
+        data = json.loads(response.data)
+        assert len(data['results']) == len(games)
+        assert all(result['winning_team'] for result in data['results'])
+        assert len(query_counter) == 2
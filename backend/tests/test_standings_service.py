@@ -0,0 +1,118 @@
+"""Tests for the incrementally maintained standings table"""
+import pytest
+import json
+from services.standings_service import StandingsService
+from models.game import Game
+from models.result import Result
+from models.standing import Standing
+
+
+class TestStandingsService:
+    """Test suite for StandingsService and the standings tracker"""
+
+    def test_result_submission_updates_standings(self, client, db, in_progress_game, sample_teams):
+        """Test that posting a result updates both teams' standings in the same commit"""
+        response = client.post('/api/results', json={
+            'game_id': in_progress_game.id,
+            'winning_team_id': sample_teams[0].id,
+            'score': 12
+        })
+        assert response.status_code == 201
+
+        winner = db.session.get(Standing, sample_teams[0].id)
+        loser = db.session.get(Standing, sample_teams[1].id)
+
+        assert (winner.games_played, winner.games_won, winner.total_score) == (1, 1, 12)
+        assert (loser.games_played, loser.games_won, loser.total_score) == (1, 0, 0)
+
+    def test_uncompleting_a_game_reverts_games_played(self, app, db, sample_teams):
+        """Test that moving a game out of completed status decrements games played"""
+        game = Game(team1_id=sample_teams[0].id, team2_id=sample_teams[1].id, status='completed')
+        db.session.add(game)
+        db.session.commit()
+        assert db.session.get(Standing, sample_teams[0].id).games_played == 1
+
+        game.status = 'in_progress'
+        db.session.commit()
+
+        db.session.expire_all()
+        assert db.session.get(Standing, sample_teams[0].id).games_played == 0
+        assert db.session.get(Standing, sample_teams[1].id).games_played == 0
+
+    def test_deleting_result_reverts_wins_and_score(self, app, db, completed_game_with_result, sample_teams):
+        """Test that deleting a result removes its win and score"""
+        _, result = completed_game_with_result
+        db.session.delete(result)
+        db.session.commit()
+
+        db.session.expire_all()
+        standing = db.session.get(Standing, sample_teams[0].id)
+        assert standing.games_won == 0
+        assert standing.total_score == 0
+        assert standing.games_played == 1
+
+    def test_no_drift_after_normal_play(self, app, db, completed_game_with_result):
+        """Test that incremental maintenance matches a full recomputation"""
+        drift, _ = StandingsService(db).find_drift()
+        assert drift == []
+
+    def test_rebuild_detects_and_repairs_drift(self, app, db, completed_game_with_result, sample_teams):
+        """Test that rebuild reports tampered rows and restores correct values"""
+        standing = db.session.get(Standing, sample_teams[0].id)
+        standing.total_score = 999
+        db.session.commit()
+
+        drift = StandingsService(db).rebuild()
+
+        assert len(drift) == 1
+        assert drift[0]['team_id'] == sample_teams[0].id
+        assert drift[0]['stored']['total_score'] == 999
+        assert drift[0]['expected']['total_score'] == 10
+
+        db.session.expire_all()
+        assert db.session.get(Standing, sample_teams[0].id).total_score == 10
+        assert StandingsService(db).find_drift()[0] == []
+
+    def test_rebuild_dry_run_leaves_table_untouched(self, app, db, completed_game_with_result, sample_teams):
+        """Test that a dry run only reports drift"""
+        Standing.query.delete()
+        db.session.commit()
+
+        drift = StandingsService(db).rebuild(dry_run=True)
+
+        assert {entry['team_id'] for entry in drift} == {sample_teams[0].id, sample_teams[1].id}
+        assert Standing.query.count() == 0
+
+    def test_rankings_read_from_standings(self, app, db, completed_game_with_result, sample_teams, query_counter):
+        """Test that rankings reflect the standings table in a single query"""
+        from services.ranking_service import RankingService
+
+        query_counter.clear()
+        rankings = RankingService(db).get_rankings()
+
+        assert len(query_counter) == 1
+        assert rankings[0]['team_id'] == sample_teams[0].id
+        assert rankings[0]['total_score'] == 10
+
+    def test_startup_backfills_missing_standings(self, app, db, completed_game_with_result, sample_teams):
+        """Test that starting the app on a database with results but no standings rebuilds them"""
+        from app import create_app
+        from tests.conftest import TestConfig
+
+        Standing.query.delete()
+        db.session.commit()
+
+        create_app(TestConfig)
+
+        db.session.expire_all()
+        assert db.session.get(Standing, sample_teams[0].id).total_score == 10
+        assert StandingsService(db).find_drift()[0] == []
+
+    def test_rebuild_if_drifted_leaves_current_standings_alone(self, app, db, completed_game_with_result):
+        """Test that standings already in step are not rewritten"""
+        from services.tournament_version import current_version
+
+        version = current_version(db.session)
+
+        assert StandingsService(db).rebuild_if_drifted() == []
+        assert current_version(db.session) == version
@@ -0,0 +1,120 @@
+"""Tests for the delta sync endpoint"""
+import pytest
+import json
+from services.tournament_version import current_version
+
+
+def sync(client, since):
+    response = client.get(f'/api/sync?since={since}')
+    assert response.status_code == 200
+    return json.loads(response.data)
+
+
+class TestSyncRoute:
+    """Test suite for GET /api/sync"""
+
+    def test_initial_sync_returns_everything(self, client, sample_game):
+        """Test that since=0 returns a full snapshot"""
+        data = sync(client, 0)
+
+        assert data['reset'] is True
+        assert len(data['teams']) == 4
+        assert [game['id'] for game in data['games']] == [sample_game.id]
+        assert data['results'] == []
+        assert data['deleted'] == {'teams': [], 'games': [], 'results': []}
+
+    def test_sync_returns_only_changes(self, client, sample_game):
+        """Test that only rows changed after the given version are returned"""
+        version = sync(client, 0)['version']
+
+        client.post(f'/api/games/{sample_game.id}/start')
+        data = sync(client, version)
+
+        assert data['reset'] is False
+        assert data['version'] > version
+        assert data['teams'] == []
+        assert [(game['id'], game['status']) for game in data['games']] == [(sample_game.id, 'in_progress')]
+
+    def test_sync_at_current_version_is_empty(self, client, sample_teams):
+        """Test that an up-to-date client receives nothing"""
+        version = sync(client, 0)['version']
+        data = sync(client, version)
+
+        assert data['version'] == version
+        assert data['teams'] == [] and data['games'] == [] and data['results'] == []
+
+    def test_result_syncs_game_and_result(self, client, in_progress_game):
+        """Test that submitting a result changes both the game and the result"""
+        version = sync(client, 0)['version']
+        client.post('/api/results', json={
+            'game_id': in_progress_game.id,
+            'winning_team_id': in_progress_game.team1_id,
+            'score': 4
+        })
+        data = sync(client, version)
+
+        assert [game['status'] for game in data['games']] == ['completed']
+        assert [result['score'] for result in data['results']] == [4]
+
+    def test_deletions_are_tombstoned(self, client, sample_teams, sample_game):
+        """Test that deleted teams and games are reported by id"""
+        version = sync(client, 0)['version']
+
+        client.delete(f'/api/games/{sample_game.id}')
+        client.delete(f'/api/teams/{sample_teams[3].id}')
+        data = sync(client, version)
+
+        assert data['deleted']['games'] == [sample_game.id]
+        assert data['deleted']['teams'] == [sample_teams[3].id]
+        assert data['games'] == [] and data['teams'] == []
+
+    def test_created_then_deleted_is_only_tombstoned(self, client, sample_teams):
+        """Test that the latest change per row wins"""
+        version = sync(client, 0)['version']
+
+        team = client.post('/api/teams/manual', json={'player1': 'X', 'player2': 'Y'}).get_json()
+        client.delete(f"/api/teams/{team['id']}")
+        data = sync(client, version)
+
+        assert data['teams'] == []
+        assert data['deleted']['teams'] == [team['id']]
+
+    def test_clear_resets_client(self, client, sample_teams):
+        """Test that a clear since the client's version asks it to start over"""
+        version = sync(client, 0)['version']
+
+        client.post('/api/admin/clear-database')
+        client.post('/api/teams/manual', json={'player1': 'X', 'player2': 'Y'})
+        data = sync(client, version)
+
+        assert data['reset'] is True
+        assert [team['player1'] for team in data['teams']] == ['X']
+        assert data['deleted']['teams'] == []
+
+    def test_future_version_resets_client(self, client, sample_teams):
+        """Test that a version the server never reached gets a full snapshot"""
+        data = sync(client, 10_000)
+
+        assert data['reset'] is True
+        assert len(data['teams']) == 4
+
+    def test_invalid_since(self, client):
+        """Test that since must be a non-negative integer"""
+        assert client.get('/api/sync?since=abc').status_code == 400
+        assert client.get('/api/sync?since=-1').status_code == 400
+
+    def test_work_scales_with_changes(self, client, db, make_tournament, query_counter):
+        """Test that a delta after a large tournament loads only the changed rows"""
+        make_tournament(200)
+        version = current_version(db.session)
+        db.session.rollback()
+
+        client.post('/api/teams/manual', json={'player1': 'X', 'player2': 'Y'})
+        query_counter.clear()
+        data = sync(client, version)
+
+        assert len(data['teams']) == 1
+        assert data['games'] == [] and data['results'] == []
+        # Version (cache check and sync), clear check, change rows and one team lookup
+        selects = [statement for statement in query_counter if statement.lstrip().upper().startswith('SELECT')]
+        assert len(selects) == 5
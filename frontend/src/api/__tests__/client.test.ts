@@ -0,0 +1,91 @@
+import { describe, it, expect, beforeEach } from 'vitest'
+import { AxiosResponse, InternalAxiosRequestConfig } from 'axios'
+import apiClient, { clearEtagCache } from '../client'
+
+type Reply = { status: number; data?: unknown; etag?: string }
+
+const requests: InternalAxiosRequestConfig[] = []
+let replies: Reply[] = []
+
+// Answer requests from a queue instead of the network
+apiClient.defaults.adapter = async (config: InternalAxiosRequestConfig): Promise<AxiosResponse> => {
+  requests.push(config)
+  const reply = replies.shift() ?? { status: 200, data: {} }
+  return {
+    data: reply.data ?? '',
+    status: reply.status,
+    statusText: '',
+    headers: reply.etag ? { etag: reply.etag } : {},
+    config,
+  }
+}
+
+describe('API client conditional requests', () => {
+  beforeEach(() => {
+    clearEtagCache()
+    requests.length = 0
+    replies = []
+  })
+
+  it('should not send If-None-Match on the first request', async () => {
+    replies = [{ status: 200, data: { teams: [] }, etag: '"v1"' }]
+
+    await apiClient.get('/teams')
+
+    expect(requests[0].headers.get('If-None-Match')).toBeUndefined()
+  })
+
+  it('should send the stored ETag and reuse the cached body on 304', async () => {
+    const teams = { teams: [{ id: 1, name: 'Team 1' }] }
+    replies = [
+      { status: 200, data: teams, etag: '"v1"' },
+      { status: 304, etag: '"v1"' },
+    ]
+
+    await apiClient.get('/teams')
+    const response = await apiClient.get('/teams')
+
+    expect(requests[1].headers.get('If-None-Match')).toBe('"v1"')
+    expect(response.status).toBe(200)
+    expect(response.data).toEqual(teams)
+  })
+
+  it('should replace the cached body when the data changes', async () => {
+    replies = [
+      { status: 200, data: { games: [] }, etag: '"v1"' },
+      { status: 200, data: { games: [{ id: 1 }] }, etag: '"v2"' },
+      { status: 304, etag: '"v2"' },
+    ]
+
+    await apiClient.get('/games')
+    await apiClient.get('/games')
+    const response = await apiClient.get('/games')
+
+    expect(requests[2].headers.get('If-None-Match')).toBe('"v2"')
+    expect(response.data).toEqual({ games: [{ id: 1 }] })
+  })
+
+  it('should keep separate ETags per query string', async () => {
+    replies = [
+      { status: 200, data: { games: [] }, etag: '"a"' },
+      { status: 200, data: { games: [] }, etag: '"b"' },
+    ]
+
+    await apiClient.get('/games', { params: { status: 'in_progress' } })
+    await apiClient.get('/games')
+
+    expect(requests[1].headers.get('If-None-Match')).toBeUndefined()
+  })
+
+  it('should not add conditional headers to writes', async () => {
+    replies = [
+      { status: 200, data: { teams: [] }, etag: '"v1"' },
+      { status: 201, data: {} },
+    ]
+
+    await apiClient.get('/teams')
+    await apiClient.post('/teams', { players: [] })
+
+    expect(requests[1].headers.get('If-None-Match')).toBeUndefined()
+  })
+})
@@ -0,0 +1,78 @@
+import { describe, it, expect, vi, beforeEach, afterEach } from 'vitest'
+import { subscribeToEvents } from '../events'
+
+class FakeEventSource {
+  static instances: FakeEventSource[] = []
+  url: string
+  closed = false
+  listeners = new Map<string, (event: MessageEvent) => void>()
+
+  constructor(url: string) {
+    this.url = url
+    FakeEventSource.instances.push(this)
+  }
+
+  addEventListener(type: string, listener: (event: MessageEvent) => void) {
+    this.listeners.set(type, listener)
+  }
+
+  emit(type: string, data: string) {
+    this.listeners.get(type)?.({ data } as MessageEvent)
+  }
+
+  close() {
+    this.closed = true
+  }
+}
+
+describe('Events API', () => {
+  beforeEach(() => {
+    FakeEventSource.instances = []
+    vi.stubGlobal('EventSource', FakeEventSource)
+  })
+
+  afterEach(() => {
+    vi.unstubAllGlobals()
+  })
+
+  it('should connect to the events endpoint', () => {
+    subscribeToEvents(['game_started'], vi.fn())
+
+    expect(FakeEventSource.instances[0].url).toBe('http://localhost:5001/api/events')
+  })
+
+  it('should pass parsed event data to the handler', () => {
+    const onEvent = vi.fn()
+    subscribeToEvents(['result_created'], onEvent)
+
+    FakeEventSource.instances[0].emit('result_created', '{"id": 3, "score": 7}')
+
+    expect(onEvent).toHaveBeenCalledWith('result_created', { id: 3, score: 7 })
+  })
+
+  it('should always listen for resync', () => {
+    const onEvent = vi.fn()
+    subscribeToEvents(['team_created'], onEvent)
+
+    FakeEventSource.instances[0].emit('resync', '{}')
+
+    expect(onEvent).toHaveBeenCalledWith('resync', {})
+  })
+
+  it('should ignore event types it did not subscribe to', () => {
+    const onEvent = vi.fn()
+    subscribeToEvents(['team_created'], onEvent)
+
+    FakeEventSource.instances[0].emit('game_started', '{}')
+
+    expect(onEvent).not.toHaveBeenCalled()
+  })
+
+  it('should close the connection on unsubscribe', () => {
+    const unsubscribe = subscribeToEvents(['team_created'], vi.fn())
+
+    unsubscribe()
+
+    expect(FakeEventSource.instances[0].closed).toBe(true)
+  })
+})
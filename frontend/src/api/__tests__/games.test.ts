@@ -1,6 +1,7 @@
 import { describe, it, expect, vi, beforeEach } from 'vitest'
 import {
   generateGame,
+  generateRound,
   createGameManually,
   getGames,
   getCurrentGames,
@@ -39,6 +40,30 @@ describe('Games API', () => {
     })
   })
 
+  describe('generateRound', () => {
+    it('should generate games for as many tables as possible by default', async () => {
+      const mockGames = [
+        { id: 1, team1: { id: 1 }, team2: { id: 2 }, status: 'in_progress' },
+        { id: 2, team1: { id: 3 }, team2: { id: 4 }, status: 'in_progress' },
+      ]
+
+      vi.mocked(apiClient.post).mockResolvedValue({ data: { games: mockGames } })
+
+      const result = await generateRound()
+
+      expect(apiClient.post).toHaveBeenCalledWith('/games/generate-round', { tables: 'max' })
+      expect(result).toEqual(mockGames)
+    })
+
+    it('should pass the number of tables', async () => {
+      vi.mocked(apiClient.post).mockResolvedValue({ data: { games: [] } })
+
+      await generateRound(3)
+
+      expect(apiClient.post).toHaveBeenCalledWith('/games/generate-round', { tables: 3 })
+    })
+  })
+
   describe('createGameManually', () => {
     it('should create a game with specific teams', async () => {
       const mockGame = {
@@ -77,7 +102,7 @@ describe('Games API', () => {
         }
       ]
 
-      vi.mocked(apiClient.get).mockResolvedValue({ data: { games: mockGames } })
+      vi.mocked(apiClient.get).mockResolvedValue({ data: { games: mockGames, next_after: null } })
 
       const result = await getGames()
 
@@ -98,13 +123,27 @@ describe('Games API', () => {
         }
       ]
 
-      vi.mocked(apiClient.get).mockResolvedValue({ data: { games: mockGames } })
+      vi.mocked(apiClient.get).mockResolvedValue({ data: { games: mockGames, next_after: null } })
 
       const result = await getGames('in_progress')
 
       expect(apiClient.get).toHaveBeenCalledWith('/games', { params: { status: 'in_progress' } })
       expect(result).toEqual(mockGames)
     })
+
+    it('should follow next_after until the last page', async () => {
+      const first = { id: 1, status: 'completed' }
+      const second = { id: 2, status: 'completed' }
+      vi.mocked(apiClient.get)
+        .mockResolvedValueOnce({ data: { games: [first], next_after: 1 } })
+        .mockResolvedValueOnce({ data: { games: [second], next_after: null } })
+
+      const result = await getGames('completed')
+
+      expect(apiClient.get).toHaveBeenNthCalledWith(1, '/games', { params: { status: 'completed' } })
+      expect(apiClient.get).toHaveBeenNthCalledWith(2, '/games', { params: { status: 'completed', after: 1 } })
+      expect(result).toEqual([first, second])
+    })
   })
 
   describe('getCurrentGames', () => {
@@ -1,5 +1,5 @@
 import { describe, it, expect, vi, beforeEach } from 'vitest'
-import { createResult, getResults, getRankings, getMatchMatrix } from '../results'
+import { createResult, getResults, getRankings, getRatings, getRankingHistory, getRankingProjection, getMatchMatrix } from '../results'
 import apiClient from '../client'
 
 vi.mock('../client')
@@ -71,17 +71,28 @@ describe('Results API', () => {
         }
       ]
 
-      vi.mocked(apiClient.get).mockResolvedValue({ data: { results: mockResults } })
+      vi.mocked(apiClient.get).mockResolvedValue({ data: { results: mockResults, next_after: null } })
 
       const result = await getResults()
 
-      expect(apiClient.get).toHaveBeenCalledWith('/results')
+      expect(apiClient.get).toHaveBeenCalledWith('/results', { params: {} })
       expect(result).toEqual(mockResults)
       expect(result).toHaveLength(2)
     })
 
+    it('should follow next_after until the last page', async () => {
+      vi.mocked(apiClient.get)
+        .mockResolvedValueOnce({ data: { results: [{ id: 1 }], next_after: 1 } })
+        .mockResolvedValueOnce({ data: { results: [{ id: 2 }], next_after: null } })
+
+      const result = await getResults()
+
+      expect(apiClient.get).toHaveBeenNthCalledWith(2, '/results', { params: { after: 1 } })
+      expect(result).toEqual([{ id: 1 }, { id: 2 }])
+    })
+
     it('should return empty array when no results', async () => {
-      vi.mocked(apiClient.get).mockResolvedValue({ data: { results: [] } })
+      vi.mocked(apiClient.get).mockResolvedValue({ data: { results: [], next_after: null } })
 
       const result = await getResults()
 
@@ -126,6 +137,14 @@ describe('Results API', () => {
       expect(result[0].total_score).toBeGreaterThan(result[1].total_score)
     })
 
+    it('should request standings at a point in time', async () => {
+      vi.mocked(apiClient.get).mockResolvedValue({ data: { rankings: [] } })
+
+      await getRankings({ after_game: 12 })
+
+      expect(apiClient.get).toHaveBeenCalledWith('/rankings', { params: { after_game: 12 } })
+    })
+
     it('should handle teams with no games', async () => {
       const mockRankings = [
         {
@@ -150,6 +169,71 @@ describe('Results API', () => {
     })
   })
 
+  describe('getRatings', () => {
+    it('should request rankings in the given rating mode', async () => {
+      const mockRankings = [
+        { rank: 1, team_id: 2, team_name: 'Team 2', players: ['Carol', 'Dave'], total_score: 0, games_played: 1, games_won: 1, games_lost: 0, win_rate: 1, rating: 1516 }
+      ]
+
+      vi.mocked(apiClient.get).mockResolvedValue({ data: { rankings: mockRankings } })
+
+      const result = await getRatings('elo')
+
+      expect(apiClient.get).toHaveBeenCalledWith('/rankings', { params: { mode: 'elo' } })
+      expect(result[0].rating).toBe(1516)
+    })
+  })
+
+  describe('getRankingHistory', () => {
+    it('should fetch the columnar rank history', async () => {
+      const mockHistory = {
+        team_ids: [1, 2],
+        team_names: ['Team 1', 'Team 2'],
+        result_ids: [1, 2],
+        timestamps: ['2024-01-01T10:00:00', '2024-01-01T10:30:00'],
+        ranks: [[1, 2], [2, 1]],
+        scores: [[5, 5], [0, 8]],
+        movement: [-1, 1]
+      }
+
+      vi.mocked(apiClient.get).mockResolvedValue({ data: mockHistory })
+
+      const result = await getRankingHistory()
+
+      expect(apiClient.get).toHaveBeenCalledWith('/rankings/history')
+      expect(result.movement).toEqual([-1, 1])
+    })
+  })
+
+  describe('getRankingProjection', () => {
+    it('should fetch the projected rank probabilities', async () => {
+      const mockProjection = {
+        runs: 10000,
+        remaining_games: 1,
+        teams: [
+          { team_id: 1, team_name: 'Team 1', current_rank: 1, expected_rank: 1.2, rank_probabilities: [0.8, 0.2] },
+          { team_id: 2, team_name: 'Team 2', current_rank: 2, expected_rank: 1.8, rank_probabilities: [0.2, 0.8] }
+        ]
+      }
+
+      vi.mocked(apiClient.get).mockResolvedValue({ status: 200, data: mockProjection })
+
+      const result = await getRankingProjection()
+
+      expect(apiClient.get).toHaveBeenCalledWith('/rankings/projection', undefined)
+      expect(result?.teams[0].rank_probabilities).toEqual([0.8, 0.2])
+    })
+
+    it('should return null while the simulation is running', async () => {
+      vi.mocked(apiClient.get).mockResolvedValue({ status: 202, data: { status: 'pending' } })
+
+      const result = await getRankingProjection(500)
+
+      expect(apiClient.get).toHaveBeenCalledWith('/rankings/projection', { params: { runs: 500 } })
+      expect(result).toBeNull()
+    })
+  })
+
   describe('getMatchMatrix', () => {
     it('should fetch match matrix with teams', async () => {
       const mockTeams = [
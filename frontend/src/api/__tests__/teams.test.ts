@@ -1,5 +1,5 @@
 import { describe, it, expect, vi, beforeEach } from 'vitest'
-import { createTeams, getTeams, deleteTeam, createTeamManually } from '../teams'
+import { createTeams, getTeams, getTeamsPage, deleteTeam, createTeamManually } from '../teams'
 import apiClient from '../client'
 
 vi.mock('../client')
@@ -35,6 +35,24 @@ describe('Teams API', () => {
     })
   })
 
+  describe('getTeamsPage', () => {
+    it('should pass the cursor and return the next one', async () => {
+      const mockTeams = [
+        { id: 6, name: 'Team 6', player1: 'Alice', player2: 'Bob', created_at: '2024-01-01' }
+      ]
+
+      vi.mocked(apiClient.get).mockResolvedValue({
+        data: { teams: mockTeams, next_after: 6 }
+      })
+
+      const page = await getTeamsPage({ limit: 1, after: 5 })
+
+      expect(apiClient.get).toHaveBeenCalledWith('/teams', { params: { limit: 1, after: 5 } })
+      expect(page.teams).toEqual(mockTeams)
+      expect(page.next_after).toBe(6)
+    })
+  })
+
   describe('getTeams', () => {
     it('should fetch all teams', async () => {
       const mockTeams = [
@@ -42,18 +60,18 @@ describe('Teams API', () => {
       ]
 
       vi.mocked(apiClient.get).mockResolvedValue({
-        data: { teams: mockTeams }
+        data: { teams: mockTeams, next_after: null }
       })
 
       const result = await getTeams()
 
-      expect(apiClient.get).toHaveBeenCalledWith('/teams')
+      expect(apiClient.get).toHaveBeenCalledWith('/teams', { params: {} })
       expect(result).toEqual(mockTeams)
     })
 
     it('should return empty array when no teams exist', async () => {
       vi.mocked(apiClient.get).mockResolvedValue({
-        data: { teams: [] }
+        data: { teams: [], next_after: null }
       })
 
       const result = await getTeams()
@@ -1,10 +1,60 @@
-import axios from 'axios';
+import axios, { AxiosRequestConfig } from 'axios';
 
 const apiClient = axios.create({
   baseURL: 'http://localhost:5001/api',
   headers: {
     'Content-Type': 'application/json',
   },
+  // 304 Not Modified means the cached body below is still current
+  validateStatus: (status) => (status >= 200 && status < 300) || status === 304,
 });
 
+interface CachedBody {
+  etag: string;
+  data: unknown;
+}
+
+// Last body received for each GET URL, keyed by the full URL including params
+const etagCache = new Map<string, CachedBody>();
+
+const isGet = (config: AxiosRequestConfig) => (config.method ?? 'get').toLowerCase() === 'get';
+
+const cacheKey = (config: AxiosRequestConfig) => apiClient.getUri(config);
+
+apiClient.interceptors.request.use((config) => {
+  if (isGet(config)) {
+    const cached = etagCache.get(cacheKey(config));
+    if (cached) {
+      config.headers.set('If-None-Match', cached.etag);
+    }
+  }
+  return config;
+});
+
+apiClient.interceptors.response.use((response) => {
+  if (!isGet(response.config)) {
+    return response;
+  }
+
+  const key = cacheKey(response.config);
+
+  if (response.status === 304) {
+    const cached = etagCache.get(key);
+    if (cached) {
+      return { ...response, status: 200, data: cached.data };
+    }
+    return response;
+  }
+
+  const etag = response.headers['etag'];
+  if (etag) {
+    etagCache.set(key, { etag, data: response.data });
+  }
+  return response;
+});
+
+export const clearEtagCache = () => {
+  etagCache.clear();
+};
+
 export default apiClient;
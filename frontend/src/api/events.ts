@@ -0,0 +1,51 @@
+import { useEffect, useRef } from 'react';
+import apiClient from './client';
+
+export type TournamentEventType =
+  | 'team_created'
+  | 'game_started'
+  | 'game_completed'
+  | 'result_created'
+  | 'database_cleared'
+  // Sent when the server cannot replay the missed events: refetch everything
+  | 'resync';
+
+export type TournamentEventHandler = (type: TournamentEventType, data: unknown) => void;
+
+/**
+ * Listen to the server's event stream. The browser reconnects on its own and resumes
+ * with Last-Event-ID, so only missed events are replayed. Returns an unsubscribe function.
+ */
+export const subscribeToEvents = (
+  types: TournamentEventType[],
+  onEvent: TournamentEventHandler,
+): (() => void) => {
+  if (typeof EventSource === 'undefined') {
+    return () => {};
+  }
+
+  const source = new EventSource(`${apiClient.defaults.baseURL}/events`);
+  const listenedTypes = types.includes('resync') ? types : [...types, 'resync' as const];
+
+  listenedTypes.forEach((type) => {
+    source.addEventListener(type, (event) => {
+      const { data } = event as MessageEvent<string>;
+      onEvent(type, data ? JSON.parse(data) : null);
+    });
+  });
+
+  return () => source.close();
+};
+
+/** Call onEvent whenever one of the given events is pushed, for as long as the component is mounted */
+export const useTournamentEvents = (types: TournamentEventType[], onEvent: TournamentEventHandler) => {
+  const handler = useRef(onEvent);
+  handler.current = onEvent;
+  const typesKey = types.join(',');
+
+  useEffect(
+    () => subscribeToEvents(types, (type, data) => handler.current(type, data)),
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+    [typesKey],
+  );
+};
@@ -1,12 +1,21 @@
 import apiClient from './client';
 import { Game } from '../types/game';
 import { Team } from '../types/team';
+import { PageInfo, PageParams } from '../types/page';
+import { getAllPages } from './pages';
 
 export const generateGame = async (): Promise<Game> => {
   const response = await apiClient.post<Game>('/games/generate');
   return response.data;
 };
 
+export const generateRound = async (tables?: number): Promise<Game[]> => {
+  const response = await apiClient.post<{ games: Game[] }>('/games/generate-round', {
+    tables: tables ?? 'max',
+  });
+  return response.data.games;
+};
+
 export const createGameManually = async (team1Id: number, team2Id: number): Promise<Game> => {
   const response = await apiClient.post<Game>('/games', {
     team1_id: team1Id,
@@ -17,8 +26,12 @@ export const createGameManually = async (team1Id: number, team2Id: number): Prom
 
 export const getGames = async (status?: string): Promise<Game[]> => {
   const params = status ? { status } : {};
-  const response = await apiClient.get<{ games: Game[] }>('/games', { params });
-  return response.data.games;
+  return getAllPages<Game>('/games', 'games', params);
+};
+
+export const getGamesPage = async (params: PageParams & { status?: string }): Promise<{ games: Game[] } & PageInfo> => {
+  const response = await apiClient.get<{ games: Game[] } & PageInfo>('/games', { params });
+  return response.data;
 };
 
 export const getCurrentGames = async (): Promise<Game[]> => {
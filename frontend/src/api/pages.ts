@@ -0,0 +1,15 @@
+import apiClient from './client';
+import { PageInfo } from '../types/page';
+
+// Every row of a paged list endpoint, following next_after until the last page
+export const getAllPages = async <T>(url: string, key: string, params: Record<string, unknown> = {}): Promise<T[]> => {
+  const rows: T[] = [];
+  let after: number | null = null;
+  do {
+    const pageParams: Record<string, unknown> = after === null ? params : { ...params, after };
+    const response = await apiClient.get<PageInfo & Record<string, unknown>>(url, { params: pageParams });
+    rows.push(...(response.data[key] as T[]));
+    after = response.data.next_after ?? null;
+  } while (after !== null);
+  return rows;
+};
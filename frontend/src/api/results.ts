@@ -1,6 +1,8 @@
 import apiClient from './client';
-import { Result, Ranking } from '../types/result';
+import { Result, Ranking, RankingHistory, RankingMode, RankingProjection, CompactMatchMatrix } from '../types/result';
 import { Team } from '../types/team';
+import { PageInfo, PageParams } from '../types/page';
+import { getAllPages } from './pages';
 
 export const createResult = async (gameId: number, winningTeamId: number, score: number): Promise<Result> => {
   const response = await apiClient.post<Result>('/results', {
@@ -12,16 +14,50 @@ export const createResult = async (gameId: number, winningTeamId: number, score:
 };
 
 export const getResults = async (): Promise<Result[]> => {
-  const response = await apiClient.get<{ results: Result[] }>('/results');
-  return response.data.results;
+  return getAllPages<Result>('/results', 'results');
 };
 
-export const getRankings = async (): Promise<Ranking[]> => {
-  const response = await apiClient.get<{ rankings: Ranking[] }>('/rankings');
+export const getResultsPage = async (params: PageParams): Promise<{ results: Result[] } & PageInfo> => {
+  const response = await apiClient.get<{ results: Result[] } & PageInfo>('/results', { params });
+  return response.data;
+};
+
+export interface RankingsPointInTime {
+  // ISO 8601 timestamp
+  as_of?: string;
+  // Number of completed games, in the order they finished
+  after_game?: number;
+}
+
+export const getRankings = async (pointInTime?: RankingsPointInTime): Promise<Ranking[]> => {
+  const response = pointInTime
+    ? await apiClient.get<{ rankings: Ranking[] }>('/rankings', { params: pointInTime })
+    : await apiClient.get<{ rankings: Ranking[] }>('/rankings');
   return response.data.rankings;
 };
 
+export const getRatings = async (mode: RankingMode): Promise<Ranking[]> => {
+  const response = await apiClient.get<{ rankings: Ranking[] }>('/rankings', { params: { mode } });
+  return response.data.rankings;
+};
+
+export const getRankingHistory = async (): Promise<RankingHistory> => {
+  const response = await apiClient.get<RankingHistory>('/rankings/history');
+  return response.data;
+};
+
+// Resolves to null while the server is still simulating (202); poll again shortly
+export const getRankingProjection = async (runs?: number): Promise<RankingProjection | null> => {
+  const response = await apiClient.get<RankingProjection>('/rankings/projection', runs ? { params: { runs } } : undefined);
+  return response.status === 202 ? null : response.data;
+};
+
 export const getMatchMatrix = async (): Promise<{ teams: Team[]; matrix: any }> => {
   const response = await apiClient.get<{ teams: Team[]; matrix: any }>('/match-matrix');
   return response.data;
 };
+
+export const getCompactMatchMatrix = async (): Promise<CompactMatchMatrix> => {
+  const response = await apiClient.get<CompactMatchMatrix>('/match-matrix', { params: { format: 'compact' } });
+  return response.data;
+};
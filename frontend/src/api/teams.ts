@@ -1,5 +1,7 @@
 import apiClient from './client';
 import { Team } from '../types/team';
+import { PageInfo, PageParams } from '../types/page';
+import { getAllPages } from './pages';
 
 export const createTeams = async (players: string[]): Promise<Team[]> => {
   const response = await apiClient.post<{ teams: Team[] }>('/teams', { players });
@@ -7,8 +9,12 @@ export const createTeams = async (players: string[]): Promise<Team[]> => {
 };
 
 export const getTeams = async (): Promise<Team[]> => {
-  const response = await apiClient.get<{ teams: Team[] }>('/teams');
-  return response.data.teams;
+  return getAllPages<Team>('/teams', 'teams');
+};
+
+export const getTeamsPage = async (params: PageParams): Promise<{ teams: Team[] } & PageInfo> => {
+  const response = await apiClient.get<{ teams: Team[] } & PageInfo>('/teams', { params });
+  return response.data;
 };
 
 export const deleteTeam = async (teamId: number): Promise<void> => {
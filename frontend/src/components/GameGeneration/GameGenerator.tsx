@@ -9,7 +9,7 @@ import {
   CardContent,
   Chip,
 } from '@mui/material';
-import { generateGame, getAvailableTeams } from '../../api/games';
+import { generateGame, generateRound, getAvailableTeams } from '../../api/games';
 import { Game } from '../../types/game';
 import { Team } from '../../types/team';
 import GameEditor from './GameEditor';
@@ -20,6 +20,7 @@ interface GameGeneratorProps {
 
 const GameGenerator: React.FC<GameGeneratorProps> = ({ onGameCreated }) => {
   const [generatedGame, setGeneratedGame] = useState<Game | null>(null);
+  const [generatedRound, setGeneratedRound] = useState<Game[]>([]);
   const [availableTeams, setAvailableTeams] = useState<Team[]>([]);
   const [showManualEditor, setShowManualEditor] = useState(false);
   const [error, setError] = useState('');
@@ -42,6 +43,7 @@ const GameGenerator: React.FC<GameGeneratorProps> = ({ onGameCreated }) => {
     setError('');
     setLoading(true);
     setGeneratedGame(null);
+    setGeneratedRound([]);
 
     try {
       const game = await generateGame();
@@ -55,9 +57,28 @@ const GameGenerator: React.FC<GameGeneratorProps> = ({ onGameCreated }) => {
     }
   };
 
+  const handleGenerateRound = async () => {
+    setError('');
+    setLoading(true);
+    setGeneratedGame(null);
+    setGeneratedRound([]);
+
+    try {
+      const games = await generateRound();
+      setGeneratedRound(games);
+      onGameCreated();
+      await loadAvailableTeams();
+    } catch (err: any) {
+      setError(err.response?.data?.error || 'Failed to generate round');
+    } finally {
+      setLoading(false);
+    }
+  };
+
   const handleManualCreation = () => {
     setShowManualEditor(true);
     setGeneratedGame(null);
+    setGeneratedRound([]);
   };
 
   const handleManualGameCreated = () => {
@@ -105,6 +126,23 @@ const GameGenerator: React.FC<GameGeneratorProps> = ({ onGameCreated }) => {
         </Card>
       )}
 
+      {generatedRound.length > 0 && (
+        <Card sx={{ mb: 2, backgroundColor: '#e3f2fd' }}>
+          <CardContent>
+            <Typography variant="h6" gutterBottom>
+              ✨ Ronde Générée ({generatedRound.length} parties)
+            </Typography>
+            {generatedRound.map((game) => (
+              <Box key={game.id} sx={{ display: 'flex', alignItems: 'center', gap: 2, mb: 1 }}>
+                <Chip label={game.team1.name} color="primary" />
+                <Typography variant="body1">vs</Typography>
+                <Chip label={game.team2.name} color="secondary" />
+              </Box>
+            ))}
+          </CardContent>
+        </Card>
+      )}
+
       {showManualEditor ? (
         <Box>
           <GameEditor
@@ -124,6 +162,15 @@ const GameGenerator: React.FC<GameGeneratorProps> = ({ onGameCreated }) => {
           >
             {loading ? '🥚 Génération...' : '🎮 Générer Prochaine Partie'}
           </Button>
+          <Button
+            variant="contained"
+            color="secondary"
+            onClick={handleGenerateRound}
+            disabled={loading || availableTeams.length < 2}
+            fullWidth
+          >
+            🎲 Remplir Toutes les Tables
+          </Button>
           <Button
             variant="outlined"
             color="secondary"
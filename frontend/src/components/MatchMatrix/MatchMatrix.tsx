@@ -5,8 +5,29 @@ import {
   Box,
   Chip,
 } from '@mui/material';
-import { getMatchMatrix } from '../../api/results';
+import { getCompactMatchMatrix } from '../../api/results';
 import { Team } from '../../types/team';
+import { CompactMatchMatrix } from '../../types/result';
+
+export interface MatchCell {
+  game_id: number;
+  status: 'completed' | 'in_progress';
+}
+
+const pairKey = (team1Id: number, team2Id: number) =>
+  team1Id < team2Id ? `${team1Id}-${team2Id}` : `${team2Id}-${team1Id}`;
+
+// Index the compact arrays by pair; a pair missing from the map is unplayed
+export const decodeMatchMatrix = (data: CompactMatchMatrix): Map<string, MatchCell> => {
+  const cells = new Map<string, MatchCell>();
+  data.game_ids.forEach((gameId, i) => {
+    cells.set(pairKey(data.team1_ids[i], data.team2_ids[i]), { game_id: gameId, status: data.statuses[i] });
+  });
+  return cells;
+};
+
+export const getMatchCell = (cells: Map<string, MatchCell>, team1Id: number, team2Id: number) =>
+  cells.get(pairKey(team1Id, team2Id));
 
 interface MatchMatrixProps {
   refreshTrigger?: number;
@@ -14,15 +35,15 @@ interface MatchMatrixProps {
 
 const MatchMatrix: React.FC<MatchMatrixProps> = ({ refreshTrigger }) => {
   const [teams, setTeams] = useState<Team[]>([]);
-  const [matrix, setMatrix] = useState<any>({});
+  const [cells, setCells] = useState<Map<string, MatchCell>>(new Map());
   const [loading, setLoading] = useState(true);
 
   const loadMatrix = async () => {
     setLoading(true);
     try {
-      const data = await getMatchMatrix();
+      const data = await getCompactMatchMatrix();
       setTeams(data.teams);
-      setMatrix(data.matrix);
+      setCells(decodeMatchMatrix(data));
     } catch (err) {
       console.error('Failed to load match matrix:', err);
     } finally {
@@ -119,8 +140,8 @@ const MatchMatrix: React.FC<MatchMatrixProps> = ({ refreshTrigger }) => {
                   <Chip label={team1.name} size="small" color="primary" />
                 </td>
                 {teams.map((team2) => {
-                  const cellData = matrix[team1.id]?.[team2.id];
-                  const isNull = cellData === null;
+                  const isNull = team1.id === team2.id;
+                  const cellData = isNull ? undefined : getMatchCell(cells, team1.id, team2.id);
                   const status = cellData?.status || 'unplayed';
 
                   return (
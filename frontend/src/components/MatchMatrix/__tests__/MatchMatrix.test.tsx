@@ -0,0 +1,46 @@
+import { describe, it, expect, vi, beforeEach } from 'vitest'
+import { render, screen, waitFor } from '../../../test/testUtils'
+import MatchMatrix, { decodeMatchMatrix, getMatchCell } from '../MatchMatrix'
+import { CompactMatchMatrix } from '../../../types/result'
+import * as resultsApi from '../../../api/results'
+
+vi.mock('../../../api/results')
+
+describe('MatchMatrix', () => {
+  const mockMatrix: CompactMatchMatrix = {
+    format: 'compact',
+    teams: [
+      { id: 1, name: 'Team 1', player1: 'Alice', player2: 'Bob', created_at: '2024-01-01' },
+      { id: 2, name: 'Team 2', player1: 'Charlie', player2: 'David', created_at: '2024-01-01' },
+      { id: 3, name: 'Team 3', player1: 'Eve', player2: 'Frank', created_at: '2024-01-01' }
+    ],
+    team1_ids: [1, 2],
+    team2_ids: [2, 3],
+    game_ids: [10, 11],
+    statuses: ['completed', 'in_progress']
+  }
+
+  beforeEach(() => {
+    vi.clearAllMocks()
+  })
+
+  it('should decode the compact arrays in both directions', () => {
+    const cells = decodeMatchMatrix(mockMatrix)
+
+    expect(getMatchCell(cells, 1, 2)).toEqual({ game_id: 10, status: 'completed' })
+    expect(getMatchCell(cells, 3, 2)).toEqual({ game_id: 11, status: 'in_progress' })
+    expect(getMatchCell(cells, 1, 3)).toBeUndefined()
+  })
+
+  it('should render completed, in-progress and unplayed cells', async () => {
+    vi.mocked(resultsApi.getCompactMatchMatrix).mockResolvedValue(mockMatrix)
+
+    render(<MatchMatrix />)
+
+    await waitFor(() => {
+      expect(screen.getAllByText('✓')).toHaveLength(2)
+    })
+    expect(screen.getAllByText('▶')).toHaveLength(2)
+    expect(screen.getAllByText('-')).toHaveLength(2)
+  })
+})
@@ -11,7 +11,7 @@ import {
   Chip,
   Box,
 } from '@mui/material';
-import { getRankings } from '../../api/results';
+import { getRankings, getRankingHistory } from '../../api/results';
 import { Ranking } from '../../types/result';
 
 interface RankingsTableProps {
@@ -20,13 +20,20 @@ interface RankingsTableProps {
 
 const RankingsTable: React.FC<RankingsTableProps> = ({ refreshTrigger }) => {
   const [rankings, setRankings] = useState<Ranking[]>([]);
+  // Places each team gained or lost with the latest result
+  const [movement, setMovement] = useState<Map<number, number>>(new Map());
   const [loading, setLoading] = useState(true);
 
   const loadRankings = async () => {
     setLoading(true);
     try {
-      const data = await getRankings();
+      const [data, history] = await Promise.all([getRankings(), getRankingHistory()]);
       setRankings(data);
+      setMovement(new Map(
+        history.team_ids
+          .map((teamId, i) => [teamId, history.movement[i]] as [number, number | null])
+          .filter((entry): entry is [number, number] => entry[1] !== null && entry[1] !== 0)
+      ));
     } catch (err) {
       console.error('Failed to load rankings:', err);
     } finally {
@@ -95,6 +102,16 @@ const RankingsTable: React.FC<RankingsTableProps> = ({ refreshTrigger }) => {
                   {ranking.rank === 2 && '🥈'}
                   {ranking.rank === 3 && '🥉'}
                   {ranking.rank > 3 && ranking.rank}
+                  {movement.has(ranking.team_id) && (
+                    <Typography
+                      component="span"
+                      variant="caption"
+                      sx={{ ml: 1, color: movement.get(ranking.team_id)! > 0 ? 'success.main' : 'error.main' }}
+                    >
+                      {movement.get(ranking.team_id)! > 0 ? '▲' : '▼'}
+                      {Math.abs(movement.get(ranking.team_id)!)}
+                    </Typography>
+                  )}
                 </TableCell>
                 <TableCell>
                   <Chip label={ranking.team_name} size="small" color="primary" />
@@ -24,9 +24,12 @@ import { useLanguage } from '../../i18n/LanguageContext';
 interface TeamListProps {
   teams: Team[];
   onTeamDeleted: (teamId: number) => void;
+  // All teams on the server, when only some pages are loaded
+  total?: number;
+  onLoadMore?: () => void;
 }
 
-const TeamList: React.FC<TeamListProps> = ({ teams, onTeamDeleted }) => {
+const TeamList: React.FC<TeamListProps> = ({ teams, onTeamDeleted, total, onLoadMore }) => {
   const { t } = useLanguage();
   const [deleteDialogOpen, setDeleteDialogOpen] = useState(false);
   const [teamToDelete, setTeamToDelete] = useState<Team | null>(null);
@@ -80,7 +83,7 @@ const TeamList: React.FC<TeamListProps> = ({ teams, onTeamDeleted }) => {
     <>
       <Paper elevation={3} sx={{ p: 3 }}>
         <Typography variant="h5" gutterBottom>
-          {t('teamList.title', { count: teams.length })}
+          {t('teamList.title', { count: total ?? teams.length })}
         </Typography>
 
         <List>
@@ -119,6 +122,12 @@ const TeamList: React.FC<TeamListProps> = ({ teams, onTeamDeleted }) => {
             </ListItem>
           ))}
         </List>
+
+        {onLoadMore && (
+          <Box sx={{ textAlign: 'center' }}>
+            <Button onClick={onLoadMore}>{t('teamList.loadMore')}</Button>
+          </Box>
+        )}
       </Paper>
 
       <Dialog open={deleteDialogOpen} onClose={handleDeleteCancel}>
@@ -98,6 +98,7 @@ export const translations = {
     // Team List
     teamList: {
       title: '🐓 Your Coops ({{count}})',
+      loadMore: 'Load more coops',
       emptyTitle: '🐣',
       emptyMessage: 'No coops yet! Add some chicks above to get started!',
       deleteDialog: {
@@ -229,6 +230,7 @@ export const translations = {
     // Team List
     teamList: {
       title: '🐓 Vos Poulaillers ({{count}})',
+      loadMore: 'Afficher plus de poulaillers',
       emptyTitle: '🐣',
       emptyMessage: 'Aucun poulailler encore! Ajoutez des poussins ci-dessus pour commencer!',
       deleteDialog: {
@@ -2,6 +2,7 @@ import React, { useState } from 'react';
 import { Box, Grid } from '@mui/material';
 import GameGenerator from '../components/GameGeneration/GameGenerator';
 import CurrentGamesList from '../components/CurrentGames/CurrentGamesList';
+import { useTournamentEvents } from '../api/events';
 
 const GamesPage: React.FC = () => {
   const [refreshTrigger, setRefreshTrigger] = useState(0);
@@ -10,6 +11,9 @@ const GamesPage: React.FC = () => {
     setRefreshTrigger(prev => prev + 1);
   };
 
+  // Reload whenever another device changes the tournament
+  useTournamentEvents(['game_started', 'game_completed', 'database_cleared'], handleGameChange);
+
   return (
     <Box>
       <Grid container spacing={3}>
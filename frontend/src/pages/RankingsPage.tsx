@@ -1,6 +1,7 @@
 import React, { useState } from 'react';
 import { Box, Button } from '@mui/material';
 import RankingsTable from '../components/Rankings/RankingsTable';
+import { useTournamentEvents } from '../api/events';
 
 const RankingsPage: React.FC = () => {
   const [refreshTrigger, setRefreshTrigger] = useState(0);
@@ -9,6 +10,9 @@ const RankingsPage: React.FC = () => {
     setRefreshTrigger(prev => prev + 1);
   };
 
+  // Reload whenever another device changes the tournament
+  useTournamentEvents(['team_created', 'result_created', 'database_cleared'], handleRefresh);
+
   return (
     <Box>
       <Box sx={{ mb: 2, display: 'flex', justifyContent: 'flex-end' }}>
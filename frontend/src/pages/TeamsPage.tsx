@@ -3,21 +3,46 @@ import { Box, Snackbar, Alert } from '@mui/material';
 import NameBankCreation from '../components/TeamCreation/NameBankCreation';
 import ManualTeamCreation from '../components/TeamCreation/ManualTeamCreation';
 import TeamList from '../components/TeamCreation/TeamList';
-import { getTeams } from '../api/teams';
+import { getTeamsPage } from '../api/teams';
+import { useTournamentEvents } from '../api/events';
 import { Team } from '../types/team';
 
+const PAGE_SIZE = 100;
+
+// Append a page or new teams, skipping any already shown
+const mergeTeams = (current: Team[], added: Team[]) => {
+  const known = new Set(current.map(team => team.id));
+  return [...current, ...added.filter(team => !known.has(team.id))];
+};
+
 const TeamsPage: React.FC = () => {
   const [teams, setTeams] = useState<Team[]>([]);
+  const [nextAfter, setNextAfter] = useState<number | null>(null);
+  const [total, setTotal] = useState<number | undefined>(undefined);
   const [snackbar, setSnackbar] = useState<{ open: boolean; message: string; severity: 'success' | 'error' }>({
     open: false,
     message: '',
     severity: 'success',
   });
 
+  // Only the first page is loaded up front; later pages follow the cursor on demand
   const loadTeams = async () => {
     try {
-      const fetchedTeams = await getTeams();
-      setTeams(fetchedTeams);
+      const page = await getTeamsPage({ limit: PAGE_SIZE, total: true });
+      setTeams(page.teams);
+      setNextAfter(page.next_after);
+      setTotal(page.total);
+    } catch (err) {
+      console.error('Failed to load teams:', err);
+    }
+  };
+
+  const loadMoreTeams = async () => {
+    if (nextAfter === null) return;
+    try {
+      const page = await getTeamsPage({ limit: PAGE_SIZE, after: nextAfter });
+      setTeams(current => mergeTeams(current, page.teams));
+      setNextAfter(page.next_after);
     } catch (err) {
       console.error('Failed to load teams:', err);
     }
@@ -27,16 +52,21 @@ const TeamsPage: React.FC = () => {
     loadTeams();
   }, []);
 
+  // Pick up teams created from another device
+  useTournamentEvents(['team_created', 'database_cleared'], loadTeams);
+
   const handleTeamsCreated = (newTeams: Team[]) => {
-    setTeams([...teams, ...newTeams]);
+    setTeams(mergeTeams(teams, newTeams));
+    setTotal(current => current === undefined ? undefined : current + newTeams.length);
   };
 
   const handleTeamCreated = (team: Team) => {
-    setTeams([...teams, team]);
+    handleTeamsCreated([team]);
   };
 
   const handleTeamDeleted = (teamId: number) => {
     setTeams(teams.filter(team => team.id !== teamId));
+    setTotal(current => current === undefined ? undefined : current - 1);
     setSnackbar({
       open: true,
       message: 'Poulailler supprimé avec succès',
@@ -52,7 +82,12 @@ const TeamsPage: React.FC = () => {
     <Box>
       <NameBankCreation onTeamsCreated={handleTeamsCreated} />
       <ManualTeamCreation onTeamCreated={handleTeamCreated} />
-      <TeamList teams={teams} onTeamDeleted={handleTeamDeleted} />
+      <TeamList
+        teams={teams}
+        total={total}
+        onTeamDeleted={handleTeamDeleted}
+        onLoadMore={nextAfter !== null ? loadMoreTeams : undefined}
+      />
 
       <Snackbar
         open={snackbar.open}
@@ -0,0 +1,13 @@
+// Keyset paging of list endpoints: rows with id > after, in id order
+export interface PageParams {
+  limit?: number;
+  after?: number;
+  // Also count every matching row (an extra query on the server)
+  total?: boolean;
+}
+
+export interface PageInfo {
+  // Cursor of the next page, null on the last one
+  next_after: number | null;
+  total?: number;
+}
@@ -19,4 +19,51 @@ export interface Ranking {
   games_won: number;
   games_lost: number;
   win_rate: number;
+  // Only with an Elo or Glicko-2 ranking mode
+  rating?: number;
+  rating_deviation?: number;
+  volatility?: number;
+  // Only when tie-breakers are requested or configured, keyed by tie-breaker name
+  tie_breakers?: Partial<Record<TieBreaker, number>>;
+}
+
+export type TieBreaker = 'head_to_head' | 'buchholz' | 'points_differential';
+
+export type RankingMode = 'score' | 'elo' | 'glicko2';
+
+// Rank and score of every team after each result, one series per team (null while unranked)
+export interface RankingHistory {
+  team_ids: number[];
+  team_names: (string | null)[];
+  result_ids: number[];
+  timestamps: string[];
+  ranks: (number | null)[][];
+  scores: (number | null)[][];
+  // Places gained (positive) or lost with the latest result
+  movement: (number | null)[];
+}
+
+// Simulated chances of finishing in each rank; rank_probabilities[0] is the chance of finishing first
+export interface TeamProjection {
+  team_id: number;
+  team_name: string;
+  current_rank: number;
+  expected_rank: number;
+  rank_probabilities: number[];
+}
+
+export interface RankingProjection {
+  runs: number;
+  remaining_games: number;
+  teams: TeamProjection[];
+}
+
+// Played and in-progress pairs only, as parallel arrays (team1_ids[i] < team2_ids[i]); other pairs are unplayed
+export interface CompactMatchMatrix {
+  format: 'compact';
+  teams: Team[];
+  team1_ids: number[];
+  team2_ids: number[];
+  game_ids: number[];
+  statuses: ('completed' | 'in_progress')[];
 }